@@ -0,0 +1,28 @@
+"""resume updated_at for stuck-job sweeper
+
+Revision ID: 7b3e9d41c2a8
+Revises: 2f172d988861
+Create Date: 2026-03-02 10:41:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9d41c2a8'
+down_revision: Union[str, None] = '2f172d988861'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('resumes', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.create_index('ix_resumes_status_updated_at', 'resumes', ['status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resumes_status_updated_at', table_name='resumes')
+    op.drop_column('resumes', 'updated_at')
@@ -0,0 +1,35 @@
+"""incremental screening runs
+
+Revision ID: a7d2e4b9c513
+Revises: f3c9d1e6a4b7
+Create Date: 2026-03-18 15:27:09.640118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e4b9c513'
+down_revision: Union[str, None] = 'f3c9d1e6a4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('screening_runs', sa.Column('base_run_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('screening_runs', sa.Column('delta_scored', sa.Integer(), nullable=True))
+    op.add_column('screening_runs', sa.Column('delta_added', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'screening_runs_base_run_id_fkey', 'screening_runs', 'screening_runs', ['base_run_id'], ['id'], ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('screening_runs_base_run_id_fkey', 'screening_runs', type_='foreignkey')
+    op.drop_column('screening_runs', 'delta_added')
+    op.drop_column('screening_runs', 'delta_scored')
+    op.drop_column('screening_runs', 'base_run_id')
@@ -0,0 +1,45 @@
+"""jd watch mode and shortlists
+
+Revision ID: b3f1c8e2d6a4
+Revises: a7d2e4b9c513
+Create Date: 2026-03-20 09:58:33.174502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c8e2d6a4'
+down_revision: Union[str, None] = 'a7d2e4b9c513'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job_descriptions', sa.Column('watch_active', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index(
+        'ix_job_descriptions_user_id_watching', 'job_descriptions', ['user_id'],
+        unique=False, postgresql_where=sa.text('watch_active'),
+    )
+    op.create_table(
+        'jd_shortlist_entries',
+        sa.Column('jd_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('resume_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('similarity_score', sa.Numeric(precision=6, scale=5), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['jd_id'], ['job_descriptions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('jd_id', 'resume_id'),
+    )
+    op.create_index('ix_jd_shortlist_entries_jd_id_score', 'jd_shortlist_entries', ['jd_id', 'similarity_score'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jd_shortlist_entries_jd_id_score', table_name='jd_shortlist_entries')
+    op.drop_table('jd_shortlist_entries')
+    op.drop_index('ix_job_descriptions_user_id_watching', table_name='job_descriptions')
+    op.drop_column('job_descriptions', 'watch_active')
@@ -0,0 +1,50 @@
+"""vector index on resume embeddings
+
+Revision ID: c81f5a0d93e4
+Revises: 7b3e9d41c2a8
+Create Date: 2026-03-09 14:22:05.907311
+
+Built with CREATE INDEX CONCURRENTLY (no write lock on resumes), so it runs outside the migration
+transaction. Index type and build parameters come from settings (VECTOR_INDEX_TYPE, HNSW_M,
+HNSW_EF_CONSTRUCTION, IVFFLAT_LISTS). Large tables build much faster with a higher
+maintenance_work_mem (e.g. `ALTER ROLE ... SET maintenance_work_mem = '2GB'`). To rebuild with new
+parameters: downgrade one revision, change the settings, upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f5a0d93e4'
+down_revision: Union[str, None] = '7b3e9d41c2a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_resumes_embedding_hnsw'
+IVFFLAT_INDEX_NAME = 'ix_resumes_embedding_ivfflat'
+
+
+def upgrade() -> None:
+    settings = get_settings()
+    with op.get_context().autocommit_block():
+        if settings.vector_index_type == 'ivfflat':
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {IVFFLAT_INDEX_NAME} ON resumes "
+                f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {int(settings.ivfflat_lists)})"
+            )
+        else:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON resumes "
+                f"USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {int(settings.hnsw_m)}, ef_construction = {int(settings.hnsw_ef_construction)})"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {IVFFLAT_INDEX_NAME}")
@@ -0,0 +1,27 @@
+"""screening results ids generated server-side
+
+Revision ID: c8e4a2f7b190
+Revises: b3f1c8e2d6a4
+Create Date: 2026-03-23 10:12:47.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e4a2f7b190'
+down_revision: Union[str, None] = 'b3f1c8e2d6a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in since PostgreSQL 13
+    op.alter_column('screening_results', 'id', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    op.alter_column('screening_results', 'id', server_default=None)
@@ -0,0 +1,51 @@
+"""relational index pack for hot filter, join and sort paths
+
+Revision ID: d4a7c2e9f150
+Revises: c81f5a0d93e4
+Create Date: 2026-03-11 09:05:47.114920
+
+Created CONCURRENTLY (outside the migration transaction) so large tables stay writable. Query each index
+serves (plans: benchmarks/explain_hot_paths.py):
+- resumes(batch_id, status): batch detail, batch completion checks, dashboard status counts
+- resumes(batch_id) WHERE processed AND embedding IS NOT NULL: batch-filtered ranking candidates
+- resumes(resume_id) on screening_results: ON DELETE CASCADE from resumes
+- upload_batches / job_descriptions (user_id, created_at): per-user lists ordered by newest, dashboard
+- screening_runs(jd_id, created_at): runs per JD ordered by newest, dashboard joins
+- screening_results(run_id, rank_position): run detail pages (ordered, no sort)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c2e9f150'
+down_revision: Union[str, None] = 'c81f5a0d93e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_resumes_batch_id_status', 'resumes', '(batch_id, status)', None),
+    ('ix_resumes_batch_id_ranked', 'resumes', '(batch_id)', "status = 'processed' AND embedding IS NOT NULL"),
+    ('ix_upload_batches_user_id_created_at', 'upload_batches', '(user_id, created_at)', None),
+    ('ix_job_descriptions_user_id_created_at', 'job_descriptions', '(user_id, created_at)', None),
+    ('ix_screening_runs_jd_id_created_at', 'screening_runs', '(jd_id, created_at)', None),
+    ('ix_screening_results_run_id_rank_position', 'screening_results', '(run_id, rank_position)', None),
+    ('ix_screening_results_resume_id', 'screening_results', '(resume_id)', None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            predicate = f" WHERE {where}" if where else ""
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {columns}{predicate}")
+        for table in {table for _, table, _, _ in INDEXES}:
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,45 @@
+"""keyset pagination indexes: (created_at, id) sort keys for per-user lists
+
+Revision ID: d9b5e1c3a8f6
+Revises: c8e4a2f7b190
+Create Date: 2026-03-25 14:40:12.508113
+
+List endpoints page on (created_at, id) so a cursor is unique even when timestamps tie. Each index
+replaces the (…, created_at) index from d4a7c2e9f150, which is its prefix. Created CONCURRENTLY (outside
+the migration transaction) so the tables stay writable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b5e1c3a8f6'
+down_revision: Union[str, None] = 'c8e4a2f7b190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (new index, table, columns, index it replaces, its columns)
+INDEXES = [
+    ('ix_upload_batches_user_id_created_at_id', 'upload_batches', '(user_id, created_at, id)',
+     'ix_upload_batches_user_id_created_at', '(user_id, created_at)'),
+    ('ix_job_descriptions_user_id_created_at_id', 'job_descriptions', '(user_id, created_at, id)',
+     'ix_job_descriptions_user_id_created_at', '(user_id, created_at)'),
+    ('ix_screening_runs_jd_id_created_at_id', 'screening_runs', '(jd_id, created_at, id)',
+     'ix_screening_runs_jd_id_created_at', '(jd_id, created_at)'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, old_name, _ in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {columns}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, old_name, old_columns in reversed(INDEXES):
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {old_name} ON {table} {old_columns}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
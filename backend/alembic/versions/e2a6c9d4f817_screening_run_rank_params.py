@@ -0,0 +1,28 @@
+"""screening runs record their ranking parameters
+
+Revision ID: e2a6c9d4f817
+Revises: d9b5e1c3a8f6
+Create Date: 2026-03-27 09:41:22.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c9d4f817'
+down_revision: Union[str, None] = 'd9b5e1c3a8f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NULL for existing runs: how they were ranked is unknown, so they cannot be extended incrementally
+    op.add_column('screening_runs', sa.Column('rank_params', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('screening_runs', 'rank_params')
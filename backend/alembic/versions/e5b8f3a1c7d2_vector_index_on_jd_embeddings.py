@@ -0,0 +1,50 @@
+"""vector index on job description embeddings
+
+Revision ID: e5b8f3a1c7d2
+Revises: d4a7c2e9f150
+Create Date: 2026-03-13 10:41:26.530218
+
+ANN index for reverse matching (GET /screening/resumes/{id}/matches: JDs closest to a resume). Same index
+type and build parameters as the resume index (c81f5a0d93e4), so one set of query-time settings serves
+both. The user filter is applied during the scan (iterative scan) or, for users with few JDs, served by
+ix_job_descriptions_user_id_created_at and sorted exactly; the planner picks. Built CONCURRENTLY.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8f3a1c7d2'
+down_revision: Union[str, None] = 'd4a7c2e9f150'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = 'ix_job_descriptions_embedding_hnsw'
+IVFFLAT_INDEX_NAME = 'ix_job_descriptions_embedding_ivfflat'
+
+
+def upgrade() -> None:
+    settings = get_settings()
+    with op.get_context().autocommit_block():
+        if settings.vector_index_type == 'ivfflat':
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {IVFFLAT_INDEX_NAME} ON job_descriptions "
+                f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {int(settings.ivfflat_lists)})"
+            )
+        else:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON job_descriptions "
+                f"USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {int(settings.hnsw_m)}, ef_construction = {int(settings.hnsw_ef_construction)})"
+            )
+        op.execute("ANALYZE job_descriptions")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {IVFFLAT_INDEX_NAME}")
@@ -0,0 +1,50 @@
+"""full-text search columns for hybrid ranking
+
+Revision ID: f3c9d1e6a4b7
+Revises: e5b8f3a1c7d2
+Create Date: 2026-03-16 11:12:40.288153
+
+Stored generated tsvector columns (english config) on resumes.extracted_text and job_descriptions.raw_text,
+so every writer (ORM, Celery, stream worker SQL) keeps them current without triggers, plus GIN indexes
+built CONCURRENTLY. Adding a stored generated column rewrites the table under an exclusive lock: run it
+in a maintenance window on large installations.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c9d1e6a4b7'
+down_revision: Union[str, None] = 'e5b8f3a1c7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ('resumes', 'extracted_text', 'ix_resumes_search_tsv'),
+    ('job_descriptions', 'raw_text', 'ix_job_descriptions_search_tsv'),
+]
+
+
+def upgrade() -> None:
+    for table, source, _ in COLUMNS:
+        op.add_column(table, sa.Column(
+            'search_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed(f"to_tsvector('english', coalesce({source}, ''))", persisted=True),
+            nullable=True,
+        ))
+    with op.get_context().autocommit_block():
+        for table, _, index in COLUMNS:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {table} USING gin (search_tsv)")
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for _, _, index in COLUMNS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+    for table, _, _ in COLUMNS:
+        op.drop_column(table, 'search_tsv')
@@ -1,15 +1,17 @@
-"""FastAPI dependencies: current user from JWT."""
+"""FastAPI dependencies: current user from JWT, keyset cursor decoding."""
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import decode_cursor
 from app.core.redis_client import is_token_revoked
 from app.core.security import decode_access_token_payload
 from app.db.session import get_async_session
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
+from app.schemas.common import PaginationParams
 
 security = HTTPBearer(auto_error=False)
 
@@ -39,3 +41,13 @@ async def get_current_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
+
+
+def keyset_after(pagination: PaginationParams, *kinds: type) -> tuple | None:
+    """Decoded sort key of pagination.cursor, or None on the first page / in page-number mode."""
+    if not pagination.cursor:
+        return None
+    try:
+        return decode_cursor(pagination.cursor, *kinds)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
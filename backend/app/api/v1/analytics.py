@@ -34,16 +34,18 @@ async def dashboard(
     by_status_rows = (await session.execute(by_status_q)).all()
     resumes_by_status = {row[0]: row[1] for row in by_status_rows}
     date_from = (datetime.now(timezone.utc) - timedelta(days=30)).date()
+    # Range on the raw column (not date(created_at)) so the (user_id, created_at) indexes apply
+    since = datetime.combine(date_from, datetime.min.time(), tzinfo=timezone.utc)
 
-    uploads_by_date_q = select(func.date(UploadBatch.created_at), func.count()).select_from(UploadBatch).where(UploadBatch.user_id == current_user.id).where(func.date(UploadBatch.created_at) >= date_from).group_by(func.date(UploadBatch.created_at)).order_by(func.date(UploadBatch.created_at))
+    uploads_by_date_q = select(func.date(UploadBatch.created_at), func.count()).select_from(UploadBatch).where(UploadBatch.user_id == current_user.id).where(UploadBatch.created_at >= since).group_by(func.date(UploadBatch.created_at)).order_by(func.date(UploadBatch.created_at))
     uploads_by_date_rows = (await session.execute(uploads_by_date_q)).all()
     uploads_by_date = [{"date": str(r[0]), "count": r[1]} for r in uploads_by_date_rows]
 
-    runs_by_date_q = select(func.date(ScreeningRun.created_at), func.count()).select_from(ScreeningRun).join(JobDescription, JobDescription.id == ScreeningRun.jd_id).where(JobDescription.user_id == current_user.id).where(func.date(ScreeningRun.created_at) >= date_from).group_by(func.date(ScreeningRun.created_at)).order_by(func.date(ScreeningRun.created_at))
+    runs_by_date_q = select(func.date(ScreeningRun.created_at), func.count()).select_from(ScreeningRun).join(JobDescription, JobDescription.id == ScreeningRun.jd_id).where(JobDescription.user_id == current_user.id).where(ScreeningRun.created_at >= since).group_by(func.date(ScreeningRun.created_at)).order_by(func.date(ScreeningRun.created_at))
     runs_by_date_rows = (await session.execute(runs_by_date_q)).all()
     runs_by_date = [{"date": str(r[0]), "count": r[1]} for r in runs_by_date_rows]
 
-    jds_by_date_q = select(func.date(JobDescription.created_at), func.count()).select_from(JobDescription).where(JobDescription.user_id == current_user.id).where(func.date(JobDescription.created_at) >= date_from).group_by(func.date(JobDescription.created_at)).order_by(func.date(JobDescription.created_at))
+    jds_by_date_q = select(func.date(JobDescription.created_at), func.count()).select_from(JobDescription).where(JobDescription.user_id == current_user.id).where(JobDescription.created_at >= since).group_by(func.date(JobDescription.created_at)).order_by(func.date(JobDescription.created_at))
     jds_by_date_rows = (await session.execute(jds_by_date_q)).all()
     jds_by_date = [{"date": str(r[0]), "count": r[1]} for r in jds_by_date_rows]
 
@@ -1,10 +1,13 @@
-"""Job descriptions: create, list, get one."""
+"""Job descriptions: create, list, get one, watch mode shortlist."""
+from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Form, HTTPException, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, keyset_after
+from app.config import get_settings
+from app.core.pagination import encode_cursor, page_count
 from app.db.session import get_async_session
 from app.models.user import User
 from app.repositories.jd_repository import JobDescriptionRepository
@@ -14,11 +17,16 @@ from app.schemas.job_descriptions import (
     JobDescriptionListItem,
     JobDescriptionResponse,
     PaginatedJDs,
+    ShortlistItem,
+    ShortlistResponse,
+    WatchRequest,
 )
 from app.core.embedding_errors import EmbeddingUnavailableError
 from app.services.embedding import EmbeddingService
+from app.services.ranking.watch import backfill_shortlist
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.post("", response_model=JobDescriptionResponse)
@@ -37,7 +45,7 @@ async def create_jd(
         session, current_user.id, body.title, body.raw_text, embedding=embedding
     )
     await session.commit()
-    return JobDescriptionResponse(id=jd.id, title=jd.title, raw_text=jd.raw_text, created_at=jd.created_at)
+    return JobDescriptionResponse(id=jd.id, title=jd.title, raw_text=body.raw_text, created_at=jd.created_at)
 
 
 @router.post("/from-form", response_model=JobDescriptionResponse)
@@ -58,7 +66,7 @@ async def create_jd_from_form(
         session, current_user.id, title, raw_text, embedding=embedding
     )
     await session.commit()
-    return JobDescriptionResponse(id=jd.id, title=jd.title, raw_text=jd.raw_text, created_at=jd.created_at)
+    return JobDescriptionResponse(id=jd.id, title=jd.title, raw_text=raw_text, created_at=jd.created_at)
 
 
 @router.get("", response_model=PaginatedJDs)
@@ -68,11 +76,15 @@ async def list_jds(
     pagination: PaginationParams = Depends(get_pagination),
 ) -> PaginatedJDs:
     items, total = await JobDescriptionRepository.list_for_user(
-        session, current_user.id, page=pagination.page, page_size=pagination.page_size
+        session, current_user.id, page=pagination.page, page_size=pagination.page_size,
+        after=keyset_after(pagination, datetime, UUID), with_total=pagination.with_total,
     )
     list_items = [JobDescriptionListItem(id=j.id, title=j.title, created_at=j.created_at) for j in items]
-    pages = (total + pagination.page_size - 1) // pagination.page_size if total else 0
-    return PaginatedJDs(items=list_items, total=total, page=pagination.page, page_size=pagination.page_size, pages=pages)
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(items) == pagination.page_size else None
+    return PaginatedJDs(
+        items=list_items, total=total, page=pagination.page, page_size=pagination.page_size,
+        pages=page_count(total, pagination.page_size), next_cursor=next_cursor,
+    )
 
 
 @router.get("/{jd_id}", response_model=JobDescriptionResponse)
@@ -81,7 +93,59 @@ async def get_jd(
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ) -> JobDescriptionResponse:
+    jd = await JobDescriptionRepository.get_by_id(session, jd_id, with_text=True)
+    if not jd or jd.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
+    return JobDescriptionResponse(
+        id=jd.id, title=jd.title, raw_text=jd.raw_text, watch_active=jd.watch_active, created_at=jd.created_at
+    )
+
+
+@router.put("/{jd_id}/watch", response_model=JobDescriptionResponse)
+async def set_watch(
+    jd_id: UUID,
+    body: WatchRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> JobDescriptionResponse:
+    """
+    Turn watch mode on or off. While on, every resume the user uploads is scored against this JD as soon as
+    it is processed and kept in the JD's top-K shortlist; turning it on seeds the shortlist from existing resumes.
+    """
+    jd = await JobDescriptionRepository.get_by_id(session, jd_id, with_text=True, with_embedding=True)
+    if not jd or jd.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
+    if body.active and jd.embedding is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job description has no embedding yet")
+    if body.active != jd.watch_active:
+        await JobDescriptionRepository.set_watch(session, jd, body.active)
+        if body.active:
+            await backfill_shortlist(session, jd.id, current_user.id, jd.embedding)
+        await session.commit()
+    return JobDescriptionResponse(
+        id=jd.id, title=jd.title, raw_text=jd.raw_text, watch_active=jd.watch_active, created_at=jd.created_at
+    )
+
+
+@router.get("/{jd_id}/shortlist", response_model=ShortlistResponse)
+async def get_shortlist(
+    jd_id: UUID,
+    since: datetime | None = Query(None, description="Flag entries added after this time as is_new"),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> ShortlistResponse:
+    """Current top-K of a watched JD, maintained at ingest; no ranking is done on read."""
     jd = await JobDescriptionRepository.get_by_id(session, jd_id)
     if not jd or jd.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
-    return JobDescriptionResponse(id=jd.id, title=jd.title, raw_text=jd.raw_text, created_at=jd.created_at)
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    entries = await JobDescriptionRepository.get_shortlist(session, jd_id)
+    items = [
+        ShortlistItem(
+            resume_id=resume_id, filename=filename, batch_id=batch_id, similarity_score=score, added_at=added_at,
+            is_new=since is not None and added_at > since,
+        )
+        for resume_id, filename, batch_id, score, added_at in entries
+    ]
+    return ShortlistResponse(jd_id=jd.id, watch_active=jd.watch_active, top_k=settings.watch_top_k, items=items)
@@ -1,28 +1,42 @@
 """Screening: rank CVs by JD, list runs, get run detail."""
+import asyncio
 import logging
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, keyset_after
+from app.core.pagination import encode_cursor, page_count
 from app.core.rate_limit import get_user_or_ip_key, limiter
 from app.db.session import get_async_session
 from app.models.user import User
+from app.repositories.batch_repository import BatchRepository, ResumeRepository
 from app.repositories.jd_repository import JobDescriptionRepository
 from app.repositories.screening_repository import ScreeningRepository
 from app.schemas.common import PaginationParams, get_pagination
 from app.schemas.screening import (
+    BestFitItem,
+    IncrementalRankRequest,
+    IncrementalRankResponse,
+    JobMatchItem,
+    MultiRankRequest,
+    MultiRankResponse,
+    RankExplainResponse,
     RankRequest,
     RankResponse,
     RankedResumeItem,
     PaginatedRuns,
+    PruningStats,
+    ResumeMatchesResponse,
     RunDetailResponse,
     ScreeningRunListItem,
     ScreeningResultItem,
 )
 from app.core.embedding_errors import EmbeddingUnavailableError
 from app.services.embedding import EmbeddingService
+from app.services.ranking import memo as rank_memo
 from app.services.ranking.service import RankingService
 
 logger = logging.getLogger(__name__)
@@ -41,14 +55,15 @@ async def rank_cvs(
         "Rank request: jd_id=%s batch_id=%s limit=%s min_score=%s",
         body.jd_id, body.batch_id, body.limit, body.min_score,
     )
-    jd = await JobDescriptionRepository.get_by_id(session, body.jd_id)
+    jd = await JobDescriptionRepository.get_by_id(session, body.jd_id, with_embedding=True)
     if not jd or jd.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
     if jd.embedding is None:
-        logger.info("Computing JD embedding for jd_id=%s (raw_text len=%d)", body.jd_id, len(jd.raw_text or ""))
+        raw_text = await JobDescriptionRepository.load_text(session, jd)
+        logger.info("Computing JD embedding for jd_id=%s (raw_text len=%d)", body.jd_id, len(raw_text or ""))
         try:
             emb_svc = EmbeddingService()
-            jd.embedding = await emb_svc.embed_text_async(jd.raw_text)
+            jd.embedding = await emb_svc.embed_text_async(raw_text)
             await JobDescriptionRepository.update_embedding(session, jd.id, jd.embedding)
             await session.commit()
         except EmbeddingUnavailableError:
@@ -58,24 +73,192 @@ async def rank_cvs(
             )
     else:
         logger.info("Using cached JD embedding for jd_id=%s (dim=%d)", body.jd_id, len(jd.embedding))
+    # Same JD, embedding, batch revision and parameters as an earlier request: return that run. Unscoped
+    # requests are not memoized: their revision would be a count over every resume on the hot path.
+    memo_key, owns_lock, batch_revision = None, False, None
+    if rank_memo.enabled() and body.batch_id is not None:
+        batch_revision = await rank_memo.candidate_revision(session, body.batch_id)
+        memo_key = rank_memo.memo_key(
+            jd.id, jd.embedding, batch_revision[1], body.model_dump(mode="json", exclude={"jd_id", "refresh"}),
+        )
+        memo, owns_lock = await rank_memo.lookup(memo_key, refresh=body.refresh)
+        if memo:
+            run = await ScreeningRepository.get_run_by_id(session, UUID(memo["run_id"]))
+            if run is not None and run.jd_id == jd.id:
+                logger.info("Rank memo hit: jd_id=%s run_id=%s", jd.id, run.id)
+                ranked = await ScreeningRepository.get_ranked_results(session, run.id)
+                return _rank_response(run.id, jd.id, ranked, memo.get("pruning"), memoized=True)
+    try:
+        ranked, stats = await _rank(session, jd, body, batch_revision)
+        if not ranked:
+            logger.warning("Ranking returned 0 CVs for jd_id=%s (diagnose with POST /screening/rank/explain)", body.jd_id)
+        else:
+            logger.info("Ranking returned %d CVs for jd_id=%s", len(ranked), body.jd_id)
+        for rank_pos, (r_id, fn, score, _, bid) in enumerate(ranked, start=1):
+            logger.info("  [%d] resume_id=%s filename=%s score=%.4f batch_id=%s", rank_pos, r_id, fn, score, bid)
+        run = await ScreeningRepository.create_run(session, body.jd_id, body.batch_id, rank_params=_run_params(body))
+        results_for_db = [(resume_id, score, rank_pos) for resume_id, _, score, rank_pos, _ in ranked]
+        await ScreeningRepository.add_results(session, run.id, results_for_db)
+        await session.commit()
+    except Exception:
+        if owns_lock:
+            await rank_memo.release(memo_key)
+        raise
+    if memo_key is not None:
+        await rank_memo.store(memo_key, run.id, stats, owns_lock=owns_lock)
+    return _rank_response(run.id, jd.id, ranked, stats)
+
+
+async def _rank(
+    session: AsyncSession, jd, body: RankRequest, batch_revision: tuple[int, str] | None = None,
+) -> tuple[list, dict | None]:
+    """Ranked tuples for a rank request (mode / term filters), plus pruning stats when term filters apply."""
+    if body.mode == "hybrid":
+        ranked = await RankingService.rank_resumes_hybrid(
+            session, jd.id, jd.embedding, batch_id=body.batch_id, limit=body.limit, min_score=body.min_score,
+            keywords=body.keywords, ef_search=body.ef_search,
+            must_include=body.must_include, must_exclude=body.must_exclude,
+        )
+        return ranked, None
+    if body.must_include or body.must_exclude:
+        ranked, stats = await RankingService.rank_resumes_filtered(
+            session, jd.embedding, body.must_include, body.must_exclude,
+            batch_id=body.batch_id, limit=body.limit, min_score=body.min_score,
+        )
+        return ranked, stats or None
     ranked = await RankingService.rank_resumes(
-        session, list(jd.embedding), batch_id=body.batch_id, limit=body.limit, min_score=body.min_score
+        session, jd.embedding, batch_id=body.batch_id, limit=body.limit, min_score=body.min_score,
+        ef_search=body.ef_search, batch_revision=batch_revision,
     )
-    if not ranked:
-        logger.warning("Ranking returned 0 CVs for jd_id=%s (check diagnostic counts above)", body.jd_id)
-    else:
-        logger.info("Ranking returned %d CVs for jd_id=%s", len(ranked), body.jd_id)
-    for rank_pos, (r_id, fn, score, _, bid) in enumerate(ranked, start=1):
-        logger.info("  [%d] resume_id=%s filename=%s score=%.4f batch_id=%s", rank_pos, r_id, fn, score, bid)
-    run = await ScreeningRepository.create_run(session, body.jd_id, body.batch_id)
-    results_for_db = [(resume_id, score, rank_pos) for resume_id, _, score, rank_pos, _ in ranked]
-    await ScreeningRepository.add_results(session, run.id, results_for_db)
-    await session.commit()
+    return ranked, None
+
+
+def _run_params(body: RankRequest) -> dict:
+    """What shaped a run's ranking, stored with it so incremental runs can apply the same rules."""
+    return body.model_dump(mode="json", include={"mode", "keywords", "must_include", "must_exclude", "min_score"})
+
+
+def _rank_response(run_id: UUID, jd_id: UUID, ranked: list, pruning: dict | None, memoized: bool = False) -> RankResponse:
     results = [
         RankedResumeItem(resume_id=r_id, filename=fn, similarity_score=score, rank_position=pos, batch_id=bid)
         for r_id, fn, score, pos, bid in ranked
     ]
-    return RankResponse(run_id=run.id, jd_id=body.jd_id, total_count=len(results), results=results)
+    return RankResponse(
+        run_id=run_id, jd_id=jd_id, total_count=len(results), results=results,
+        pruning=PruningStats(**pruning) if pruning else None, memoized=memoized,
+    )
+
+
+@router.post("/rank/multi", response_model=MultiRankResponse)
+@limiter.limit("10/minute", key_func=get_user_or_ip_key)
+async def rank_cvs_multi(
+    request: Request,
+    body: MultiRankRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> MultiRankResponse:
+    """Rank one candidate set against several JDs in a single scoring pass; one screening run per JD."""
+    jd_ids = list(dict.fromkeys(body.jd_ids))
+    jds = {jd.id: jd for jd in await JobDescriptionRepository.get_many_for_user(session, current_user.id, jd_ids)}
+    if len(jds) != len(jd_ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
+    if body.batch_id is not None:
+        batch = await BatchRepository.get_by_id(session, body.batch_id)
+        if not batch or batch.user_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    missing = [jds[jd_id] for jd_id in jd_ids if jds[jd_id].embedding is None]
+    if missing:
+        logger.info("Computing %d JD embeddings for multi-rank", len(missing))
+        texts = [await JobDescriptionRepository.load_text(session, jd) for jd in missing]
+        try:
+            emb_svc = EmbeddingService()
+            embeddings = await asyncio.gather(*(emb_svc.embed_text_async(text) for text in texts))
+        except EmbeddingUnavailableError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Embedding service temporarily unavailable. Try again later.",
+            )
+        for jd, embedding in zip(missing, embeddings):
+            jd.embedding = embedding
+        await session.flush()
+        await session.commit()
+
+    ranked, best = await RankingService.rank_resumes_multi(
+        session, {jd_id: jds[jd_id].embedding for jd_id in jd_ids}, batch_id=body.batch_id,
+        limit=body.limit, min_score=body.min_score, best_fit=body.include_best_fit,
+    )
+    runs = await ScreeningRepository.create_runs(
+        session, jd_ids, body.batch_id,
+        rank_params={"mode": "vector", "keywords": None, "must_include": [], "must_exclude": [], "min_score": body.min_score},
+    )
+    await ScreeningRepository.add_results_for_runs(session, {
+        run.id: [(resume_id, score, rank_pos) for resume_id, _, score, rank_pos, _ in ranked[run.jd_id]]
+        for run in runs
+    })
+    await session.commit()
+    logger.info("Multi-rank: %d JDs, %d results", len(jd_ids), sum(len(r) for r in ranked.values()))
+    return MultiRankResponse(
+        runs=[
+            RankResponse(
+                run_id=run.id, jd_id=run.jd_id, total_count=len(ranked[run.jd_id]),
+                results=[
+                    RankedResumeItem(resume_id=r_id, filename=fn, similarity_score=score, rank_position=pos, batch_id=bid)
+                    for r_id, fn, score, pos, bid in ranked[run.jd_id]
+                ],
+            )
+            for run in runs
+        ],
+        best_fit=[BestFitItem(resume_id=r_id, jd_id=jd_id, similarity_score=score) for r_id, jd_id, score in best]
+        if body.include_best_fit else None,
+    )
+
+
+@router.post("/rank/explain", response_model=RankExplainResponse)
+@limiter.limit("10/minute", key_func=get_user_or_ip_key)
+async def explain_rank(
+    request: Request,
+    body: RankRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> RankExplainResponse:
+    """Diagnostics for a rank request (counts + EXPLAIN ANALYZE); kept off the normal /rank path. Creates no run."""
+    jd = await JobDescriptionRepository.get_by_id(session, body.jd_id, with_embedding=True)
+    if not jd or jd.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job description not found")
+    diagnostics = await RankingService.explain_rank(
+        session, current_user.id, jd.embedding,
+        batch_id=body.batch_id, limit=body.limit, min_score=body.min_score, ef_search=body.ef_search,
+    )
+    return RankExplainResponse(**diagnostics)
+
+
+@router.get("/resumes/{resume_id}/matches", response_model=ResumeMatchesResponse)
+@limiter.limit("60/minute", key_func=get_user_or_ip_key)
+async def match_jobs_for_resume(
+    request: Request,
+    resume_id: UUID,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> ResumeMatchesResponse:
+    """Your job descriptions ranked by similarity to one resume (reverse of /rank)."""
+    resume = await ResumeRepository.get_embedding_for_user(session, resume_id, current_user.id)
+    if resume is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found")
+    resume_status, embedding = resume
+    if embedding is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Resume has no embedding yet (status: {resume_status})",
+        )
+    matches = await RankingService.match_job_descriptions(session, current_user.id, embedding, limit=limit)
+    return ResumeMatchesResponse(
+        resume_id=resume_id,
+        results=[
+            JobMatchItem(jd_id=jd_id, title=title, similarity_score=score, rank_position=pos)
+            for jd_id, title, score, pos in matches
+        ],
+    )
 
 
 @router.get("/runs", response_model=PaginatedRuns)
@@ -86,14 +269,68 @@ async def list_runs(
     pagination: PaginationParams = Depends(get_pagination),
 ) -> PaginatedRuns:
     rows, total = await ScreeningRepository.list_runs_for_user_with_result_counts(
-        session, current_user.id, jd_id=jd_id, page=pagination.page, page_size=pagination.page_size
+        session, current_user.id, jd_id=jd_id, page=pagination.page, page_size=pagination.page_size,
+        after=keyset_after(pagination, datetime, UUID), with_total=pagination.with_total,
     )
     items = [
         ScreeningRunListItem(id=r[0], jd_id=r[1], batch_id=r[2], created_at=r[3], result_count=r[4])
         for r in rows
     ]
-    pages = (total + pagination.page_size - 1) // pagination.page_size if total else 0
-    return PaginatedRuns(items=items, total=total, page=pagination.page, page_size=pagination.page_size, pages=pages)
+    next_cursor = encode_cursor(rows[-1][3], rows[-1][0]) if len(rows) == pagination.page_size else None
+    return PaginatedRuns(
+        items=items, total=total, page=pagination.page, page_size=pagination.page_size,
+        pages=page_count(total, pagination.page_size), next_cursor=next_cursor,
+    )
+
+
+@router.post("/runs/{run_id}/incremental", response_model=IncrementalRankResponse)
+@limiter.limit("30/minute", key_func=get_user_or_ip_key)
+async def rank_incremental(
+    request: Request,
+    run_id: UUID,
+    body: IncrementalRankRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> IncrementalRankResponse:
+    """New run = base run's ranking + resumes processed since it, scored alone and merged in."""
+    base = await ScreeningRepository.get_run_by_id(session, run_id)
+    if not base:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    jd = await JobDescriptionRepository.get_by_id(session, base.jd_id, with_embedding=True)
+    if not jd or jd.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
+    if jd.embedding is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job description has no embedding")
+    params = base.rank_params
+    # Hybrid scores are fused ranks and unrecorded runs may be either: cosine scores would not merge into them
+    if params is None or params.get("mode") != "vector":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only vector runs can be extended incrementally; rank again instead",
+        )
+    # Never looser than the base run: new resumes must pass its threshold and term filters too
+    min_scores = [m for m in (params.get("min_score"), body.min_score) if m is not None]
+    min_score = max(min_scores) if min_scores else None
+    base_ranked = await ScreeningRepository.get_ranked_results(session, base.id)
+    limit = body.limit or max(len(base_ranked), 1)
+    new = await RankingService.score_new_since(
+        session, jd.embedding, base.created_at, base.id, batch_id=base.batch_id, min_score=min_score,
+        must_include=params.get("must_include"), must_exclude=params.get("must_exclude"),
+    )
+    ranked, added = RankingService.merge_ranked(base_ranked, new, limit)
+    logger.info("Incremental rank: base_run=%s scored=%d added=%d", base.id, len(new), added)
+    run = await ScreeningRepository.create_run(
+        session, base.jd_id, base.batch_id, base_run_id=base.id, delta_scored=len(new), delta_added=added,
+        rank_params={**params, "min_score": min_score},
+    )
+    await ScreeningRepository.add_results_for_runs(session, {
+        run.id: [(resume_id, score, rank_pos) for resume_id, _, score, rank_pos, _ in ranked],
+    })
+    await session.commit()
+    response = _rank_response(run.id, jd.id, ranked, None)
+    return IncrementalRankResponse(
+        **response.model_dump(), base_run_id=base.id, delta_scored=len(new), delta_added=added,
+    )
 
 
 @router.get("/runs/{run_id}", response_model=RunDetailResponse)
@@ -109,16 +346,19 @@ async def get_run(
     jd = await JobDescriptionRepository.get_by_id(session, run.jd_id)
     if not jd or jd.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Run not found")
-    from sqlalchemy import func, select
-    from app.models.screening import ScreeningResult
-    from app.models.upload import Resume
-    q = select(ScreeningResult, Resume).join(Resume, Resume.id == ScreeningResult.resume_id).where(ScreeningResult.run_id == run_id).order_by(ScreeningResult.rank_position)
-    offset = (pagination.page - 1) * pagination.page_size
-    q = q.offset(offset).limit(pagination.page_size)
-    result = await session.execute(q)
-    rows = result.all()
-    total_q = await session.execute(select(func.count()).select_from(ScreeningResult).where(ScreeningResult.run_id == run_id))
-    total = total_q.scalar() or 0
-    results = [ScreeningResultItem(resume_id=sr.resume_id, filename=r.filename, similarity_score=float(sr.similarity_score), rank_position=sr.rank_position) for sr, r in rows]
-    return RunDetailResponse(id=run.id, jd_id=run.jd_id, batch_id=run.batch_id, created_at=run.created_at, results=results, total=total)
+    after = keyset_after(pagination, int)
+    rows, total = await ScreeningRepository.get_results_page(
+        session, run_id, page=pagination.page, page_size=pagination.page_size,
+        after_rank=after[0] if after else None, with_total=pagination.with_total,
+    )
+    results = [
+        ScreeningResultItem(resume_id=resume_id, filename=filename, similarity_score=score, rank_position=rank_pos)
+        for resume_id, filename, score, rank_pos in rows
+    ]
+    next_cursor = encode_cursor(rows[-1][3]) if len(rows) == pagination.page_size else None
+    return RunDetailResponse(
+        id=run.id, jd_id=run.jd_id, batch_id=run.batch_id, created_at=run.created_at, results=results, total=total,
+        next_cursor=next_cursor,
+        base_run_id=run.base_run_id, delta_scored=run.delta_scored, delta_added=run.delta_added,
+    )
 
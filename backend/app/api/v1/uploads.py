@@ -2,15 +2,21 @@
 import asyncio
 import os
 import uuid
+from datetime import datetime
 from pathlib import Path
 
 import aiofiles
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 
+from app.core.admission import check_admission
+from app.core.batch_events import BatchProgress, channel, stream_batch_events
+from app.core.ingest_queue import get_queue_stats, plan_ingest
+from app.core.pagination import encode_cursor, page_count
 from app.core.rate_limit import get_user_or_ip_key, limiter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, keyset_after
 from app.config import get_settings
 from app.db.session import get_async_session
 from app.models.user import User
@@ -21,9 +27,11 @@ from app.schemas.uploads import (
     BatchListItem,
     BatchResponse,
     PaginatedBatches,
+    QueueStatsResponse,
     ResumeSummary,
 )
 from app.tasks.process_resume import process_resume_task
+from app.tasks.stream_worker import publish_resume_jobs
 
 router = APIRouter()
 settings = get_settings()
@@ -73,6 +81,18 @@ async def create_batch(
                 detail=f"File too large. Max {settings.max_file_size_mb} MB",
             )
 
+    # Admission control before anything is stored (inline processing has no queue to protect)
+    admission = None
+    if not settings.process_resumes_inline:
+        admission = await check_admission(str(current_user.id), len(files))
+        if not admission.admitted and settings.admission_mode != "defer":
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Ingestion pipeline saturated: {admission.reason}",
+                headers={"Retry-After": str(admission.retry_after_seconds)},
+            )
+    deferred = admission is not None and not admission.admitted
+
     batch = await BatchRepository.create(session, current_user.id, batch_name)
     saved_paths: list[tuple[str, int, str]] = []  # (rel_path, size, original_filename)
     for f in files:
@@ -104,19 +124,49 @@ async def create_batch(
         resume = await ResumeRepository.create(session, batch.id, original_filename, file_path=rel_path, file_size=size)
         resumes_created.append((str(resume.id), rel_path))
 
-    batch.status = "processing"
+    batch.status = "deferred" if deferred else "processing"
     await session.commit()  # Persist before task runs (task needs resume in DB)
 
-    for resume_id_str, rel_path in resumes_created:
-        if settings.process_resumes_inline:
+    if deferred:
+        pass  # Enqueued by the sweeper once admission limits allow (app.tasks.sweeper)
+    elif settings.process_resumes_inline:
+        for resume_id_str, rel_path in resumes_created:
             # Process inline (for dev when Celery/Redis not running). Blocks until extraction + embedding done.
             await asyncio.to_thread(process_resume_task, resume_id_str, rel_path)
-        else:
-            process_resume_task.delay(resume_id_str, rel_path)
+    elif settings.ingest_backend == "streams":
+        tenant_id = str(current_user.id)
+        plan = await plan_ingest(tenant_id, len(resumes_created))
+        await publish_resume_jobs(resumes_created, tenant_id=tenant_id, enqueued_at=plan.enqueued_at)
+    else:
+        tenant_id = str(current_user.id)
+        plan = await plan_ingest(tenant_id, len(resumes_created))
+        for (resume_id_str, rel_path), priority in zip(resumes_created, plan.priorities):
+            process_resume_task.apply_async(
+                args=[resume_id_str, rel_path],
+                kwargs={"tenant_id": tenant_id, "enqueued_at": plan.enqueued_at},
+                queue=plan.queue,
+                priority=priority,
+            )
 
     if settings.process_resumes_inline:
         await session.refresh(batch)  # Get batch status set by inline task
-    return BatchCreateResponse(batch_id=batch.id, status=batch.status, file_count=len(files))
+    return BatchCreateResponse(
+        batch_id=batch.id,
+        status=batch.status,
+        file_count=len(files),
+        estimated_completion_at=admission.estimated_completion_at if admission and not deferred else None,
+        queued_ahead=admission.queued_ahead if admission else None,
+    )
+
+
+@router.get("/queue-stats", response_model=QueueStatsResponse)
+async def queue_stats(current_user: User = Depends(get_current_user)) -> QueueStatsResponse:
+    """Ingestion lane depths plus the current user's queued tasks and queue wait times."""
+    try:
+        stats = await get_queue_stats(str(current_user.id))
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Queue metrics unavailable")
+    return QueueStatsResponse(**stats)
 
 
 @router.get("/batches", response_model=PaginatedBatches)
@@ -126,14 +176,48 @@ async def list_batches(
     pagination: PaginationParams = Depends(get_pagination),
 ) -> PaginatedBatches:
     rows, total = await BatchRepository.list_for_user_with_resume_counts(
-        session, current_user.id, page=pagination.page, page_size=pagination.page_size
+        session, current_user.id, page=pagination.page, page_size=pagination.page_size,
+        after=keyset_after(pagination, datetime, uuid.UUID), with_total=pagination.with_total,
     )
     items = [
         BatchListItem(id=r[0], batch_name=r[1], status=r[2], created_at=r[3], resume_count=r[4])
         for r in rows
     ]
-    pages = (total + pagination.page_size - 1) // pagination.page_size if total else 0
-    return PaginatedBatches(items=items, total=total, page=pagination.page, page_size=pagination.page_size, pages=pages)
+    next_cursor = encode_cursor(rows[-1][3], rows[-1][0]) if len(rows) == pagination.page_size else None
+    return PaginatedBatches(
+        items=items, total=total, page=pagination.page, page_size=pagination.page_size,
+        pages=page_count(total, pagination.page_size), next_cursor=next_cursor,
+    )
+
+
+@router.get("/batches/{batch_id}/events")
+async def batch_events(
+    batch_id: uuid.UUID,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-Sent Events: a progress snapshot, then one event per resume status change until the batch finishes."""
+    batch = await BatchRepository.get_by_id(session, batch_id)
+    if not batch or batch.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    from redis.asyncio import Redis
+
+    client = Redis.from_url(settings.redis_url, decode_responses=True)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(channel(batch_id))  # before the snapshot, so no change falls in between
+    except Exception:
+        await client.aclose()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Progress stream unavailable")
+    counts = await ResumeRepository.count_by_status(session, batch_id)
+    progress = BatchProgress(counts, batch.status)
+    await session.close()  # do not hold a pooled connection for the lifetime of the stream
+    return StreamingResponse(
+        stream_batch_events(client, pubsub, progress, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/batches/{batch_id}", response_model=BatchResponse)
@@ -145,13 +229,10 @@ async def get_batch(
     batch = await BatchRepository.get_by_id(session, batch_id)
     if not batch or batch.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
-    from sqlalchemy import select
-    from app.models.upload import Resume
-    res = await session.execute(select(Resume).where(Resume.batch_id == batch_id))
-    resumes = list(res.scalars().all())
+    resumes = await ResumeRepository.list_summaries(session, batch_id)
     resume_summaries = [
-        ResumeSummary(id=r.id, filename=r.filename, status=r.status)
-        for r in resumes
+        ResumeSummary(id=resume_id, filename=filename, status=resume_status)
+        for resume_id, filename, resume_status in resumes
     ]
     return BatchResponse(
         id=batch.id,
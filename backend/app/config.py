@@ -33,10 +33,63 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     celery_broker_url: Optional[str] = None  # Defaults to redis_url
 
+    # Drainer for resumes parked in awaiting_embedding (Celery beat)
+    embedding_drain_interval_seconds: float = 60.0
+    embedding_drain_batch_size: int = 64  # Texts per provider request (<= 8000 chars each)
+    embedding_drain_max_batches: int = 20  # Per run
+
+    # Stuck-job sweeper (Celery beat): re-enqueue resumes left in progress by lost workers
+    sweeper_interval_seconds: float = 300.0
+    sweeper_stuck_after_seconds: int = 1800  # No status change for this long = candidate
+    sweeper_hard_deadline_seconds: int = 4 * 3600  # Re-enqueue even if the tenant still has queued tasks
+    sweeper_max_requeue: int = 500  # Per run
+
+    # Celery worker DB pool (per process). None = derived from worker concurrency (see app.tasks.worker_resources)
+    worker_db_pool_size: Optional[int] = None
+    worker_db_max_overflow: int = 2
+
+    # Ingestion queues: priority lane for small/interactive work, bulk lane with per-tenant fair priorities
+    ingest_priority_max_files: int = 20  # Batches up to this size use the priority lane
+    ingest_fair_quantum: int = 25  # Files per tenant served at top priority before the tenant's backlog is demoted
+    ingest_tenant_weights: dict[str, float] = {}  # Optional user_id -> weight (>1 = larger fair share)
+
+    # Admission control on uploads (0 = limit disabled). Saturated: "reject" (429 + Retry-After) or "defer"
+    # (batch stored as deferred and released by the sweeper once there is room)
+    admission_mode: str = "reject"
+    admission_max_queue_depth: int = 0  # Files queued across all tenants
+    admission_max_tenant_queued: int = 0  # Files queued for one tenant
+    admission_max_eta_seconds: int = 0  # Estimated time until a new batch completes
+    admission_throughput_window_minutes: int = 15
+
+    # Batch progress stream (SSE over Redis pub/sub)
+    batch_events_heartbeat_seconds: float = 15.0
+    batch_events_max_seconds: int = 3600  # Clients reconnect (and get a fresh snapshot) after this
+
+    # Ingestion backend: "celery" (default) or "streams" (asyncio worker: python -m app.tasks.stream_worker)
+    ingest_backend: str = "celery"
+    ingest_stream_key: str = "ingest:resumes"
+    ingest_stream_group: str = "ingest-workers"
+    stream_worker_max_in_flight: int = 200  # Resumes in progress per worker process (backpressure)
+    stream_worker_extract_processes: int = 0  # Extraction process pool size; 0 = CPU count
+    stream_worker_db_pool_size: int = 20
+    stream_worker_reclaim_idle_ms: int = 60_000  # Pending entries idle this long are reclaimed (crash/retry)
+
     # OpenAI (embeddings only)
     openai_api_key: str = ""
     openai_embedding_model: str = "text-embedding-3-small"
     openai_embedding_dimensions: int = 1536
+    # Worker-side micro-batching of embed calls across concurrent tasks (useful with --pool threads/gevent)
+    embedding_aggregator_enabled: bool = False
+    embedding_aggregator_max_batch: int = 32
+    embedding_aggregator_max_wait_ms: float = 5.0
+
+    # Task retries: transient failures are rescheduled via Celery countdown (no sleeping in the worker)
+    task_max_retries: int = 5
+    task_retry_backoff_base_seconds: float = 2.0
+    task_retry_backoff_max_seconds: float = 300.0
+    dead_letter_key: str = "dlq:process_resume"
+    # Per-resume lease so redelivered duplicates exit early (heartbeat extends it every ttl/3)
+    resume_lock_ttl_seconds: float = 120.0
 
     # JWT
     jwt_secret_key: str = "change-me-in-production"
@@ -52,9 +105,44 @@ class Settings(BaseSettings):
     upload_dir: str = "uploads"
     temp_dir: str = "temp"
 
+    # Vector index (resumes.embedding). Build parameters are read by the migration; query-time ones are
+    # server settings of each API DB connection (app.db.session)
+    vector_index_type: str = "hnsw"  # hnsw or ivfflat
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    ivfflat_lists: int = 100  # ~ rows / 1000 up to 1M rows
+    hnsw_ef_search: int = 100  # Connection default; raised per query to the requested limit if smaller
+    ivfflat_probes: int = 10
+    hnsw_iterative_scan: str = "relaxed_order"  # pgvector >= 0.8 with filters; "off" to disable
+
+    # Largest `limit` a rank request may ask for; every ranked row is persisted as a screening result
+    rank_max_limit: int = 1000
+
+    # In-process ranking for batch-scoped requests (app.services.ranking.matrix): exact cosine over a cached
+    # float32 matrix instead of an index scan when the batch has at most this many rankable resumes (0 = off)
+    rank_matrix_max_candidates: int = 5000
+    rank_matrix_cache_dir: str = "temp/rank_matrix"
+    rank_matrix_cache_batches: int = 32  # memory-mapped matrices kept open per API process
+
+    # Hybrid ranking (mode="hybrid"): reciprocal rank fusion of the vector and full-text candidate lists
+    hybrid_candidates: int = 200  # depth of each list (at least the requested limit)
+    hybrid_rrf_k: int = 60
+    hybrid_vector_weight: float = 1.0
+    hybrid_lexical_weight: float = 1.0
+    hybrid_query_terms: int = 32  # most frequent JD lexemes OR-ed into the full-text query when no keywords are given
+
+    # Rank memo (app.services.ranking.memo): identical rank requests on unchanged data return the stored run
+    rank_memo_ttl_seconds: int = 86400  # 0 disables
+    rank_memo_lock_seconds: int = 30  # max wait for an identical in-flight request
+
+    # JD watch mode (app.services.ranking.watch): shortlist size per watched JD, alert threshold for new entries
+    watch_top_k: int = 100
+    watch_alert_min_score: float = 0.8
+
     # Pagination
     default_page_size: int = 20
     max_page_size: int = 100
+    pagination_total_cache_seconds: int = 30  # totals of cursor-paginated lists are cached this long (0 = exact)
 
     def __init__(self, **kwargs):  # type: ignore
         super().__init__(**kwargs)
@@ -0,0 +1,114 @@
+"""
+Admission control for uploads: measure pipeline throughput and queue depth, estimate when a new batch
+would complete, and refuse (or defer) work once configured limits are exceeded.
+
+Throughput = resumes finished over the last `admission_throughput_window_minutes` full minutes (counters
+written by workers, see ingest_queue.record_task_finished). Queue depth = queued files per tenant from
+`ingest:depth`. Without throughput data (idle pipeline, fresh deploy) no ETA is given and only the depth
+limits apply. Metrics errors fail open: uploads are never blocked because Redis is unreachable.
+"""
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from app.config import get_settings
+from app.core.ingest_queue import DEPTH_KEY, DONE_KEY_PREFIX
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DEFAULT_RETRY_AFTER_SECONDS = 60
+MAX_RETRY_AFTER_SECONDS = 3600
+
+
+@dataclass
+class AdmissionDecision:
+    admitted: bool
+    queued_ahead: int = 0
+    throughput_per_minute: float | None = None
+    estimated_completion_at: datetime | None = None
+    retry_after_seconds: int | None = None
+    reason: str | None = None
+
+
+def _minute_keys() -> list[str]:
+    current = int(time.time() // 60)
+    window = max(settings.admission_throughput_window_minutes, 1)
+    # Full minutes only: the current minute is still filling up
+    return [f"{DONE_KEY_PREFIX}{current - i}" for i in range(1, window + 1)]
+
+
+def evaluate(file_count: int, global_queued: int, tenant_queued: int, done_per_minute: list[int]) -> AdmissionDecision:
+    """Pure decision from current metrics (unit-tested)."""
+    finished = sum(done_per_minute)
+    rate = finished / (len(done_per_minute) * 60) if done_per_minute and finished else None  # files/second
+    eta_seconds = (global_queued + file_count) / rate if rate else None
+    decision = AdmissionDecision(
+        admitted=True,
+        queued_ahead=global_queued,
+        throughput_per_minute=round(rate * 60, 2) if rate else None,
+        estimated_completion_at=datetime.now(timezone.utc) + timedelta(seconds=eta_seconds) if eta_seconds else None,
+    )
+
+    def retry_after(excess_files: float) -> int:
+        if not rate:
+            return DEFAULT_RETRY_AFTER_SECONDS
+        return int(min(max(math.ceil(excess_files / rate), 1), MAX_RETRY_AFTER_SECONDS))
+
+    # Each limit is only enforced while something is queued ahead: a batch larger than a limit on its own is
+    # admitted once the queue is empty, since waiting longer could never make it fit
+    limit = settings.admission_max_tenant_queued
+    if limit and tenant_queued > 0 and tenant_queued + file_count > limit:
+        decision.reason = f"Too many files queued for this account ({tenant_queued}, limit {limit})"
+        decision.retry_after_seconds = retry_after(tenant_queued + file_count - limit)
+    limit = settings.admission_max_queue_depth
+    if not decision.reason and limit and global_queued > 0 and global_queued + file_count > limit:
+        decision.reason = f"Ingestion queue is full ({global_queued} files queued)"
+        decision.retry_after_seconds = retry_after(global_queued + file_count - limit)
+    limit = settings.admission_max_eta_seconds
+    if not decision.reason and limit and global_queued > 0 and eta_seconds and eta_seconds > limit:
+        decision.reason = f"Estimated completion in {int(eta_seconds)}s exceeds {limit}s"
+        decision.retry_after_seconds = int(min(math.ceil(eta_seconds - limit), MAX_RETRY_AFTER_SECONDS))
+    decision.admitted = decision.reason is None
+    return decision
+
+
+def _from_metrics(file_count: int, tenant_id: str, depths: dict, done: list) -> AdmissionDecision:
+    global_queued = sum(max(int(v), 0) for v in depths.values())
+    tenant_queued = max(int(depths.get(tenant_id, 0)), 0)
+    return evaluate(file_count, global_queued, tenant_queued, [int(v or 0) for v in done])
+
+
+async def check_admission(tenant_id: str, file_count: int) -> AdmissionDecision:
+    """Upload endpoint: decide whether a batch of `file_count` files is admitted now."""
+    from redis.asyncio import Redis
+
+    client = Redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(DEPTH_KEY)
+        pipe.mget(_minute_keys())
+        depths, done = await pipe.execute()
+    except Exception as e:
+        logger.warning("Admission metrics unavailable, admitting batch: %s", e)
+        return AdmissionDecision(admitted=True)
+    finally:
+        await client.aclose()
+    return _from_metrics(file_count, tenant_id, depths or {}, done or [])
+
+
+def check_admission_sync(tenant_id: str, file_count: int) -> AdmissionDecision:
+    """check_admission for sync callers (sweeper releasing deferred batches)."""
+    from app.core.redis_client import get_sync_client
+
+    try:
+        pipe = get_sync_client().pipeline(transaction=False)
+        pipe.hgetall(DEPTH_KEY)
+        pipe.mget(_minute_keys())
+        depths, done = pipe.execute()
+    except Exception as e:
+        logger.warning("Admission metrics unavailable, admitting batch: %s", e)
+        return AdmissionDecision(admitted=True)
+    return _from_metrics(file_count, tenant_id, depths or {}, done or [])
@@ -0,0 +1,130 @@
+"""
+Batch progress events over Redis pub/sub (channel `batch:<batch_id>:events`).
+
+Workers publish each resume status change (with the previous status, so subscribers can keep counts
+without reading the DB) and the final batch status. GET /uploads/batches/{id}/events turns the channel into
+a Server-Sent Events stream: one snapshot from the DB, then incremental progress. Publishing is
+best-effort: a lost event only delays the client until its next snapshot (reconnect).
+"""
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+BATCH_FINAL_STATUSES = ("completed", "failed")
+RESUME_DONE_STATUSES = ("processed", "failed")
+
+
+def channel(batch_id) -> str:
+    return f"batch:{batch_id}:events"
+
+
+def resume_event(resume_id, status: str, previous: str | None) -> str:
+    return json.dumps({"type": "resume", "resume_id": str(resume_id), "status": status, "previous": previous, "ts": time.time()})
+
+
+def batch_event(status: str) -> str:
+    return json.dumps({"type": "batch", "status": status, "ts": time.time()})
+
+
+def publish_resume_event(batch_id, resume_id, status: str, previous: str | None = None) -> None:
+    """Sync publisher (Celery tasks, drainer). Never raises."""
+    _publish_sync(batch_id, resume_event(resume_id, status, previous))
+
+
+def publish_batch_event(batch_id, status: str) -> None:
+    _publish_sync(batch_id, batch_event(status))
+
+
+def _publish_sync(batch_id, message: str) -> None:
+    from app.core.redis_client import get_sync_client
+
+    try:
+        get_sync_client().publish(channel(batch_id), message)
+    except Exception as e:
+        logger.debug("Batch event publish failed for %s: %s", batch_id, e)
+
+
+async def publish_async(client, batch_id, message: str) -> None:
+    """Async publisher (stream worker). Never raises."""
+    try:
+        await client.publish(channel(batch_id), message)
+    except Exception as e:
+        logger.debug("Batch event publish failed for %s: %s", batch_id, e)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class BatchProgress:
+    """Counts per status, updated from events (starts from the DB snapshot)."""
+
+    def __init__(self, counts: dict[str, int], batch_status: str) -> None:
+        self.counts = dict(counts)
+        self.total = sum(counts.values())
+        self.batch_status = batch_status
+        self.started = time.monotonic()
+        self.done_since_start = 0
+
+    def apply(self, event: dict) -> None:
+        if event.get("type") == "batch":
+            self.batch_status = event["status"]
+            return
+        previous, status = event.get("previous"), event["status"]
+        if previous == status:
+            return
+        if previous and self.counts.get(previous, 0) > 0:
+            self.counts[previous] -= 1
+        self.counts[status] = self.counts.get(status, 0) + 1
+        if status in RESUME_DONE_STATUSES and previous not in RESUME_DONE_STATUSES:
+            self.done_since_start += 1
+
+    def as_dict(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "batch_status": self.batch_status,
+            "total": self.total,
+            "done": sum(self.counts.get(s, 0) for s in RESUME_DONE_STATUSES),
+            "counts": self.counts,
+            "throughput_per_minute": round(self.done_since_start * 60 / elapsed, 2) if elapsed >= 1 else None,
+        }
+
+    @property
+    def finished(self) -> bool:
+        return self.batch_status in BATCH_FINAL_STATUSES
+
+
+async def stream_batch_events(client, pubsub, progress: BatchProgress, is_disconnected) -> AsyncIterator[str]:
+    """SSE generator over an already-subscribed pubsub (subscribe before taking the snapshot). Closes both."""
+    deadline = time.monotonic() + settings.batch_events_max_seconds
+    last_sent = time.monotonic()
+    try:
+        yield _sse("snapshot", progress.as_dict())
+        while not progress.finished and time.monotonic() < deadline:
+            if await is_disconnected():
+                break
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is None:
+                if time.monotonic() - last_sent >= settings.batch_events_heartbeat_seconds:
+                    last_sent = time.monotonic()
+                    yield ": keepalive\n\n"
+                continue
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            progress.apply(event)
+            last_sent = time.monotonic()
+            yield _sse(event["type"], {**event, **progress.as_dict()})
+    finally:
+        try:
+            await pubsub.aclose()
+            await client.aclose()
+        except Exception as e:
+            logger.debug("Closing batch event subscription failed: %s", e)
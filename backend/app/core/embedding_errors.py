@@ -1,5 +1,39 @@
-"""Exceptions for embedding service (e.g. circuit open, unavailable)."""
+"""Exceptions for embedding service (e.g. circuit open, unavailable) and retry classification."""
+import openai
 
 
 class EmbeddingUnavailableError(Exception):
     """Raised when embedding cannot be computed (e.g. circuit breaker open, service down)."""
+
+
+# Provider failures that are worth retrying later: throttling, timeouts, network and 5xx errors.
+_RETRYABLE_ERRORS = (
+    EmbeddingUnavailableError,
+    openai.RateLimitError,
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.InternalServerError,
+)
+_RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def is_retryable_embedding_error(exc: BaseException) -> bool:
+    """True for transient embedding failures; auth, bad request and other 4xx errors fail fast."""
+    if isinstance(exc, _RETRYABLE_ERRORS):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in _RETRYABLE_STATUS_CODES or exc.status_code >= 500
+    return False
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the provider's Retry-After hint (seconds) if the error carries one."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
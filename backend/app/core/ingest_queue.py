@@ -0,0 +1,202 @@
+"""
+Ingestion routing and per-tenant queue metrics.
+
+Two Celery lanes: small interactive batches go to the priority lane, everything else to the bulk lane.
+Within the lanes each task gets a broker priority from its position in the tenant's backlog (logarithmic
+buckets of `ingest_fair_quantum` files, scaled by the tenant weight), so a 5,000-file import only occupies
+the top priority for its first few files and other tenants' uploads interleave with it. The Redis transport
+polls priority-major across queues (all priority-0 lists, then priority-1, ...), which makes the buckets
+global.
+
+Metrics live in Redis: `ingest:depth` (tenant -> queued tasks), `ingest:wait:<tenant>` (count,
+total/max wait seconds and per-bucket wait counts for SLOs), `ingest:done:<minute>` (throughput) and `ingest:backlog` (in-progress counts and
+oldest age, written by the stuck-job sweeper).
+"""
+import logging
+import time
+from dataclasses import dataclass
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+INGEST_PRIORITY_QUEUE = "ingest.priority"
+INGEST_BULK_QUEUE = "ingest.bulk"
+INGEST_QUEUES = (INGEST_PRIORITY_QUEUE, INGEST_BULK_QUEUE)
+PRIORITY_STEPS = list(range(10))  # 0 = served first (Redis transport semantics)
+QUEUE_PRIORITY_SEP = ":"
+
+DEPTH_KEY = "ingest:depth"
+WAIT_KEY_PREFIX = "ingest:wait:"
+BACKLOG_KEY = "ingest:backlog"
+DONE_KEY_PREFIX = "ingest:done:"  # + epoch minute -> resumes finished in that minute
+LOCK_METRICS_KEY = "ingest:lock_metrics"  # written by app.core.resume_lock
+WAIT_BUCKETS_SECONDS = (1, 10, 60, 300, 1800, 3600)
+
+
+@dataclass
+class IngestPlan:
+    queue: str
+    priorities: list[int]
+    enqueued_at: float
+
+
+def route_for(file_count: int) -> str:
+    """Pick the lane: small batches go to the priority lane."""
+    if file_count <= settings.ingest_priority_max_files:
+        return INGEST_PRIORITY_QUEUE
+    return INGEST_BULK_QUEUE
+
+
+def fair_priority(position: int, weight: float = 1.0) -> int:
+    """Map a job's position in its tenant's backlog to a broker priority (0..9, 0 first)."""
+    quantum = max(settings.ingest_fair_quantum * max(weight, 0.01), 1.0)
+    bucket = int(max(position, 0) // quantum).bit_length()
+    return min(bucket, PRIORITY_STEPS[-1])
+
+
+def tenant_weight(tenant_id: str) -> float:
+    return settings.ingest_tenant_weights.get(tenant_id, 1.0)
+
+
+def _wait_bucket_field(seconds: float) -> str:
+    for limit in WAIT_BUCKETS_SECONDS:
+        if seconds <= limit:
+            return f"le_{limit}"
+    return "le_inf"
+
+
+def _async_client():
+    from redis.asyncio import Redis
+    return Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+def _plan(tenant_id: str, file_count: int, backlog_before: int) -> IngestPlan:
+    queue = route_for(file_count)
+    if queue == INGEST_PRIORITY_QUEUE:
+        priorities = [0] * file_count
+    else:
+        weight = tenant_weight(tenant_id)
+        priorities = [fair_priority(backlog_before + i, weight) for i in range(file_count)]
+    return IngestPlan(queue=queue, priorities=priorities, enqueued_at=time.time())
+
+
+async def plan_ingest(tenant_id: str, file_count: int) -> IngestPlan:
+    """Reserve `file_count` slots in the tenant backlog and return lane + per-file priorities."""
+    backlog_before = 0
+    client = _async_client()
+    try:
+        backlog_after = await client.hincrby(DEPTH_KEY, tenant_id, file_count)
+        backlog_before = max(backlog_after - file_count, 0)
+    except Exception as e:
+        logger.warning("Ingest depth update failed for tenant %s: %s", tenant_id, e)
+    finally:
+        await client.aclose()
+    return _plan(tenant_id, file_count, backlog_before)
+
+
+def plan_ingest_sync(tenant_id: str, file_count: int) -> IngestPlan:
+    """plan_ingest for sync callers (sweeper releasing deferred batches)."""
+    from app.core.redis_client import get_sync_client
+
+    backlog_before = 0
+    try:
+        backlog_after = get_sync_client().hincrby(DEPTH_KEY, tenant_id, file_count)
+        backlog_before = max(backlog_after - file_count, 0)
+    except Exception as e:
+        logger.warning("Ingest depth update failed for tenant %s: %s", tenant_id, e)
+    return _plan(tenant_id, file_count, backlog_before)
+
+
+def record_task_started(tenant_id: str | None, enqueued_at: float | None) -> None:
+    """Worker side: the task left the queue; decrement tenant depth and record its wait time."""
+    if not tenant_id:
+        return
+    from app.core.redis_client import get_sync_client
+
+    try:
+        pipe = get_sync_client().pipeline()
+        pipe.hincrby(DEPTH_KEY, tenant_id, -1)
+        if enqueued_at:
+            wait = max(time.time() - enqueued_at, 0.0)
+            key = f"{WAIT_KEY_PREFIX}{tenant_id}"
+            pipe.hincrby(key, "count", 1)
+            pipe.hincrbyfloat(key, "total_seconds", wait)
+            pipe.hincrby(key, _wait_bucket_field(wait), 1)
+            pipe.hset(key, "last_seconds", round(wait, 3))
+        pipe.execute()
+        if enqueued_at:
+            _update_max_wait(tenant_id, wait)
+    except Exception as e:
+        logger.warning("Ingest metrics update failed for tenant %s: %s", tenant_id, e)
+
+
+def record_task_finished() -> None:
+    """Worker side: one resume left the pipeline; per-minute counters give admission control its throughput."""
+    from app.core.redis_client import get_sync_client
+
+    key = f"{DONE_KEY_PREFIX}{int(time.time() // 60)}"
+    try:
+        pipe = get_sync_client().pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, (settings.admission_throughput_window_minutes + 2) * 60)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Throughput counter update failed: %s", e)
+
+
+def _update_max_wait(tenant_id: str, wait: float) -> None:
+    from app.core.redis_client import get_sync_client
+
+    key = f"{WAIT_KEY_PREFIX}{tenant_id}"
+    client = get_sync_client()
+    current = float(client.hget(key, "max_seconds") or 0)
+    if wait > current:
+        client.hset(key, "max_seconds", round(wait, 3))
+
+
+async def get_queue_stats(tenant_id: str) -> dict:
+    """Queue depth per lane, the tenant's backlog and wait-time stats, and the global backlog age."""
+    client = _async_client()
+    try:
+        pipe = client.pipeline()
+        for queue in INGEST_QUEUES:
+            for pri in PRIORITY_STEPS:
+                pipe.llen(queue if pri == 0 else f"{queue}{QUEUE_PRIORITY_SEP}{pri}")
+        pipe.hget(DEPTH_KEY, tenant_id)
+        pipe.hgetall(f"{WAIT_KEY_PREFIX}{tenant_id}")
+        pipe.hget(LOCK_METRICS_KEY, "duplicate")
+        pipe.hgetall(BACKLOG_KEY)
+        results = await pipe.execute()
+    finally:
+        await client.aclose()
+    steps = len(PRIORITY_STEPS)
+    lanes = {queue: sum(results[i * steps:(i + 1) * steps]) for i, queue in enumerate(INGEST_QUEUES)}
+    backlog = results[-1] or {}
+    duplicates = int(results[-2] or 0)
+    wait = results[-3] or {}
+    count = int(wait.get("count", 0))
+    total = float(wait.get("total_seconds", 0.0))
+    fields = [f"le_{limit}" for limit in WAIT_BUCKETS_SECONDS] + ["le_inf"]
+    histogram = {field: int(wait.get(field, 0)) for field in fields}
+    return {
+        "lane_depths": lanes,
+        "tenant_queued": max(int(results[-4] or 0), 0),
+        "tenant_wait": {
+            "count": count,
+            "avg_seconds": round(total / count, 3) if count else None,
+            "max_seconds": float(wait["max_seconds"]) if "max_seconds" in wait else None,
+            "last_seconds": float(wait["last_seconds"]) if "last_seconds" in wait else None,
+            "histogram": histogram,
+        },
+        "duplicate_deliveries": duplicates,
+        "backlog": {
+            "oldest_in_progress_seconds": float(backlog["oldest_in_progress_seconds"]),
+            "pending": int(backlog.get("pending_count", 0)),
+            "extracted": int(backlog.get("extracted_count", 0)),
+            "awaiting_embedding": int(backlog.get("awaiting_embedding_count", 0)),
+            "requeued_total": int(backlog.get("requeued_total", 0)),
+            "swept_at": float(backlog["swept_at"]) if "swept_at" in backlog else None,
+        } if "oldest_in_progress_seconds" in backlog else None,
+    }
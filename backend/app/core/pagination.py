@@ -0,0 +1,72 @@
+"""
+Keyset pagination helpers: opaque cursors and cached list totals.
+
+A cursor is the sort key of the last row of a page ((created_at, id) for lists, rank_position for run
+results), JSON-encoded and base64url'd. The next page starts strictly after it, so its cost does not grow
+with depth the way OFFSET does. Totals in cursor mode come from a short-lived per-process cache: they are
+approximate for settings.pagination_total_cache_seconds, and clients can skip them with with_total=false.
+"""
+import base64
+import binascii
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+settings = get_settings()
+
+_TOTALS_MAX_ENTRIES = 4096
+_totals: "OrderedDict[tuple, tuple[float, int]]" = OrderedDict()
+
+
+def encode_cursor(*key) -> str:
+    values = [k.isoformat() if isinstance(k, datetime) else str(k) if isinstance(k, UUID) else k for k in key]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _parse(kind: type, value):
+    if kind is int:
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError("expected an integer")
+        return value
+    if not isinstance(value, str):
+        raise ValueError("expected a string")
+    return datetime.fromisoformat(value) if kind is datetime else kind(value)
+
+
+def decode_cursor(cursor: str, *kinds: type) -> tuple:
+    """Inverse of encode_cursor for a key of the given types (datetime, UUID, int). ValueError if malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(kinds):
+            raise ValueError("wrong key length")
+        return tuple(_parse(kind, value) for kind, value in zip(kinds, values))
+    except (ValueError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def total_count(session: AsyncSession, count_q, cache_key: tuple | None = None) -> int:
+    """Exact count; with cache_key, reuse a value computed in this process within the cache TTL."""
+    now = time.monotonic()
+    if cache_key is not None and settings.pagination_total_cache_seconds > 0:
+        hit = _totals.get(cache_key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+    total = (await session.execute(count_q)).scalar() or 0
+    if cache_key is not None and settings.pagination_total_cache_seconds > 0:
+        _totals[cache_key] = (now + settings.pagination_total_cache_seconds, total)
+        _totals.move_to_end(cache_key)
+        while len(_totals) > _TOTALS_MAX_ENTRIES:
+            _totals.popitem(last=False)
+    return total
+
+
+def page_count(total: int | None, page_size: int) -> int | None:
+    if total is None:
+        return None
+    return (total + page_size - 1) // page_size if total else 0
@@ -1,5 +1,7 @@
-"""Async Redis client for token blacklist (revocation). Uses same REDIS_URL as Celery with key prefix."""
+"""Async Redis client for token blacklist (revocation). Uses same REDIS_URL as Celery with key prefix.
+Sync client for Celery workers (dead-letter queue, metrics); shared async client for per-request API paths (rank memo)."""
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from app.config import get_settings
@@ -19,6 +21,27 @@ def _get_client():
         return None
 
 
+@lru_cache
+def get_async_client():
+    """Shared async Redis client for hot API paths (one connection pool per process); do not close it."""
+    from redis.asyncio import Redis
+    return Redis.from_url(get_settings().redis_url, decode_responses=True)
+
+
+async def close_async_client() -> None:
+    """Close the shared async client's pool (app shutdown), if it was ever created."""
+    if get_async_client.cache_info().currsize:
+        await get_async_client().aclose()
+        get_async_client.cache_clear()
+
+
+@lru_cache
+def get_sync_client():
+    """Shared sync Redis client for Celery workers (connection pool is fork-aware)."""
+    from redis import Redis
+    return Redis.from_url(get_settings().redis_url, decode_responses=True)
+
+
 async def is_token_revoked(jti: str) -> bool:
     """Return True if the token JTI is in the blacklist."""
     client = _get_client()
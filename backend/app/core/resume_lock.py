@@ -0,0 +1,155 @@
+"""
+Lease-based Redis lock per resume, so only one delivery of the same job does the work.
+
+`acks_late` + `task_reject_on_worker_lost` (and XAUTOCLAIM on the streams backend) can redeliver a job while
+a slow first attempt is still running. The first attempt takes the lease with SET NX PX and a random token;
+a heartbeat extends it every ttl/3 while the attempt runs, so a live owner never loses it and a crashed one
+releases it after at most `resume_lock_ttl_seconds`. Extend/release are compare-and-set Lua scripts (only
+the token holder can touch the key). A duplicate delivery costs one SET round trip and is counted in the
+Redis hash `ingest:lock_metrics`.
+
+If Redis is unreachable the lock fails open: the status guards in the DB updates still keep results
+correct, only duplicate work is no longer prevented.
+"""
+import asyncio
+import logging
+import threading
+import uuid
+
+from app.config import get_settings
+from app.core.ingest_queue import LOCK_METRICS_KEY as METRICS_KEY
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+LOCK_PREFIX = "lock:resume:"
+
+_EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end
+return 0
+"""
+
+
+def lock_key(resume_id: str) -> str:
+    return f"{LOCK_PREFIX}{resume_id}"
+
+
+class ResumeLease:
+    """Sync lease (Celery tasks). acquire() -> False means another attempt holds the resume."""
+
+    def __init__(self, resume_id: str, client=None, ttl_seconds: float | None = None) -> None:
+        if client is None:
+            from app.core.redis_client import get_sync_client
+            client = get_sync_client()
+        self.client = client
+        self.key = lock_key(resume_id)
+        self.token = uuid.uuid4().hex
+        self.ttl_ms = int((ttl_seconds or settings.resume_lock_ttl_seconds) * 1000)
+        self.held = False
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def acquire(self) -> bool:
+        try:
+            acquired = bool(self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except Exception as e:
+            logger.warning("Resume lock unavailable (%s); proceeding without it", e)
+            _incr_metric(self.client, "redis_errors")
+            return True
+        _incr_metric(self.client, "acquired" if acquired else "duplicate")
+        if acquired:
+            self.held = True
+            self._thread = threading.Thread(target=self._heartbeat, name=f"lease-{self.key}", daemon=True)
+            self._thread.start()
+        return acquired
+
+    def _heartbeat(self) -> None:
+        interval = self.ttl_ms / 3000
+        while not self._stop.wait(interval):
+            try:
+                if not self.client.eval(_EXTEND_SCRIPT, 1, self.key, self.token, self.ttl_ms):
+                    self.lost = True
+                    _incr_metric(self.client, "lost")
+                    logger.warning("Lease %s lost (expired or taken over)", self.key)
+                    return
+            except Exception as e:
+                logger.warning("Lease heartbeat for %s failed: %s", self.key, e)
+
+    def release(self) -> None:
+        self._stop.set()
+        if not self.held:
+            return
+        self.held = False
+        try:
+            self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning("Lease release for %s failed (expires on its own): %s", self.key, e)
+
+
+class AsyncResumeLease:
+    """Asyncio lease (stream worker); same protocol, heartbeat runs as a task on the loop."""
+
+    def __init__(self, resume_id: str, client, ttl_seconds: float | None = None) -> None:
+        self.client = client
+        self.key = lock_key(resume_id)
+        self.token = uuid.uuid4().hex
+        self.ttl_ms = int((ttl_seconds or settings.resume_lock_ttl_seconds) * 1000)
+        self.held = False
+        self.lost = False
+        self._task: asyncio.Task | None = None
+
+    async def acquire(self) -> bool:
+        try:
+            acquired = bool(await self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except Exception as e:
+            logger.warning("Resume lock unavailable (%s); proceeding without it", e)
+            await _aincr_metric(self.client, "redis_errors")
+            return True
+        if acquired:
+            self.held = True
+            self._task = asyncio.create_task(self._heartbeat())
+        await _aincr_metric(self.client, "acquired" if acquired else "duplicate")
+        return acquired
+
+    async def _heartbeat(self) -> None:
+        interval = self.ttl_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.client.eval(_EXTEND_SCRIPT, 1, self.key, self.token, self.ttl_ms):
+                    self.lost = True
+                    await _aincr_metric(self.client, "lost")
+                    logger.warning("Lease %s lost (expired or taken over)", self.key)
+                    return
+            except Exception as e:
+                logger.warning("Lease heartbeat for %s failed: %s", self.key, e)
+
+    async def release(self) -> None:
+        if self._task:
+            self._task.cancel()
+        if not self.held:
+            return
+        self.held = False
+        try:
+            await self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning("Lease release for %s failed (expires on its own): %s", self.key, e)
+
+
+def _incr_metric(client, field: str) -> None:
+    try:
+        client.hincrby(METRICS_KEY, field, 1)
+    except Exception:
+        pass
+
+
+async def _aincr_metric(client, field: str) -> None:
+    try:
+        await client.hincrby(METRICS_KEY, field, 1)
+    except Exception:
+        pass
@@ -3,12 +3,31 @@ Async SQLAlchemy engine and session. Uses asyncpg for PostgreSQL.
 """
 from collections.abc import AsyncGenerator
 
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
 from app.db.base import Base
 
 settings = get_settings()
+
+
+def vector_search_server_settings() -> dict[str, str]:
+    """Per-connection defaults for ANN queries (asyncpg server_settings)."""
+    if settings.vector_index_type == "ivfflat":
+        server_settings = {"ivfflat.probes": str(settings.ivfflat_probes)}
+        prefix = "ivfflat"
+    else:
+        server_settings = {"hnsw.ef_search": str(settings.hnsw_ef_search)}
+        prefix = "hnsw"
+    if settings.hnsw_iterative_scan not in ("", "off"):
+        # Only kicks in when filters leave fewer than `limit` rows; hnsw supports strict_order and relaxed_order
+        mode = settings.hnsw_iterative_scan if prefix == "hnsw" else "relaxed_order"
+        server_settings[f"{prefix}.iterative_scan"] = mode
+    return server_settings
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
@@ -17,8 +36,15 @@ engine = create_async_engine(
     max_overflow=40,
     pool_timeout=30,
     pool_recycle=3600,
+    connect_args={"server_settings": vector_search_server_settings()},
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record) -> None:
+    """Binary codec for the vector type on each new pooled connection (see app.db.types.Vector)."""
+    dbapi_connection.run_async(register_vector)
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -0,0 +1,53 @@
+"""
+Column types and index definitions shared by the models.
+"""
+from pgvector import Vector as PgVector
+from pgvector.sqlalchemy import VECTOR
+from sqlalchemy import Index
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class Vector(VECTOR):
+    """
+    pgvector column. On asyncpg, pgvector's binary codec is registered on every connection
+    (app.db.session), so values are bound as pgvector.Vector (big-endian float32) and sent in binary
+    format instead of being formatted as '[x,y,...]' text. Other drivers (psycopg2 in Celery workers,
+    Alembic) keep pgvector's text binding. Reads return float32 numpy arrays with either driver.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+        dim = self.dim
+
+        def process(value):
+            if value is None or isinstance(value, PgVector):
+                return value
+            value = PgVector(value)
+            if dim is not None and value.dimensions() != dim:
+                raise ValueError("expected %d dimensions, not %d" % (dim, value.dimensions()))
+            return value
+        return process
+
+
+def embedding_index(table: str) -> Index:
+    """
+    ANN index on `table`.embedding as the vector index migrations build it: type (VECTOR_INDEX_TYPE),
+    build parameters and name (ix_<table>_embedding_hnsw / _ivfflat) from settings.
+    """
+    if settings.vector_index_type == "ivfflat":
+        using, params = "ivfflat", {"lists": settings.ivfflat_lists}
+    else:
+        using, params = "hnsw", {"m": settings.hnsw_m, "ef_construction": settings.hnsw_ef_construction}
+    return Index(
+        f"ix_{table}_embedding_{using}",
+        "embedding",
+        postgresql_using=using,
+        postgresql_with=params,
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
@@ -15,6 +15,7 @@ from slowapi.errors import RateLimitExceeded
 from app.api.v1.router import api_router
 from app.config import get_settings
 from app.core.rate_limit import limiter
+from app.core.redis_client import close_async_client
 from app.db.session import engine, init_db
 
 logging.getLogger("app").setLevel(logging.INFO)
@@ -65,7 +66,7 @@ class CORSDebugMiddleware(BaseHTTPMiddleware):
 async def lifespan(app: FastAPI):
     await init_db()
     yield
-    # shutdown if needed
+    await close_async_client()
 
 
 app = FastAPI(
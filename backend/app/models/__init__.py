@@ -2,7 +2,7 @@
 from app.models.user import User
 from app.models.upload import UploadBatch, Resume
 from app.models.job_description import JobDescription
-from app.models.screening import ScreeningRun, ScreeningResult
+from app.models.screening import JDShortlistEntry, ScreeningRun, ScreeningResult
 
 __all__ = [
     "User",
@@ -11,4 +11,5 @@ __all__ = [
     "JobDescription",
     "ScreeningRun",
     "ScreeningResult",
+    "JDShortlistEntry",
 ]
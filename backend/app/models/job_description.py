@@ -3,23 +3,37 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, String, Text, false, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import Vector, embedding_index
 
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        Index("ix_job_descriptions_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_job_descriptions_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index("ix_job_descriptions_user_id_watching", "user_id", postgresql_where=text("watch_active")),
+        # ANN index for reverse matching (resume -> JDs); created CONCURRENTLY by migration e5b8f3a1c7d2
+        # (type and parameters from settings)
+        embedding_index("job_descriptions"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String(512), nullable=False)
-    raw_text: Mapped[str] = mapped_column(Text, nullable=False)
-    embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(1536), nullable=True)
+    # Deferred: ownership checks and lists never need them (JobDescriptionRepository.get_by_id with_text/with_embedding)
+    raw_text: Mapped[str] = mapped_column(Text, nullable=False, deferred=True)
+    embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(1536), nullable=True, deferred=True)
+    search_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', coalesce(raw_text, ''))", persisted=True), deferred=True,
+    )
 
+    # Watch mode: new resumes are scored against this JD at ingest and kept in its shortlist (jd_shortlist_entries)
+    watch_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     user: Mapped["User"] = relationship("User", back_populates="job_descriptions")
@@ -4,8 +4,8 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -13,11 +13,18 @@ from app.db.base import Base
 
 class ScreeningRun(Base):
     __tablename__ = "screening_runs"
+    __table_args__ = (Index("ix_screening_runs_jd_id_created_at_id", "jd_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     jd_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("job_descriptions.id", ondelete="CASCADE"), nullable=False)
     batch_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("upload_batches.id", ondelete="SET NULL"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Incremental runs: the run they extend, resumes scored since it, and how many of those entered the ranking
+    base_run_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("screening_runs.id", ondelete="SET NULL"), nullable=True)
+    delta_scored: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    delta_added: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # How the ranking was produced (mode, keywords, must_include/must_exclude, min_score); incremental runs reuse it
+    rank_params: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
 
     results: Mapped[list["ScreeningResult"]] = relationship(
         "ScreeningResult", back_populates="run", cascade="all, delete-orphan", order_by="ScreeningResult.rank_position"
@@ -26,11 +33,27 @@ class ScreeningRun(Base):
 
 class ScreeningResult(Base):
     __tablename__ = "screening_results"
+    __table_args__ = (
+        Index("ix_screening_results_run_id_rank_position", "run_id", "rank_position"),
+        Index("ix_screening_results_resume_id", "resume_id"),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Generated by Postgres so bulk inserts send no key column
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     run_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("screening_runs.id", ondelete="CASCADE"), nullable=False)
     resume_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
     similarity_score: Mapped[Decimal] = mapped_column(Numeric(6, 5), nullable=False)  # 0.00000 - 1.00000
     rank_position: Mapped[int] = mapped_column(Integer, nullable=False)
 
     run: Mapped["ScreeningRun"] = relationship("ScreeningRun", back_populates="results")
+
+
+class JDShortlistEntry(Base):
+    """Bounded top-K of a watched JD, maintained at ingest (app.services.ranking.watch)."""
+    __tablename__ = "jd_shortlist_entries"
+    __table_args__ = (Index("ix_jd_shortlist_entries_jd_id_score", "jd_id", "similarity_score"),)
+
+    jd_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("job_descriptions.id", ondelete="CASCADE"), primary_key=True)
+    resume_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    similarity_score: Mapped[Decimal] = mapped_column(Numeric(6, 5), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
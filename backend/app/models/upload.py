@@ -3,16 +3,21 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, ForeignKey, String, Text, Integer, func
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, String, Text, Integer, func, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import Vector, embedding_index
+
+# Resume lifecycle: pending -> extracted -> processed. If embedding is unavailable the extracted text is kept
+# and the resume parks in awaiting_embedding until the drainer embeds it. failed is terminal.
+RESUME_IN_PROGRESS_STATUSES = ("pending", "extracted", "awaiting_embedding")
 
 
 class UploadBatch(Base):
     __tablename__ = "upload_batches"
+    __table_args__ = (Index("ix_upload_batches_user_id_created_at_id", "user_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -26,16 +31,35 @@ class UploadBatch(Base):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index("ix_resumes_status_updated_at", "status", "updated_at"),  # stuck-job sweeper
+        Index("ix_resumes_batch_id_status", "batch_id", "status"),
+        Index(
+            "ix_resumes_batch_id_ranked",
+            "batch_id",
+            postgresql_where=text("status = 'processed' AND embedding IS NOT NULL"),
+        ),
+        Index("ix_resumes_search_tsv", "search_tsv", postgresql_using="gin"),  # hybrid ranking (lexical side)
+        # ANN index for ranking; created CONCURRENTLY by migration c81f5a0d93e4 (type and parameters from settings)
+        embedding_index("resumes"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     batch_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("upload_batches.id", ondelete="CASCADE"), nullable=False)
     filename: Mapped[str] = mapped_column(String(512), nullable=False)
     file_path: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)  # relative path in storage
     file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    extracted_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(1536), nullable=True)  # pgvector; 1536 = text-embedding-3-small
-    status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")  # pending, processed, failed
+    # Heavy columns (up to 50 KB of text, 6 KB of vector) are deferred: entity loads skip them unless a query
+    # undefers them or selects them explicitly
+    extracted_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
+    embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(1536), nullable=True, deferred=True)  # pgvector; 1536 = text-embedding-3-small
+    # Kept in sync by Postgres for every writer (ORM, stream worker SQL); deferred so entity loads skip it
+    search_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', coalesce(extracted_text, ''))", persisted=True), deferred=True,
+    )
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")  # pending, extracted, awaiting_embedding, processed, failed
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     batch: Mapped["UploadBatch"] = relationship("UploadBatch", back_populates="resumes")
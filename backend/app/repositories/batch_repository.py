@@ -1,9 +1,10 @@
 """Upload batch and resume repositories."""
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import total_count
 from app.models.upload import Resume, UploadBatch
 
 
@@ -43,20 +44,33 @@ class BatchRepository:
         return batches, total
 
     @staticmethod
-    async def list_for_user_with_resume_counts(session: AsyncSession, user_id: UUID, page: int = 1, page_size: int = 20):
-        """List batches with resume_count in one query (avoids N+1). Returns (rows, total); each row is (id, batch_name, status, created_at, resume_count)."""
-        count_q = select(func.count()).select_from(UploadBatch).where(UploadBatch.user_id == user_id)
-        total = (await session.execute(count_q)).scalar() or 0
-        offset = (page - 1) * page_size
-        q = (
-            select(UploadBatch.id, UploadBatch.batch_name, UploadBatch.status, UploadBatch.created_at, func.count(Resume.id).label("resume_count"))
-            .outerjoin(Resume, Resume.batch_id == UploadBatch.id)
-            .where(UploadBatch.user_id == user_id)
-            .group_by(UploadBatch.id, UploadBatch.batch_name, UploadBatch.status, UploadBatch.created_at)
-            .order_by(UploadBatch.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-        )
+    async def list_for_user_with_resume_counts(
+        session: AsyncSession,
+        user_id: UUID,
+        page: int = 1,
+        page_size: int = 20,
+        after: tuple | None = None,
+        with_total: bool = True,
+    ):
+        """
+        List batches with resume_count (avoids N+1). Returns (rows, total); each row is (id, batch_name, status,
+        created_at, resume_count). `after` = (created_at, id) of the previous page's last row: keyset page, page is
+        ignored and the total is cached (approximate). total is None when with_total is False.
+        """
+        total = None
+        if with_total:
+            count_q = select(func.count()).select_from(UploadBatch).where(UploadBatch.user_id == user_id)
+            total = await total_count(session, count_q, ("batches", user_id) if after is not None else None)
+        resume_count = select(func.count(Resume.id)).where(Resume.batch_id == UploadBatch.id).scalar_subquery()
+        q = select(
+            UploadBatch.id, UploadBatch.batch_name, UploadBatch.status, UploadBatch.created_at,
+            resume_count.label("resume_count"),
+        ).where(UploadBatch.user_id == user_id)
+        if after is not None:
+            q = q.where(tuple_(UploadBatch.created_at, UploadBatch.id) < tuple_(*after))
+        else:
+            q = q.offset((page - 1) * page_size)
+        q = q.order_by(UploadBatch.created_at.desc(), UploadBatch.id.desc()).limit(page_size)
         result = await session.execute(q)
         rows = result.all()
         return [(r.id, r.batch_name, r.status, r.created_at, r.resume_count) for r in rows], total
@@ -90,11 +104,38 @@ class ResumeRepository:
         await session.refresh(resume)
         return resume
 
+    @staticmethod
+    async def count_by_status(session: AsyncSession, batch_id: UUID) -> dict[str, int]:
+        """Resume counts per status for one batch (single aggregate; no row loading)."""
+        result = await session.execute(
+            select(Resume.status, func.count()).where(Resume.batch_id == batch_id).group_by(Resume.status)
+        )
+        return {status: count for status, count in result.all()}
+
+    @staticmethod
+    async def list_summaries(session: AsyncSession, batch_id: UUID) -> list[tuple[UUID, str, str]]:
+        """(id, filename, status) of every resume in a batch; no text or embedding is read."""
+        result = await session.execute(
+            select(Resume.id, Resume.filename, Resume.status).where(Resume.batch_id == batch_id).order_by(Resume.created_at)
+        )
+        return [(r.id, r.filename, r.status) for r in result.all()]
+
     @staticmethod
     async def get_by_id(session: AsyncSession, resume_id: UUID) -> Resume | None:
         result = await session.execute(select(Resume).where(Resume.id == resume_id))
         return result.scalars().first()
 
+    @staticmethod
+    async def get_embedding_for_user(session: AsyncSession, resume_id: UUID, user_id: UUID) -> tuple[str, object] | None:
+        """(status, embedding) of a resume the user owns, or None; loads neither the text nor the row."""
+        result = await session.execute(
+            select(Resume.status, Resume.embedding)
+            .join(UploadBatch, UploadBatch.id == Resume.batch_id)
+            .where(Resume.id == resume_id, UploadBatch.user_id == user_id)
+        )
+        row = result.first()
+        return (row.status, row.embedding) if row else None
+
     @staticmethod
     async def update_processed(
         session: AsyncSession,
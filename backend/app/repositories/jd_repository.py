@@ -1,10 +1,15 @@
 """Job description repository."""
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
+from app.core.pagination import total_count
 from app.models.job_description import JobDescription
+from app.models.screening import JDShortlistEntry
+from app.models.upload import Resume
 
 
 class JobDescriptionRepository:
@@ -25,10 +30,37 @@ class JobDescriptionRepository:
         return jd
 
     @staticmethod
-    async def get_by_id(session: AsyncSession, jd_id: UUID) -> JobDescription | None:
-        result = await session.execute(select(JobDescription).where(JobDescription.id == jd_id))
+    async def get_by_id(
+        session: AsyncSession,
+        jd_id: UUID,
+        with_text: bool = False,
+        with_embedding: bool = False,
+    ) -> JobDescription | None:
+        """raw_text and embedding are deferred; ask for the ones the caller reads (lazy loads fail on AsyncSession)."""
+        q = select(JobDescription).where(JobDescription.id == jd_id)
+        if with_text:
+            q = q.options(undefer(JobDescription.raw_text))
+        if with_embedding:
+            q = q.options(undefer(JobDescription.embedding))
+        result = await session.execute(q)
         return result.scalars().first()
 
+    @staticmethod
+    async def get_many_for_user(session: AsyncSession, user_id: UUID, jd_ids: list[UUID]) -> list[JobDescription]:
+        """With embeddings loaded (used for ranking)."""
+        result = await session.execute(
+            select(JobDescription)
+            .options(undefer(JobDescription.embedding))
+            .where(JobDescription.id.in_(jd_ids), JobDescription.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def load_text(session: AsyncSession, jd: JobDescription) -> str:
+        """raw_text of a JD loaded without it (e.g. to embed it on first use)."""
+        await session.refresh(jd, ["raw_text"])
+        return jd.raw_text
+
     @staticmethod
     async def update_embedding(session: AsyncSession, jd_id: UUID, embedding: list[float]) -> None:
         jd = await JobDescriptionRepository.get_by_id(session, jd_id)
@@ -42,17 +74,42 @@ class JobDescriptionRepository:
         user_id: UUID,
         page: int = 1,
         page_size: int = 20,
-    ) -> tuple[list[JobDescription], int]:
-        count_q = select(func.count()).select_from(JobDescription).where(JobDescription.user_id == user_id)
-        total = (await session.execute(count_q)).scalar() or 0
-        offset = (page - 1) * page_size
-        q = (
-            select(JobDescription)
-            .where(JobDescription.user_id == user_id)
-            .order_by(JobDescription.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-        )
+        after: tuple | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[JobDescription], int | None]:
+        """Newest first. `after` = (created_at, id) of the previous page's last row (keyset; page ignored)."""
+        total = None
+        if with_total:
+            count_q = select(func.count()).select_from(JobDescription).where(JobDescription.user_id == user_id)
+            total = await total_count(session, count_q, ("jds", user_id) if after is not None else None)
+        q = select(JobDescription).where(JobDescription.user_id == user_id)
+        if after is not None:
+            q = q.where(tuple_(JobDescription.created_at, JobDescription.id) < tuple_(*after))
+        else:
+            q = q.offset((page - 1) * page_size)
+        q = q.order_by(JobDescription.created_at.desc(), JobDescription.id.desc()).limit(page_size)
         result = await session.execute(q)
         items = list(result.scalars().all())
         return items, total
+
+    @staticmethod
+    async def set_watch(session: AsyncSession, jd: JobDescription, active: bool) -> None:
+        """Toggle watch mode; turning it off drops the shortlist so it is rebuilt fresh when re-enabled."""
+        jd.watch_active = active
+        if not active:
+            await session.execute(delete(JDShortlistEntry).where(JDShortlistEntry.jd_id == jd.id))
+        await session.flush()
+
+    @staticmethod
+    async def get_shortlist(session: AsyncSession, jd_id: UUID) -> list[tuple[UUID, str, UUID, float, datetime]]:
+        """(resume_id, filename, batch_id, similarity_score, added_at), best first."""
+        result = await session.execute(
+            select(
+                JDShortlistEntry.resume_id, Resume.filename, Resume.batch_id,
+                JDShortlistEntry.similarity_score, JDShortlistEntry.created_at,
+            )
+            .join(Resume, Resume.id == JDShortlistEntry.resume_id)
+            .where(JDShortlistEntry.jd_id == jd_id)
+            .order_by(JDShortlistEntry.similarity_score.desc(), JDShortlistEntry.created_at)
+        )
+        return [(r[0], r[1], r[2], float(r[3]), r[4]) for r in result.all()]
@@ -1,9 +1,10 @@
 """Screening run and result repositories."""
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import total_count
 from app.models.screening import ScreeningResult, ScreeningRun
 
 
@@ -13,8 +14,15 @@ class ScreeningRepository:
         session: AsyncSession,
         jd_id: UUID,
         batch_id: UUID | None = None,
+        base_run_id: UUID | None = None,
+        delta_scored: int | None = None,
+        delta_added: int | None = None,
+        rank_params: dict | None = None,
     ) -> ScreeningRun:
-        run = ScreeningRun(jd_id=jd_id, batch_id=batch_id)
+        run = ScreeningRun(
+            jd_id=jd_id, batch_id=batch_id, base_run_id=base_run_id, delta_scored=delta_scored, delta_added=delta_added,
+            rank_params=rank_params,
+        )
         session.add(run)
         await session.flush()
         await session.refresh(run)
@@ -26,15 +34,46 @@ class ScreeningRepository:
         run_id: UUID,
         results: list[tuple[UUID, float, int]],
     ) -> None:
-        for resume_id, similarity_score, rank_position in results:
-            sr = ScreeningResult(
-                run_id=run_id,
-                resume_id=resume_id,
-                similarity_score=similarity_score,
-                rank_position=rank_position,
-            )
-            session.add(sr)
-        await session.flush()
+        await ScreeningRepository.add_results_for_runs(session, {run_id: results})
+
+    @staticmethod
+    async def create_runs(
+        session: AsyncSession, jd_ids: list[UUID], batch_id: UUID | None = None, rank_params: dict | None = None,
+    ) -> list[ScreeningRun]:
+        """One run per JD in a single INSERT ... RETURNING, in jd_ids order."""
+        result = await session.scalars(
+            insert(ScreeningRun).returning(ScreeningRun, sort_by_parameter_order=True),
+            [{"jd_id": jd_id, "batch_id": batch_id, "rank_params": rank_params} for jd_id in jd_ids],
+        )
+        return list(result.all())
+
+    @staticmethod
+    async def add_results_for_runs(
+        session: AsyncSession,
+        results_by_run: dict[UUID, list[tuple[UUID, float, int]]],
+    ) -> None:
+        """Results of several runs as one executemany INSERT (no per-row ORM objects)."""
+        rows = [
+            {"run_id": run_id, "resume_id": resume_id, "similarity_score": similarity_score, "rank_position": rank_position}
+            for run_id, results in results_by_run.items()
+            for resume_id, similarity_score, rank_position in results
+        ]
+        if rows:
+            await session.execute(insert(ScreeningResult), rows)
+
+    @staticmethod
+    async def get_ranked_results(session: AsyncSession, run_id: UUID) -> list[tuple[UUID, str, float, int, UUID]]:
+        """A stored run's results as RankingService tuples (resume_id, filename, score, rank_position, batch_id)."""
+        from app.models.upload import Resume
+
+        result = await session.execute(
+            select(ScreeningResult.resume_id, Resume.filename, ScreeningResult.similarity_score,
+                   ScreeningResult.rank_position, Resume.batch_id)
+            .join(Resume, Resume.id == ScreeningResult.resume_id)
+            .where(ScreeningResult.run_id == run_id)
+            .order_by(ScreeningResult.rank_position)
+        )
+        return [(r[0], r[1], float(r[2]), r[3], r[4]) for r in result.all()]
 
     @staticmethod
     async def get_run_by_id(session: AsyncSession, run_id: UUID) -> ScreeningRun | None:
@@ -81,41 +120,81 @@ class ScreeningRepository:
         jd_id: UUID | None = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> tuple[list[tuple[UUID, UUID, UUID | None, object, int]], int]:
-        """List runs with result_count in one query (avoids N+1). Returns list of (id, jd_id, batch_id, created_at, result_count), total."""
+        after: tuple | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[tuple[UUID, UUID, UUID | None, object, int]], int | None]:
+        """
+        List runs with result_count (avoids N+1). Returns list of (id, jd_id, batch_id, created_at, result_count),
+        total. `after` = (created_at, id) of the previous page's last row (keyset; page ignored, total cached).
+        """
         from app.models.job_description import JobDescription
 
-        count_q = (
-            select(func.count(ScreeningRun.id))
-            .select_from(ScreeningRun)
-            .join(JobDescription, JobDescription.id == ScreeningRun.jd_id)
-            .where(JobDescription.user_id == user_id)
-        )
-        if jd_id is not None:
-            count_q = count_q.where(ScreeningRun.jd_id == jd_id)
-        total = (await session.execute(count_q)).scalar() or 0
+        total = None
+        if with_total:
+            count_q = (
+                select(func.count(ScreeningRun.id))
+                .select_from(ScreeningRun)
+                .join(JobDescription, JobDescription.id == ScreeningRun.jd_id)
+                .where(JobDescription.user_id == user_id)
+            )
+            if jd_id is not None:
+                count_q = count_q.where(ScreeningRun.jd_id == jd_id)
+            total = await total_count(session, count_q, ("runs", user_id, jd_id) if after is not None else None)
 
-        offset = (page - 1) * page_size
+        result_count = (
+            select(func.count(ScreeningResult.id)).where(ScreeningResult.run_id == ScreeningRun.id).scalar_subquery()
+        )
         q = (
             select(
                 ScreeningRun.id,
                 ScreeningRun.jd_id,
                 ScreeningRun.batch_id,
                 ScreeningRun.created_at,
-                func.count(ScreeningResult.id).label("result_count"),
+                result_count.label("result_count"),
             )
             .join(JobDescription, JobDescription.id == ScreeningRun.jd_id)
-            .outerjoin(ScreeningResult, ScreeningResult.run_id == ScreeningRun.id)
             .where(JobDescription.user_id == user_id)
         )
         if jd_id is not None:
             q = q.where(ScreeningRun.jd_id == jd_id)
-        q = (
-            q.group_by(ScreeningRun.id, ScreeningRun.jd_id, ScreeningRun.batch_id, ScreeningRun.created_at)
-            .order_by(ScreeningRun.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-        )
+        if after is not None:
+            q = q.where(tuple_(ScreeningRun.created_at, ScreeningRun.id) < tuple_(*after))
+        else:
+            q = q.offset((page - 1) * page_size)
+        q = q.order_by(ScreeningRun.created_at.desc(), ScreeningRun.id.desc()).limit(page_size)
         result = await session.execute(q)
         rows = result.all()
         return [(r.id, r.jd_id, r.batch_id, r.created_at, r.result_count) for r in rows], total
+
+    @staticmethod
+    async def get_results_page(
+        session: AsyncSession,
+        run_id: UUID,
+        page: int = 1,
+        page_size: int = 20,
+        after_rank: int | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[tuple[UUID, str, float, int]], int | None]:
+        """
+        One page of a run's results as (resume_id, filename, similarity_score, rank_position), by rank. With
+        after_rank (keyset) the page starts after that rank_position; a run's results never change, so its
+        total is cached.
+        """
+        from app.models.upload import Resume
+
+        total = None
+        if with_total:
+            count_q = select(func.count()).select_from(ScreeningResult).where(ScreeningResult.run_id == run_id)
+            total = await total_count(session, count_q, ("run_results", run_id) if after_rank is not None else None)
+        q = (
+            select(ScreeningResult.resume_id, Resume.filename, ScreeningResult.similarity_score, ScreeningResult.rank_position)
+            .join(Resume, Resume.id == ScreeningResult.resume_id)
+            .where(ScreeningResult.run_id == run_id)
+        )
+        if after_rank is not None:
+            q = q.where(ScreeningResult.rank_position > after_rank)
+        else:
+            q = q.offset((page - 1) * page_size)
+        q = q.order_by(ScreeningResult.rank_position).limit(page_size)
+        result = await session.execute(q)
+        return [(r[0], r[1], float(r[2]), r[3]) for r in result.all()], total
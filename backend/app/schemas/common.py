@@ -6,7 +6,14 @@ from pydantic import BaseModel, Field
 class PaginationParams(BaseModel):
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: str | None = Field(None, description="next_cursor of the previous page (keyset pagination; page is ignored)")
+    with_total: bool = Field(True, description="Include total/pages (approximate when paginating by cursor)")
 
 
-def get_pagination(page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=100)) -> PaginationParams:
-    return PaginationParams(page=page, page_size=page_size)
+def get_pagination(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, max_length=200),
+    with_total: bool = Query(True),
+) -> PaginationParams:
+    return PaginationParams(page=page, page_size=page_size, cursor=cursor, with_total=with_total)
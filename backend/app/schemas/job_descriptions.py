@@ -14,6 +14,7 @@ class JobDescriptionResponse(BaseModel):
     id: UUID
     title: str
     raw_text: str
+    watch_active: bool = False
     created_at: datetime
 
     class Config:
@@ -31,7 +32,28 @@ class JobDescriptionListItem(BaseModel):
 
 class PaginatedJDs(BaseModel):
     items: list[JobDescriptionListItem]
-    total: int
+    total: int | None  # None with with_total=false; approximate when paginating by cursor
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None  # pass as ?cursor= for the next page; None on the last page
+
+
+class WatchRequest(BaseModel):
+    active: bool
+
+
+class ShortlistItem(BaseModel):
+    resume_id: UUID
+    filename: str
+    batch_id: UUID
+    similarity_score: float
+    added_at: datetime
+    is_new: bool = Field(False, description="Added after the `since` timestamp of the request")
+
+
+class ShortlistResponse(BaseModel):
+    jd_id: UUID
+    watch_active: bool
+    top_k: int
+    items: list[ShortlistItem]
@@ -1,8 +1,20 @@
 """Screening request/response schemas."""
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def _check_limit(limit: int | None) -> int | None:
+    """Rank limits are bounded by settings.rank_max_limit: every ranked row becomes a stored result."""
+    if limit is not None and not 1 <= limit <= settings.rank_max_limit:
+        raise ValueError(f"limit must be between 1 and {settings.rank_max_limit}")
+    return limit
 
 
 class RankRequest(BaseModel):
@@ -10,6 +22,29 @@ class RankRequest(BaseModel):
     batch_id: UUID | None = None
     limit: int = 50
     min_score: float | None = None
+    ef_search: int | None = Field(None, ge=10, le=1000)  # ANN search breadth (recall vs latency); default from settings
+    mode: Literal["vector", "hybrid"] = "vector"  # hybrid: fuse with full-text relevance (reciprocal rank fusion)
+    keywords: str | None = Field(None, max_length=500)  # hybrid full-text query (web search syntax); default: JD terms
+    # Phrases every ranked resume must / must not contain (full-text index); applied before vector distances
+    must_include: list[str] = Field(default_factory=list, max_length=20)
+    must_exclude: list[str] = Field(default_factory=list, max_length=20)
+    refresh: bool = False  # rank again even if an identical earlier request's run is still valid
+
+    _limit = field_validator("limit")(_check_limit)
+
+    @field_validator("must_include", "must_exclude")
+    @classmethod
+    def _clean_terms(cls, terms: list[str]) -> list[str]:
+        cleaned = [t.strip() for t in terms if t and t.strip()]
+        if any(len(t) > 100 for t in cleaned):
+            raise ValueError("terms must be at most 100 characters")
+        return list(dict.fromkeys(cleaned))
+
+
+class RankExplainResponse(BaseModel):
+    """Opt-in ranking diagnostics: your resume counts by eligibility and the query plan."""
+    counts: dict[str, int]
+    plan: list[str]
 
 
 class RankedResumeItem(BaseModel):
@@ -20,11 +55,68 @@ class RankedResumeItem(BaseModel):
     batch_id: UUID
 
 
+class PruningStats(BaseModel):
+    """Candidates left after each stage of a must_include / must_exclude rank."""
+    eligible: int | None = None  # batch-scoped requests only; see /rank/explain otherwise
+    after_must_include: int
+    after_must_exclude: int
+    after_min_score: int
+    returned: int
+
+
 class RankResponse(BaseModel):
     run_id: UUID
     jd_id: UUID
     total_count: int
     results: list[RankedResumeItem]
+    pruning: PruningStats | None = None
+    memoized: bool = False  # true: run_id is an earlier identical request's run (nothing was recomputed)
+
+
+class MultiRankRequest(BaseModel):
+    jd_ids: list[UUID] = Field(..., min_length=1, max_length=20)
+    batch_id: UUID | None = None
+    limit: int = 50
+    min_score: float | None = None
+    include_best_fit: bool = False  # closest of these JDs for every returned resume
+
+    _limit = field_validator("limit")(_check_limit)
+
+
+class BestFitItem(BaseModel):
+    resume_id: UUID
+    jd_id: UUID
+    similarity_score: float
+
+
+class MultiRankResponse(BaseModel):
+    runs: list[RankResponse]  # one run per JD, in request order
+    best_fit: list[BestFitItem] | None = None
+
+
+class JobMatchItem(BaseModel):
+    jd_id: UUID
+    title: str
+    similarity_score: float
+    rank_position: int
+
+
+class ResumeMatchesResponse(BaseModel):
+    resume_id: UUID
+    results: list[JobMatchItem]
+
+
+class IncrementalRankRequest(BaseModel):
+    limit: int | None = None  # default: size of the base run
+    min_score: float | None = None  # applied to the new resumes only, on top of the base run's
+
+    _limit = field_validator("limit")(_check_limit)
+
+
+class IncrementalRankResponse(RankResponse):
+    base_run_id: UUID
+    delta_scored: int  # resumes scored (processed since the base run)
+    delta_added: int  # of those, how many entered the ranking
 
 
 class ScreeningRunListItem(BaseModel):
@@ -40,10 +132,11 @@ class ScreeningRunListItem(BaseModel):
 
 class PaginatedRuns(BaseModel):
     items: list[ScreeningRunListItem]
-    total: int
+    total: int | None  # None with with_total=false; approximate when paginating by cursor
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None  # pass as ?cursor= for the next page; None on the last page
 
 
 class ScreeningResultItem(BaseModel):
@@ -61,8 +154,12 @@ class RunDetailResponse(BaseModel):
     jd_id: UUID
     batch_id: UUID | None
     created_at: datetime
+    base_run_id: UUID | None = None
+    delta_scored: int | None = None
+    delta_added: int | None = None
     results: list[ScreeningResultItem] = Field(default_factory=list)
-    total: int = 0
+    total: int | None = 0
+    next_cursor: str | None = None  # results after this page (by rank_position); None on the last page
 
     class Config:
         from_attributes = True
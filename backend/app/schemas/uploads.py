@@ -7,8 +7,10 @@ from pydantic import BaseModel, Field
 
 class BatchCreateResponse(BaseModel):
     batch_id: UUID
-    status: str = "pending"
+    status: str = "pending"  # processing, deferred (admission limit hit; queued later) or final when inline
     file_count: int
+    estimated_completion_at: datetime | None = None  # From current throughput; None without recent data
+    queued_ahead: int | None = None  # Files already queued (all tenants)
 
 
 class ResumeSummary(BaseModel):
@@ -47,7 +49,34 @@ class BatchListItem(BaseModel):
 
 class PaginatedBatches(BaseModel):
     items: list[BatchListItem]
-    total: int
+    total: int | None  # None with with_total=false; approximate when paginating by cursor
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None  # pass as ?cursor= for the next page; None on the last page
+
+
+class TenantWaitStats(BaseModel):
+    count: int
+    avg_seconds: float | None = None
+    max_seconds: float | None = None
+    last_seconds: float | None = None
+    histogram: dict[str, int] = Field(default_factory=dict)
+
+
+class BacklogStats(BaseModel):
+    """Written by the stuck-job sweeper on each run (all tenants)."""
+    oldest_in_progress_seconds: float
+    pending: int
+    extracted: int
+    awaiting_embedding: int
+    requeued_total: int
+    swept_at: float | None = None
+
+
+class QueueStatsResponse(BaseModel):
+    lane_depths: dict[str, int]
+    tenant_queued: int
+    tenant_wait: TenantWaitStats
+    duplicate_deliveries: int = 0  # Redeliveries skipped by the per-resume lease (all tenants)
+    backlog: BacklogStats | None = None
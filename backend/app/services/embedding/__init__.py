@@ -1,4 +1,16 @@
 """Embedding service (OpenAI)."""
-from app.services.embedding.service import EmbeddingService
+from app.services.embedding.aggregator import (
+    EmbeddingAggregator,
+    get_embedding_aggregator,
+    reset_embedding_aggregator,
+)
+from app.services.embedding.service import EmbeddingService, close_embedding_service, get_embedding_service
 
-__all__ = ["EmbeddingService"]
+__all__ = [
+    "EmbeddingService",
+    "EmbeddingAggregator",
+    "get_embedding_aggregator",
+    "reset_embedding_aggregator",
+    "get_embedding_service",
+    "close_embedding_service",
+]
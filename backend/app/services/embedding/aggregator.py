@@ -0,0 +1,116 @@
+"""
+Per-process embedding aggregator: collects texts from concurrently running tasks (threads/gevent pool)
+and sends them to the provider in one request. Each text waits at most `max_wait_ms` or until
+`max_batch` texts are pending; results (or the error) are delivered back to each waiting caller,
+so the per-resume task contract is unchanged.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from app.config import get_settings
+from app.core.embedding_errors import is_retryable_embedding_error
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Upper bound for a caller waiting on its batch (provider timeout is 30s, plus queueing)
+RESULT_TIMEOUT_SECONDS = 90.0
+
+
+class EmbeddingAggregator:
+    """Micro-batches embed calls. Thread-safe; the flusher thread starts on first use."""
+
+    def __init__(
+        self,
+        embed_batch: Callable[[list[str]], list[list[float]]],
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        self._embed_batch = embed_batch
+        self.max_batch = max(max_batch, 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._ensure_thread()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: float = RESULT_TIMEOUT_SECONDS) -> list[float]:
+        """Blocking: wait for this text's vector (raises the provider error if its batch failed)."""
+        return self.submit(text).result(timeout=timeout)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-aggregator", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(items) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(items)
+
+    def _flush(self, items: list[tuple[str, Future]]) -> None:
+        # Identical texts (e.g. duplicate CVs) are embedded once
+        unique = list(dict.fromkeys(text for text, _ in items))
+        try:
+            vectors = dict(zip(unique, self._embed_batch(unique)))
+        except Exception as e:
+            if len(items) > 1 and not is_retryable_embedding_error(e):
+                # One bad input must not fail its neighbours: retry each item alone
+                logger.warning("Batched embed of %d texts failed (%s); falling back to single calls", len(unique), e)
+                for item in items:
+                    self._flush([item])
+                return
+            for _, future in items:
+                future.set_exception(e)
+            return
+        logger.debug("Embedded %d texts (%d unique) in one request", len(items), len(unique))
+        for text, future in items:
+            future.set_result(vectors[text])
+
+
+_aggregator: EmbeddingAggregator | None = None
+_aggregator_pid: int | None = None
+
+
+def get_embedding_aggregator() -> EmbeddingAggregator:
+    """Process-wide aggregator (re-created after fork: threads do not survive it)."""
+    global _aggregator, _aggregator_pid
+    if _aggregator is None or _aggregator_pid != os.getpid():
+        from app.services.embedding.service import get_embedding_service
+
+        _aggregator = EmbeddingAggregator(
+            get_embedding_service().embed_texts,
+            max_batch=settings.embedding_aggregator_max_batch,
+            max_wait_ms=settings.embedding_aggregator_max_wait_ms,
+        )
+        _aggregator_pid = os.getpid()
+    return _aggregator
+
+
+def reset_embedding_aggregator() -> None:
+    """Drop the process aggregator (after fork / on shutdown); a new one is created on next use."""
+    global _aggregator, _aggregator_pid
+    _aggregator = None
+    _aggregator_pid = None
@@ -5,31 +5,18 @@ Sync client for Celery; async client for FastAPI routes (non-blocking).
 """
 import asyncio
 import logging
+import os
 
 from openai import AsyncOpenAI, OpenAI
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
 
 from app.config import get_settings
 from app.core.circuit_breaker import get_embedding_circuit
-from app.core.embedding_errors import EmbeddingUnavailableError
+from app.core.embedding_errors import EmbeddingUnavailableError, is_retryable_embedding_error
 from app.core.text_normalizer import normalize_text
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Retry on transient/rate-limit errors for sync callers (Celery)
-_retry_policy = retry(
-    retry=retry_if_exception_type((Exception,)),
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=2, max=60),
-    reraise=True,
-)
-
 
 class EmbeddingService:
     """Generate embeddings for text using OpenAI. Use embed_text in sync context (Celery), embed_text_async in async (FastAPI)."""
@@ -43,7 +30,8 @@ class EmbeddingService:
         if self._client is None:
             if not settings.openai_api_key:
                 raise ValueError("OPENAI_API_KEY is not set")
-            self._client = OpenAI(api_key=settings.openai_api_key)
+            # No SDK-level retries: Celery reschedules transient failures with a countdown instead of sleeping
+            self._client = OpenAI(api_key=settings.openai_api_key, max_retries=0)
         return self._client
 
     @property
@@ -64,21 +52,65 @@ class EmbeddingService:
         )
         return response.data[0].embedding
 
-    @_retry_policy
+    def _call_embed_many(self, inputs: list[str]) -> list[list[float]]:
+        """Single sync API call for several inputs; results in input order."""
+        response = self.client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=inputs,
+            dimensions=settings.openai_embedding_dimensions,
+            timeout=30.0,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    def embed_texts(self, texts: list[str | None]) -> list[list[float]]:
+        """
+        Sync: embed several texts in one provider request (same semantics as embed_text per item).
+        Empty texts get zero vectors without being sent. Raises EmbeddingUnavailableError when circuit is open.
+        """
+        dim = settings.openai_embedding_dimensions
+        normalized = [normalize_text(t, max_chars=8000) for t in texts]
+        to_send = [n for n in normalized if n]
+        if not to_send:
+            return [[0.0] * dim for _ in texts]
+        circuit = get_embedding_circuit()
+        if circuit.is_open():
+            raise EmbeddingUnavailableError("Embedding service temporarily unavailable (circuit open)")
+        try:
+            vectors = iter(self._call_embed_many(to_send))
+        except Exception as e:
+            if is_retryable_embedding_error(e):
+                circuit.record_failure()
+            raise
+        circuit.record_success()
+        return [next(vectors) if n else [0.0] * dim for n in normalized]
+
     def embed_text(self, text: str | None) -> list[float]:
         """
         Sync: normalize text and return embedding vector. Use in Celery tasks.
         Returns zero vector if text is empty (caller may skip storing).
+        Single attempt: errors propagate so the task can retry via countdown (see is_retryable_embedding_error).
+        Raises EmbeddingUnavailableError when circuit breaker is open.
         """
         normalized = normalize_text(text, max_chars=8000)
         if not normalized:
             return [0.0] * settings.openai_embedding_dimensions
-        return self._call_embed(normalized)
+        circuit = get_embedding_circuit()
+        if circuit.is_open():
+            raise EmbeddingUnavailableError("Embedding service temporarily unavailable (circuit open)")
+        try:
+            embedding = self._call_embed(normalized)
+        except Exception as e:
+            if is_retryable_embedding_error(e):
+                circuit.record_failure()
+            raise
+        circuit.record_success()
+        return embedding
 
-    async def embed_text_async(self, text: str | None) -> list[float]:
+    async def embed_text_async(self, text: str | None, attempts: int = 5) -> list[float]:
         """
         Async: normalize text and return embedding vector. Use in FastAPI routes to avoid blocking.
-        Returns zero vector if text is empty. Retries with asyncio.sleep (non-blocking).
+        Returns zero vector if text is empty. Retries transient errors up to `attempts` times with
+        asyncio.sleep (non-blocking); non-retryable errors are raised at once.
         Raises EmbeddingUnavailableError when circuit breaker is open.
         """
         normalized = normalize_text(text, max_chars=8000)
@@ -88,7 +120,7 @@ class EmbeddingService:
         if circuit.is_open():
             raise EmbeddingUnavailableError("Embedding service temporarily unavailable (circuit open)")
         last_error = None
-        for attempt in range(5):
+        for attempt in range(attempts):
             try:
                 response = await self.async_client.embeddings.create(
                     model=settings.openai_embedding_model,
@@ -100,8 +132,10 @@ class EmbeddingService:
                 return response.data[0].embedding
             except Exception as e:
                 last_error = e
+                if not is_retryable_embedding_error(e):
+                    raise
                 circuit.record_failure()
-                if attempt < 4:
+                if attempt < attempts - 1:
                     wait = min(2 ** (attempt + 1), 60)
                     logger.warning(
                         "Embedding attempt %s failed: %s; retrying in %ss",
@@ -109,3 +143,28 @@ class EmbeddingService:
                     )
                     await asyncio.sleep(wait)
         raise last_error
+
+
+_service: EmbeddingService | None = None
+_service_pid: int | None = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide EmbeddingService so the HTTP client (and its TLS connections) is reused across tasks."""
+    global _service, _service_pid
+    if _service is None or _service_pid != os.getpid():
+        _service = EmbeddingService()
+        _service_pid = os.getpid()
+    return _service
+
+
+def close_embedding_service() -> None:
+    """Close the process-wide client (worker shutdown). Safe to call when nothing was created."""
+    global _service, _service_pid
+    if _service is not None and _service_pid == os.getpid() and _service._client is not None:
+        try:
+            _service._client.close()
+        except Exception as e:
+            logger.warning("Closing embedding client failed: %s", e)
+    _service = None
+    _service_pid = None
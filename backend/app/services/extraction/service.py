@@ -26,6 +26,19 @@ class ExtractionError(Exception):
 class ExtractionService:
     """Extract raw text from PDF and DOCX files."""
 
+    @staticmethod
+    def warm_up() -> None:
+        """
+        Import the lazily loaded pdfminer/docx modules (font metrics, glyph list, layout analysis, oxml).
+        Call in the Celery parent before fork so children share them copy-on-write instead of each
+        paying the import on its first CV.
+        """
+        import docx.oxml  # noqa: F401
+        import pdfminer.fontmetrics  # noqa: F401
+        import pdfminer.glyphlist  # noqa: F401
+        import pdfminer.layout  # noqa: F401
+        import pdfminer.pdffont  # noqa: F401
+
     @staticmethod
     def extract_from_path(file_path: str | Path) -> str:
         """
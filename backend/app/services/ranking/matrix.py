@@ -0,0 +1,202 @@
+"""
+In-process exact ranking for batch-scoped requests.
+
+A batch's rankable resumes (processed, with embedding) are loaded once into a row-normalised float32
+matrix, saved as .npy under settings.rank_matrix_cache_dir and memory-mapped, so API processes on one host
+share the pages. Files are keyed by the batch revision (eligible count + max(updated_at)): any resume of the
+batch being (re)processed, failed or deleted changes the revision and the next request rebuilds the matrix.
+Scoring is one matrix-vector product and an argpartition top-k, i.e. exact cosine similarity where the
+pgvector path is an approximate index scan.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.upload import Resume
+from app.services.ranking.memo import candidate_revision
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class BatchMatrix:
+    revision: str
+    matrix: np.ndarray  # (n, dim) float32, L2-normalised rows; memory-mapped
+    ids: list[UUID]
+    filenames: list[str]
+
+
+_cache: "OrderedDict[UUID, BatchMatrix]" = OrderedDict()
+
+
+def normalise_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0  # zero vectors score 0 instead of NaN
+    return vectors / norms
+
+
+def top_k(matrix: np.ndarray, query, limit: int, min_score: float | None = None) -> list[tuple[int, float]]:
+    """(row, cosine similarity) of the best `limit` rows, best first. `matrix` rows must be normalised."""
+    q = np.asarray(query, dtype=np.float32)
+    norm = float(np.linalg.norm(q))
+    if norm == 0 or len(matrix) == 0:
+        return []
+    return top_k_scores(matrix @ (q / norm), limit, min_score)
+
+
+def top_k_scores(scores: np.ndarray, limit: int, min_score: float | None = None) -> list[tuple[int, float]]:
+    if limit <= 0 or len(scores) == 0:
+        return []
+    if limit < len(scores):
+        rows = np.argpartition(-scores, limit - 1)[:limit]
+    else:
+        rows = np.arange(len(scores))
+    rows = rows[np.argsort(-scores[rows], kind="stable")]
+    if min_score is not None:
+        rows = rows[scores[rows] >= min_score]
+    return [(int(i), float(scores[i])) for i in rows]
+
+
+def _paths(batch_id: UUID, revision: str) -> tuple[Path, Path]:
+    digest = hashlib.sha1(revision.encode()).hexdigest()[:16]
+    base = Path(settings.rank_matrix_cache_dir) / f"{batch_id}-{digest}"
+    return base.with_suffix(".npy"), base.with_suffix(".json")
+
+
+def _open(batch_id: UUID, revision: str) -> BatchMatrix | None:
+    matrix_path, meta_path = _paths(batch_id, revision)
+    if not (matrix_path.exists() and meta_path.exists()):
+        return None
+    try:
+        matrix = np.load(matrix_path, mmap_mode="r")
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning("Unreadable rank matrix for batch %s, rebuilding: %s", batch_id, e)
+        return None
+    return BatchMatrix(revision, matrix, [UUID(i) for i in meta["ids"]], meta["filenames"])
+
+
+def _write(batch_id: UUID, revision: str, rows: list) -> BatchMatrix:
+    matrix_path, meta_path = _paths(batch_id, revision)
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+    # Only finished files of other revisions; *.tmp may be another process's write in progress
+    for stale in matrix_path.parent.glob(f"{batch_id}-*"):
+        if stale.suffix in (".npy", ".json") and stale not in (matrix_path, meta_path):
+            stale.unlink(missing_ok=True)
+    # Write-then-rename so concurrent builders (other API processes) never map a partial file
+    tmp = matrix_path.with_name(f"{matrix_path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, normalise_rows(np.stack([r.embedding for r in rows])))
+    os.replace(tmp, matrix_path)
+    tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"ids": [str(r.id) for r in rows], "filenames": [r.filename for r in rows]}))
+    os.replace(tmp, meta_path)
+    return _open(batch_id, revision)
+
+
+def _eligible(batch_id: UUID) -> tuple:
+    return Resume.batch_id == batch_id, Resume.status == "processed", Resume.embedding.isnot(None)
+
+
+class MatrixRankingEngine:
+    """Batch-scoped ranking over a cached float32 matrix; same output as RankingService.rank_resumes."""
+
+    @staticmethod
+    async def batch_revision(session: AsyncSession, batch_id: UUID) -> tuple[int, str]:
+        return await candidate_revision(session, batch_id)
+
+    @staticmethod
+    async def load(session: AsyncSession, batch_id: UUID, revision: str) -> BatchMatrix:
+        entry = _cache.get(batch_id)
+        if entry is None or entry.revision != revision:
+            entry = await asyncio.to_thread(_open, batch_id, revision)
+            if entry is None:
+                rows = (await session.execute(
+                    select(Resume.id, Resume.filename, Resume.embedding).where(*_eligible(batch_id)).order_by(Resume.id)
+                )).all()
+                entry = await asyncio.to_thread(_write, batch_id, revision, rows)
+                logger.info("Built rank matrix for batch %s (%d resumes)", batch_id, len(rows))
+            _cache[batch_id] = entry
+            while len(_cache) > max(settings.rank_matrix_cache_batches, 1):
+                _cache.popitem(last=False)
+        _cache.move_to_end(batch_id)
+        return entry
+
+    @staticmethod
+    async def rank(
+        session: AsyncSession,
+        jd_embedding,
+        batch_id: UUID,
+        limit: int,
+        min_score: float | None = None,
+        batch_revision: tuple[int, str] | None = None,
+    ) -> list[tuple[UUID, str, float, int, UUID]] | None:
+        """
+        Ranked tuples, or None when the batch is too large for in-process scoring (use pgvector).
+        batch_revision: (count, revision) already read by the caller (rank memo), to avoid reading it twice.
+        """
+        if settings.rank_matrix_max_candidates <= 0:
+            return None
+        count, revision = batch_revision or await MatrixRankingEngine.batch_revision(session, batch_id)
+        if count > settings.rank_matrix_max_candidates:
+            return None
+        if count == 0:
+            return []
+        entry = await MatrixRankingEngine.load(session, batch_id, revision)
+        return [
+            (entry.ids[row], entry.filenames[row], score, rank_pos, batch_id)
+            for rank_pos, (row, score) in enumerate(top_k(entry.matrix, jd_embedding, limit, min_score), start=1)
+        ]
+
+    @staticmethod
+    async def rank_many(
+        session: AsyncSession,
+        jd_embeddings: dict[UUID, object],
+        batch_id: UUID,
+        limit: int,
+        min_score: float | None = None,
+        best_fit: bool = False,
+    ) -> tuple[dict[UUID, list[tuple[UUID, str, float, int, UUID]]], list[tuple[UUID, UUID, float]]] | None:
+        """
+        Score the batch against every JD in one (candidates x JDs) product. Returns per-JD ranked tuples and,
+        if best_fit, (resume_id, jd_id, similarity) of the closest JD for each returned candidate; None when the
+        batch is too large (use pgvector).
+        """
+        if settings.rank_matrix_max_candidates <= 0:
+            return None
+        count, revision = await MatrixRankingEngine.batch_revision(session, batch_id)
+        if count > settings.rank_matrix_max_candidates:
+            return None
+        if count == 0:
+            return {jd_id: [] for jd_id in jd_embeddings}, []
+        entry = await MatrixRankingEngine.load(session, batch_id, revision)
+        jd_ids = list(jd_embeddings)
+        scores = entry.matrix @ normalise_rows(np.stack([np.asarray(e, dtype=np.float32) for e in jd_embeddings.values()])).T
+        ranked: dict[UUID, list[tuple[UUID, str, float, int, UUID]]] = {}
+        returned: set[int] = set()
+        for col, jd_id in enumerate(jd_ids):
+            hits = top_k_scores(scores[:, col], limit, min_score)
+            returned.update(row for row, _ in hits)
+            ranked[jd_id] = [
+                (entry.ids[row], entry.filenames[row], score, rank_pos, batch_id)
+                for rank_pos, (row, score) in enumerate(hits, start=1)
+            ]
+        best: list[tuple[UUID, UUID, float]] = []
+        if best_fit and returned:
+            rows = sorted(returned)
+            cols = scores[rows].argmax(axis=1)
+            best = [(entry.ids[row], jd_ids[col], float(scores[row, col])) for row, col in zip(rows, cols)]
+        return ranked, best
@@ -0,0 +1,114 @@
+"""
+Memoized rank requests. A batch-scoped rank call is identified by the JD, a digest of its embedding, the
+batch with its revision, and every request parameter that changes the result. Redis maps
+that key to the screening run that answered it, so repeating the request (double clicks, reloads) returns
+the stored run instead of ranking again and inserting a duplicate run.
+
+The revision is the number of rankable resumes in the batch plus their latest updated_at, so a resume that
+finishes processing (or fails, or is deleted) changes the key; stale entries simply expire. The caller
+hands it on to the matrix engine, which keys its cache on the same revision. Requests without a batch are
+not memoized, since their revision would need a count over the whole resumes table. Concurrent
+identical requests are serialised with a short lock so only one of them ranks; only the request that took
+the lock removes it. The revision query is skipped when memoization is disabled. Redis errors fail open.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.redis_client import get_async_client
+from app.models.upload import Resume
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MEMO_PREFIX = "rank:memo:"
+
+
+async def candidate_revision(session: AsyncSession, batch_id: UUID | None) -> tuple[int, str]:
+    """(rankable resume count, revision) of a batch, or of all resumes when batch_id is None."""
+    q = select(func.count(), func.max(Resume.updated_at)).where(
+        Resume.status == "processed", Resume.embedding.isnot(None),
+    )
+    if batch_id is not None:
+        q = q.where(Resume.batch_id == batch_id)
+    count, last = (await session.execute(q)).one()
+    return count, f"{batch_id or '*'}:{count}:{last.isoformat() if last else ''}"
+
+
+def embedding_digest(embedding) -> str:
+    return hashlib.sha1(np.asarray(embedding, dtype=np.float32).tobytes()).hexdigest()[:16]
+
+
+def memo_key(jd_id: UUID, embedding, revision: str, params: dict) -> str:
+    payload = json.dumps(
+        {"jd": str(jd_id), "emb": embedding_digest(embedding), "rev": revision, **params},
+        sort_keys=True, default=str,
+    )
+    return MEMO_PREFIX + hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _client():
+    return get_async_client()
+
+
+def enabled() -> bool:
+    return settings.rank_memo_ttl_seconds > 0
+
+
+async def lookup(key: str, refresh: bool = False) -> tuple[dict | None, bool]:
+    """
+    (stored {"run_id", "pruning"} or None, whether this caller took the key's lock). If an identical request
+    is ranking right now, wait for it; with refresh the stored run is ignored and nobody is waited for.
+    """
+    if not enabled():
+        return None, False
+    client = _client()
+    try:
+        value = None if refresh else await client.get(key)
+        if value is not None:
+            return json.loads(value), False
+        if await client.set(f"{key}:lock", "1", nx=True, ex=settings.rank_memo_lock_seconds):
+            return None, True
+        if not refresh:
+            deadline = time.monotonic() + settings.rank_memo_lock_seconds
+            while value is None and time.monotonic() < deadline and await client.exists(f"{key}:lock"):
+                await asyncio.sleep(0.1)
+                value = await client.get(key)
+        return (json.loads(value) if value else None), False
+    except Exception as e:
+        logger.warning("Rank memo lookup failed, ranking without it: %s", e)
+        return None, False
+
+
+async def store(key: str, run_id: UUID, pruning: dict | None = None, owns_lock: bool = False) -> None:
+    """Remember the run for key; drop the lock only if this request's lookup() took it."""
+    if not enabled():
+        return
+    client = _client()
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.set(key, json.dumps({"run_id": str(run_id), "pruning": pruning}), ex=settings.rank_memo_ttl_seconds)
+        if owns_lock:
+            pipe.delete(f"{key}:lock")
+        await pipe.execute()
+    except Exception as e:
+        logger.warning("Rank memo store failed: %s", e)
+
+
+async def release(key: str) -> None:
+    """Drop the lock this request's lookup() took when ranking failed, so waiters stop waiting."""
+    if not enabled():
+        return
+    client = _client()
+    try:
+        await client.delete(f"{key}:lock")
+    except Exception as e:
+        logger.debug("Rank memo lock release failed: %s", e)
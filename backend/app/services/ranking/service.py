@@ -1,33 +1,86 @@
 """
 Ranking: compute cosine similarity between JD embedding and resume embeddings.
 Uses pgvector <=> (cosine distance); similarity = 1 - distance.
+The query is served by the ANN index on resumes.embedding (migration c81f5a0d93e4). Search defaults
+(hnsw.ef_search, iterative scan) are server settings of every pooled connection (app.db.session), so a
+normal rank request is a single query; a transaction-local set_config is added only when the request
+needs a wider search than the default. Diagnostic counts and the query plan are opt-in (explain_rank).
+Batch-scoped requests for batches of up to settings.rank_matrix_max_candidates rankable resumes are
+scored in-process instead (app.services.ranking.matrix); larger batches and unscoped requests use pgvector.
+The JD embedding is one bound parameter sent in pgvector's binary format (app.db.types.Vector), not a
+'[x,y,...]' text literal parsed by the server.
 """
+import heapq
 import logging
+from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.db.types import Vector
+from app.services.ranking.matrix import MatrixRankingEngine
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+HNSW_MAX_EF_SEARCH = 1000  # pgvector limit
+EMBEDDING_PARAM = bindparam("embedding", type_=Vector())
+# Incremental ranks rescan resumes updated shortly before the base run too: a resume committed after the base
+# run's snapshot can carry an earlier updated_at (now() is transaction start). Rescoring one is harmless.
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
 
 
 class RankingService:
-    """Rank resumes by similarity to a JD embedding."""
+    """Rank resumes by similarity to a JD embedding (optionally fused with full-text relevance)."""
+
+    @staticmethod
+    def _rank_query(embedding, batch_id: UUID | None, limit: int, min_score: float | None) -> tuple[str, dict]:
+        # Filter: status = 'processed', embedding IS NOT NULL; optional batch_id
+        batch_filter = "AND r.batch_id = :batch_id" if batch_id else ""
+        min_score_filter = "AND r.embedding <=> :embedding <= :max_distance" if min_score is not None else ""
+        # MATERIALIZED + outer ORDER BY: relaxed_order iterative scans may return candidates slightly out of order
+        sql = f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT r.id, r.filename, r.embedding <=> :embedding AS distance, r.batch_id
+                FROM resumes r
+                WHERE r.status = 'processed'
+                  AND r.embedding IS NOT NULL
+                  {batch_filter}
+                  {min_score_filter}
+                ORDER BY distance
+                LIMIT :limit
+            )
+            SELECT id, filename, 1 - distance AS similarity, batch_id FROM candidates ORDER BY distance
+        """
+        params: dict = {
+            "embedding": embedding,
+            "limit": limit,
+        }
+        if batch_id:
+            params["batch_id"] = str(batch_id)
+        if min_score is not None:
+            params["max_distance"] = 1 - min_score
+        return sql, params
 
     @staticmethod
     async def rank_resumes(
         session: AsyncSession,
-        jd_embedding: list[float],
+        jd_embedding,
         batch_id: UUID | None = None,
         limit: int = 50,
         min_score: float | None = None,
+        ef_search: int | None = None,
+        batch_revision: tuple[int, str] | None = None,
     ) -> list[tuple[UUID, str, float, int, UUID]]:
         """
         Return list of (resume_id, filename, similarity_score, rank_position, batch_id).
-        Uses cosine distance: 1 - (embedding <=> :jd_vector).
+        Uses cosine distance: 1 - (embedding <=> :jd_vector). ef_search overrides settings.hnsw_ef_search.
+        batch_revision: the batch's (count, revision) if the caller already has it (see MatrixRankingEngine.rank).
         """
-        if not jd_embedding:
+        if jd_embedding is None or len(jd_embedding) == 0:
             logger.warning("Empty JD embedding, returning no results")
             return []
 
@@ -35,62 +88,444 @@ class RankingService:
             "rank_resumes: batch_id=%s limit=%s min_score=%s embedding_dim=%d",
             batch_id, limit, min_score, len(jd_embedding),
         )
+        if batch_id is not None:
+            ranked = await MatrixRankingEngine.rank(session, jd_embedding, batch_id, limit, min_score, batch_revision)
+            if ranked is not None:
+                logger.info("Ranked %d CVs in-process for batch %s", len(ranked), batch_id)
+                return ranked
+        await RankingService.apply_search_settings(session, limit, ef_search=ef_search)
+        sql, params = RankingService._rank_query(jd_embedding, batch_id, limit, min_score)
+        result = await session.execute(text(sql).bindparams(EMBEDDING_PARAM), params)
+        rows = result.fetchall()
+        logger.info("Query returned %d rows", len(rows))
 
-        # Diagnostic: count resumes by criteria to help debug empty results
-        diag_sql = text("""
-            SELECT
-                (SELECT COUNT(*) FROM resumes) AS total,
-                (SELECT COUNT(*) FROM resumes WHERE status = 'processed') AS processed,
-                (SELECT COUNT(*) FROM resumes WHERE embedding IS NOT NULL) AS with_embedding,
-                (SELECT COUNT(*) FROM resumes WHERE status = 'processed' AND embedding IS NOT NULL) AS eligible
-        """)
-        diag_result = await session.execute(diag_sql)
-        diag_row = diag_result.fetchone()
-        logger.info(
-            "Resume counts: total=%d processed=%d with_embedding=%d eligible=%d",
-            diag_row[0], diag_row[1], diag_row[2], diag_row[3],
+        out: list[tuple[UUID, str, float, int, UUID]] = []
+        for rank_pos, (resume_id, filename, similarity, bid) in enumerate(rows, start=1):
+            sim_float = float(similarity) if isinstance(similarity, Decimal) else similarity
+            out.append((resume_id, filename, sim_float, rank_pos, bid))
+            logger.debug("CV #%d: id=%s file=%s score=%.4f", rank_pos, resume_id, filename, sim_float)
+        return out
+
+    @staticmethod
+    def _term_filters(must_include: list[str], must_exclude: list[str]) -> tuple[str | None, str | None, dict]:
+        """tsquery expressions: all must_include phrases (AND), any must_exclude phrase (OR)."""
+        params: dict = {}
+        include = []
+        for i, term in enumerate(must_include):
+            params[f"must_include_{i}"] = term
+            include.append(f"phraseto_tsquery('english', :must_include_{i})")
+        exclude = []
+        for i, term in enumerate(must_exclude):
+            params[f"must_exclude_{i}"] = term
+            exclude.append(f"phraseto_tsquery('english', :must_exclude_{i})")
+        return (
+            "(" + " && ".join(include) + ")" if include else None,
+            "(" + " || ".join(exclude) + ")" if exclude else None,
+            params,
+        )
+
+    @staticmethod
+    async def rank_resumes_filtered(
+        session: AsyncSession,
+        jd_embedding,
+        must_include: list[str],
+        must_exclude: list[str],
+        batch_id: UUID | None = None,
+        limit: int = 50,
+        min_score: float | None = None,
+    ) -> tuple[list[tuple[UUID, str, float, int, UUID]], dict[str, int]]:
+        """
+        rank_resumes with must-have / must-not-have terms. The terms are matched on resumes.search_tsv
+        through its GIN index first, and distances are computed only for the qualifying subset (exact, no
+        ANN). Also returns how many candidates are left after each stage; `eligible` (the batch size before
+        any filter) only for batch-scoped requests, since unscoped it would be a count over every resume.
+        """
+        if jd_embedding is None or len(jd_embedding) == 0:
+            logger.warning("Empty JD embedding, returning no results")
+            return [], {}
+        include, exclude, params = RankingService._term_filters(must_include, must_exclude)
+        batch_filter = "AND r.batch_id = :batch_id" if batch_id else ""
+        include_filter = f"AND r.search_tsv @@ {include}" if include else ""
+        exclude_filter = f"WHERE NOT (search_tsv @@ {exclude})" if exclude else ""
+        score_filter = "distance <= :max_distance" if min_score is not None else "true"
+        eligible = (
+            "(SELECT count(*) FROM resumes r"
+            " WHERE r.status = 'processed' AND r.embedding IS NOT NULL AND r.batch_id = :batch_id)"
+            if batch_id else "CAST(NULL AS bigint)"
         )
+        sql = f"""
+            WITH included AS MATERIALIZED (
+                SELECT r.id, r.filename, r.batch_id, r.embedding, r.search_tsv
+                FROM resumes r
+                WHERE r.status = 'processed'
+                  AND r.embedding IS NOT NULL
+                  {batch_filter}
+                  {include_filter}
+            ),
+            qualifying AS MATERIALIZED (
+                SELECT id, filename, batch_id, embedding <=> :embedding AS distance FROM included {exclude_filter}
+            ),
+            candidates AS (
+                SELECT id, filename, batch_id, distance FROM qualifying WHERE {score_filter} ORDER BY distance LIMIT :limit
+            ),
+            stats AS (
+                SELECT
+                    {eligible} AS eligible,
+                    (SELECT count(*) FROM included) AS after_must_include,
+                    (SELECT count(*) FROM qualifying) AS after_must_exclude,
+                    (SELECT count(*) FROM qualifying WHERE {score_filter}) AS after_min_score
+            )
+            SELECT s.eligible, s.after_must_include, s.after_must_exclude, s.after_min_score,
+                   c.id, c.filename, 1 - c.distance AS similarity, c.batch_id
+            FROM stats s LEFT JOIN candidates c ON true
+            ORDER BY c.distance
+        """
+        params.update({"embedding": jd_embedding, "limit": limit})
         if batch_id:
-            batch_count_sql = text(
-                "SELECT COUNT(*) FROM resumes WHERE batch_id = :bid AND status = 'processed' AND embedding IS NOT NULL"
+            params["batch_id"] = str(batch_id)
+        if min_score is not None:
+            params["max_distance"] = 1 - min_score
+        rows = (await session.execute(text(sql).bindparams(EMBEDDING_PARAM), params)).all()
+        ranked = [
+            (row.id, row.filename, float(row.similarity), rank_pos, row.batch_id)
+            for rank_pos, row in enumerate((row for row in rows if row.id is not None), start=1)
+        ]
+        first = rows[0]
+        stats = {
+            "eligible": first.eligible,
+            "after_must_include": first.after_must_include,
+            "after_must_exclude": first.after_must_exclude,
+            "after_min_score": first.after_min_score,
+            "returned": len(ranked),
+        }
+        logger.info("Filtered rank: %s", stats)
+        return ranked, stats
+
+    @staticmethod
+    def _hybrid_query(
+        jd_id: UUID,
+        embedding,
+        batch_id: UUID | None,
+        limit: int,
+        min_score: float | None,
+        keywords: str | None,
+        must_include: list[str] | None = None,
+        must_exclude: list[str] | None = None,
+    ) -> tuple[str, dict]:
+        batch_filter = "AND r.batch_id = :batch_id" if batch_id else ""
+        min_score_filter = "AND r.embedding <=> :embedding <= :max_distance" if min_score is not None else ""
+        include, exclude, term_params = RankingService._term_filters(must_include or [], must_exclude or [])
+        term_filter = f"AND r.search_tsv @@ {include}" if include else ""
+        if exclude:
+            term_filter += f" AND NOT (r.search_tsv @@ {exclude})"
+        if keywords:
+            tsquery = "websearch_to_tsquery('english', :keywords)"
+        else:
+            # OR of the JD's most frequent lexemes (already normalised, so cast rather than re-parse)
+            tsquery = """(
+                SELECT string_agg(quote_literal(t.lexeme), ' | ')::tsquery
+                FROM (
+                    SELECT u.lexeme FROM job_descriptions j, unnest(j.search_tsv) u
+                    WHERE j.id = :jd_id
+                    ORDER BY coalesce(array_length(u.positions, 1), 0) DESC, u.lexeme
+                    LIMIT :query_terms
+                ) t
+            )"""
+        # Both candidate lists come from indexes (ANN, GIN); fused with weighted reciprocal rank fusion and
+        # normalised to 0..1 (1 = first in both lists) so scores fit screening_results.similarity_score
+        sql = f"""
+            WITH q AS MATERIALIZED (SELECT {tsquery} AS query),
+            vec AS MATERIALIZED (
+                SELECT r.id, r.embedding <=> :embedding AS distance
+                FROM resumes r
+                WHERE r.status = 'processed'
+                  AND r.embedding IS NOT NULL
+                  {batch_filter}
+                  {term_filter}
+                  {min_score_filter}
+                ORDER BY distance
+                LIMIT :depth
+            ),
+            lex AS MATERIALIZED (
+                SELECT r.id, ts_rank_cd(r.search_tsv, q.query) AS score
+                FROM resumes r, q
+                WHERE r.search_tsv @@ q.query
+                  AND r.status = 'processed'
+                  AND r.embedding IS NOT NULL
+                  {batch_filter}
+                  {term_filter}
+                  {min_score_filter}
+                ORDER BY score DESC
+                LIMIT :depth
+            ),
+            ranks AS (
+                SELECT id, CAST(:vector_weight AS float8) AS weight, row_number() OVER (ORDER BY distance) AS rnk FROM vec
+                UNION ALL
+                SELECT id, CAST(:lexical_weight AS float8), row_number() OVER (ORDER BY score DESC) FROM lex
+            ),
+            fused AS (
+                SELECT id, sum(weight / (CAST(:rrf_k AS float8) + rnk)) AS score FROM ranks GROUP BY id
             )
-            batch_result = await session.execute(batch_count_sql, {"bid": str(batch_id)})
-            in_batch = batch_result.scalar() or 0
-            logger.info("Resumes in batch %s (processed+embedding): %d", batch_id, in_batch)
+            SELECT r.id, r.filename, f.score / CAST(:max_score AS float8) AS score, r.batch_id
+            FROM fused f JOIN resumes r ON r.id = f.id
+            ORDER BY f.score DESC, r.id
+            LIMIT :limit
+        """
+        vector_weight, lexical_weight = settings.hybrid_vector_weight, settings.hybrid_lexical_weight
+        params: dict = {
+            "embedding": embedding,
+            "depth": max(settings.hybrid_candidates, limit),
+            "vector_weight": vector_weight,
+            "lexical_weight": lexical_weight,
+            "rrf_k": settings.hybrid_rrf_k,
+            "max_score": (vector_weight + lexical_weight) / (settings.hybrid_rrf_k + 1),
+            "limit": limit,
+            **term_params,
+        }
+        if keywords:
+            params["keywords"] = keywords
+        else:
+            params["jd_id"] = jd_id
+            params["query_terms"] = settings.hybrid_query_terms
+        if batch_id:
+            params["batch_id"] = str(batch_id)
+        if min_score is not None:
+            params["max_distance"] = 1 - min_score
+        return sql, params
 
-        # pgvector: <=> is cosine distance; 1 - distance = similarity
-        # Filter: status = 'processed', embedding IS NOT NULL; optional batch_id
-        embedding_str = "[" + ",".join(str(x) for x in jd_embedding) + "]"
+    @staticmethod
+    async def rank_resumes_hybrid(
+        session: AsyncSession,
+        jd_id: UUID,
+        jd_embedding,
+        batch_id: UUID | None = None,
+        limit: int = 50,
+        min_score: float | None = None,
+        keywords: str | None = None,
+        ef_search: int | None = None,
+        must_include: list[str] | None = None,
+        must_exclude: list[str] | None = None,
+    ) -> list[tuple[UUID, str, float, int, UUID]]:
+        """
+        Hybrid ranking: vector and full-text candidates fused by reciprocal rank. The full-text query is
+        `keywords` (web search syntax) or, if absent, the JD's most frequent terms. Same tuples as
+        rank_resumes; the score is the normalised fused score. min_score still filters on cosine similarity and
+        must_include / must_exclude restrict both candidate lists.
+        """
+        if jd_embedding is None or len(jd_embedding) == 0:
+            logger.warning("Empty JD embedding, returning no results")
+            return []
+        depth = max(settings.hybrid_candidates, limit)
+        await RankingService.apply_search_settings(session, depth, ef_search=ef_search)
+        sql, params = RankingService._hybrid_query(
+            jd_id, jd_embedding, batch_id, limit, min_score, keywords, must_include, must_exclude,
+        )
+        rows = (await session.execute(text(sql).bindparams(EMBEDDING_PARAM), params)).all()
+        logger.info("Hybrid rank returned %d rows (keywords=%s)", len(rows), bool(keywords))
+        return [
+            (resume_id, filename, float(score), rank_pos, bid)
+            for rank_pos, (resume_id, filename, score, bid) in enumerate(rows, start=1)
+        ]
+
+    @staticmethod
+    async def rank_resumes_multi(
+        session: AsyncSession,
+        jd_embeddings: dict[UUID, object],
+        batch_id: UUID | None = None,
+        limit: int = 50,
+        min_score: float | None = None,
+        best_fit: bool = False,
+    ) -> tuple[dict[UUID, list[tuple[UUID, str, float, int, UUID]]], list[tuple[UUID, UUID, float]]]:
+        """
+        Rank one candidate set against several JDs (stored embeddings). Returns per-JD rank_resumes tuples and,
+        if best_fit, (resume_id, jd_id, similarity) of the closest of these JDs for every returned resume.
+        Small batches: one matrix product in-process. Otherwise one statement with an index-ordered LATERAL
+        scan per JD.
+        """
+        if batch_id is not None:
+            multi = await MatrixRankingEngine.rank_many(session, jd_embeddings, batch_id, limit, min_score, best_fit)
+            if multi is not None:
+                return multi
 
         batch_filter = "AND r.batch_id = :batch_id" if batch_id else ""
-        min_score_filter = "AND (1 - (r.embedding <=> CAST(:embedding AS vector))) >= :min_score" if min_score is not None else ""
+        min_score_filter = "AND r.embedding <=> j.embedding <= :max_distance" if min_score is not None else ""
+        params: dict = {"jd_ids": list(jd_embeddings), "limit": limit}
+        if batch_id:
+            params["batch_id"] = str(batch_id)
+        if min_score is not None:
+            params["max_distance"] = 1 - min_score
+        await RankingService.apply_search_settings(session, limit)
+        rows = (await session.execute(text(f"""
+            SELECT j.id AS jd_id, c.id, c.filename, 1 - c.distance AS similarity, c.batch_id
+            FROM job_descriptions j
+            CROSS JOIN LATERAL (
+                SELECT r.id, r.filename, r.embedding <=> j.embedding AS distance, r.batch_id
+                FROM resumes r
+                WHERE r.status = 'processed'
+                  AND r.embedding IS NOT NULL
+                  {batch_filter}
+                  {min_score_filter}
+                ORDER BY distance
+                LIMIT :limit
+            ) c
+            WHERE j.id = ANY(:jd_ids) AND j.embedding IS NOT NULL
+            ORDER BY j.id, c.distance
+        """), params)).all()
 
-        sql = text(f"""
-            SELECT r.id, r.filename, (1 - (r.embedding <=> CAST(:embedding AS vector))) AS similarity, r.batch_id
-            FROM resumes r
-            WHERE r.status = 'processed'
-              AND r.embedding IS NOT NULL
-              {batch_filter}
-              {min_score_filter}
-            ORDER BY r.embedding <=> CAST(:embedding AS vector)
-            LIMIT :limit
-        """)
+        ranked: dict[UUID, list[tuple[UUID, str, float, int, UUID]]] = {jd_id: [] for jd_id in jd_embeddings}
+        for jd_id, resume_id, filename, similarity, bid in rows:
+            out = ranked[jd_id]
+            out.append((resume_id, filename, float(similarity), len(out) + 1, bid))
+        best: list[tuple[UUID, UUID, float]] = []
+        resume_ids = list({r[0] for out in ranked.values() for r in out})
+        if best_fit and resume_ids:
+            best_rows = (await session.execute(text("""
+                SELECT DISTINCT ON (r.id) r.id, j.id, 1 - (r.embedding <=> j.embedding)
+                FROM resumes r
+                JOIN job_descriptions j ON j.id = ANY(:jd_ids)
+                WHERE r.id = ANY(:resume_ids)
+                ORDER BY r.id, r.embedding <=> j.embedding
+            """), {"jd_ids": list(jd_embeddings), "resume_ids": resume_ids})).all()
+            best = [(resume_id, jd_id, float(similarity)) for resume_id, jd_id, similarity in best_rows]
+        return ranked, best
+
+    @staticmethod
+    async def score_new_since(
+        session: AsyncSession,
+        jd_embedding,
+        since: datetime,
+        base_run_id: UUID,
+        batch_id: UUID | None = None,
+        min_score: float | None = None,
+        must_include: list[str] | None = None,
+        must_exclude: list[str] | None = None,
+    ) -> list[tuple[UUID, str, float, UUID]]:
+        """
+        Exact scores of rankable resumes updated since `since` that are not already in the base run,
+        as (resume_id, filename, similarity_score, batch_id). Cost follows the number of new resumes
+        (ix_resumes_status_updated_at), not the size of the batch. Term filters are the base run's.
+        """
+        if jd_embedding is None or len(jd_embedding) == 0:
+            return []
+        include, exclude, term_params = RankingService._term_filters(must_include or [], must_exclude or [])
+        batch_filter = "AND r.batch_id = :batch_id" if batch_id else ""
+        min_score_filter = "AND r.embedding <=> :embedding <= :max_distance" if min_score is not None else ""
+        include_filter = f"AND r.search_tsv @@ {include}" if include else ""
+        exclude_filter = f"AND NOT (r.search_tsv @@ {exclude})" if exclude else ""
         params: dict = {
-            "embedding": embedding_str,
-            "limit": limit,
+            "embedding": jd_embedding, "since": since - INCREMENTAL_OVERLAP, "base_run_id": base_run_id, **term_params,
         }
         if batch_id:
             params["batch_id"] = str(batch_id)
         if min_score is not None:
-            params["min_score"] = min_score
+            params["max_distance"] = 1 - min_score
+        rows = (await session.execute(text(f"""
+            SELECT r.id, r.filename, 1 - (r.embedding <=> :embedding) AS similarity, r.batch_id
+            FROM resumes r
+            WHERE r.status = 'processed'
+              AND r.updated_at > :since
+              AND r.embedding IS NOT NULL
+              {batch_filter}
+              {include_filter}
+              {exclude_filter}
+              {min_score_filter}
+              AND NOT EXISTS (
+                  SELECT 1 FROM screening_results sr WHERE sr.run_id = :base_run_id AND sr.resume_id = r.id
+              )
+        """).bindparams(EMBEDDING_PARAM), params)).all()
+        return [(resume_id, filename, float(similarity), bid) for resume_id, filename, similarity, bid in rows]
 
-        result = await session.execute(sql, params)
-        rows = result.fetchall()
-        logger.info("Query returned %d rows", len(rows))
+    @staticmethod
+    def merge_ranked(
+        base: list[tuple[UUID, str, float, int, UUID]],
+        new: list[tuple[UUID, str, float, UUID]],
+        limit: int,
+    ) -> tuple[list[tuple[UUID, str, float, int, UUID]], int]:
+        """
+        Merge newly scored resumes into a stored ranking (already ordered) and renumber rank_position.
+        Returns the merged top `limit` and how many new resumes made it in.
+        """
+        new_ids = {n[0] for n in new}
+        kept = ((r[0], r[1], r[2], r[4]) for r in base if r[0] not in new_ids)
+        fresh = sorted(new, key=lambda n: -n[2])
+        merged = list(heapq.merge(kept, fresh, key=lambda n: -n[2]))[:limit]
+        ranked = [(rid, fn, score, pos, bid) for pos, (rid, fn, score, bid) in enumerate(merged, start=1)]
+        return ranked, sum(1 for r in ranked if r[0] in new_ids)
 
-        out: list[tuple[UUID, str, float, int, UUID]] = []
-        for rank_pos, (resume_id, filename, similarity, bid) in enumerate(rows, start=1):
-            sim_float = float(similarity) if isinstance(similarity, Decimal) else similarity
-            out.append((resume_id, filename, sim_float, rank_pos, bid))
-            logger.debug("CV #%d: id=%s file=%s score=%.4f", rank_pos, resume_id, filename, sim_float)
-        return out
+    @staticmethod
+    async def match_job_descriptions(
+        session: AsyncSession,
+        user_id: UUID,
+        resume_embedding,
+        limit: int = 10,
+    ) -> list[tuple[UUID, str, float, int]]:
+        """Reverse ranking: the user's JDs closest to a resume, as (jd_id, title, similarity_score, rank_position)."""
+        if resume_embedding is None or len(resume_embedding) == 0:
+            return []
+        await RankingService.apply_search_settings(session, limit)
+        sql = """
+            WITH candidates AS MATERIALIZED (
+                SELECT j.id, j.title, j.embedding <=> :embedding AS distance
+                FROM job_descriptions j
+                WHERE j.user_id = :user_id
+                  AND j.embedding IS NOT NULL
+                ORDER BY distance
+                LIMIT :limit
+            )
+            SELECT id, title, 1 - distance AS similarity FROM candidates ORDER BY distance
+        """
+        rows = (await session.execute(
+            text(sql).bindparams(EMBEDDING_PARAM),
+            {"embedding": resume_embedding, "user_id": user_id, "limit": limit},
+        )).all()
+        return [(jd_id, title, float(similarity), rank_pos) for rank_pos, (jd_id, title, similarity) in enumerate(rows, start=1)]
+
+    @staticmethod
+    async def apply_search_settings(session: AsyncSession, limit: int, ef_search: int | None = None) -> None:
+        """Widen hnsw.ef_search for this transaction only if the request needs more than the session default."""
+        if settings.vector_index_type == "ivfflat":
+            return
+        ef = min(max(ef_search or settings.hnsw_ef_search, limit), HNSW_MAX_EF_SEARCH)
+        if ef == settings.hnsw_ef_search:
+            return
+        await session.execute(text("SELECT set_config('hnsw.ef_search', :ef, true)"), {"ef": str(ef)})
+
+    @staticmethod
+    async def explain_rank(
+        session: AsyncSession,
+        user_id: UUID,
+        jd_embedding,
+        batch_id: UUID | None = None,
+        limit: int = 50,
+        min_score: float | None = None,
+        ef_search: int | None = None,
+    ) -> dict:
+        """
+        Opt-in diagnostics for an empty or slow ranking: the user's resume counts by eligibility and the
+        EXPLAIN (ANALYZE, BUFFERS) plan of the exact query rank_resumes would run.
+        """
+        counts = (await session.execute(
+            text("""
+                SELECT
+                    COUNT(*) AS total,
+                    COUNT(*) FILTER (WHERE r.status = 'processed') AS processed,
+                    COUNT(*) FILTER (WHERE r.embedding IS NOT NULL) AS with_embedding,
+                    COUNT(*) FILTER (WHERE r.status = 'processed' AND r.embedding IS NOT NULL) AS eligible,
+                    COUNT(*) FILTER (
+                        WHERE r.status = 'processed' AND r.embedding IS NOT NULL AND r.batch_id = CAST(:batch_id AS uuid)
+                    ) AS eligible_in_batch
+                FROM resumes r
+                JOIN upload_batches b ON b.id = r.batch_id
+                WHERE b.user_id = :user_id
+            """),
+            {"user_id": user_id, "batch_id": str(batch_id) if batch_id else None},
+        )).mappings().one()
+        plan: list[str] = []
+        if jd_embedding is not None and len(jd_embedding) > 0:
+            await RankingService.apply_search_settings(session, limit, ef_search=ef_search)
+            sql, params = RankingService._rank_query(jd_embedding, batch_id, limit, min_score)
+            plan = list((await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}").bindparams(EMBEDDING_PARAM), params)).scalars().all())
+        return {
+            "counts": {k: int(v) for k, v in counts.items() if k != "eligible_in_batch" or batch_id},
+            "plan": plan,
+        }
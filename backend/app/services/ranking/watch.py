@@ -0,0 +1,150 @@
+"""
+Watch mode: shortlists of active JDs maintained at ingest time.
+
+When a resume reaches `processed`, one statement scores it against every watched JD of its owner (the
+distance is computed in Postgres, nothing is transferred) and upserts it into each JD's shortlist if it
+beats the current K-th entry; a second statement trims those shortlists back to K. Opening a shortlist is
+then an indexed read of jd_shortlist_entries. Entries scoring at least `watch_alert_min_score` are
+published on `jd:<jd_id>:shortlist` so clients can flag strong candidates within seconds of upload.
+
+The statements are written for asyncpg ($n placeholders, stream worker) and converted for SQLAlchemy
+sessions (Celery task, drainer). Failures are logged and never fail ingestion.
+"""
+import json
+import logging
+import re
+import time
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.types import Vector
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# $1 resume_id, $2 K, $3 K - 1
+_SCORE_SQL = """
+    WITH scored AS (
+        SELECT j.id AS jd_id, 1 - (j.embedding <=> r.embedding) AS score
+        FROM resumes r
+        JOIN upload_batches b ON b.id = r.batch_id
+        JOIN job_descriptions j ON j.user_id = b.user_id AND j.watch_active AND j.embedding IS NOT NULL
+        WHERE r.id = CAST($1 AS uuid) AND r.status = 'processed' AND r.embedding IS NOT NULL
+    )
+    INSERT INTO jd_shortlist_entries (jd_id, resume_id, similarity_score)
+    SELECT s.jd_id, CAST($1 AS uuid), s.score
+    FROM scored s
+    WHERE (SELECT count(*) FROM jd_shortlist_entries e WHERE e.jd_id = s.jd_id) < $2
+       OR s.score > (
+           SELECT e.similarity_score FROM jd_shortlist_entries e WHERE e.jd_id = s.jd_id
+           ORDER BY e.similarity_score DESC OFFSET $3 LIMIT 1
+       )
+    ON CONFLICT (jd_id, resume_id) DO UPDATE SET similarity_score = EXCLUDED.similarity_score
+    RETURNING jd_id, similarity_score
+"""
+
+# $1 jd_ids, $2 K
+_TRIM_SQL = """
+    DELETE FROM jd_shortlist_entries e
+    USING (
+        SELECT jd_id, resume_id,
+               row_number() OVER (PARTITION BY jd_id ORDER BY similarity_score DESC, created_at) AS rn
+        FROM jd_shortlist_entries
+        WHERE jd_id = ANY(CAST($1 AS uuid[]))
+    ) ranked
+    WHERE e.jd_id = ranked.jd_id AND e.resume_id = ranked.resume_id AND ranked.rn > $2
+"""
+
+
+def _as_text(sql: str):
+    """asyncpg statement -> SQLAlchemy text() with :p1, :p2, ... parameters."""
+    return text(re.sub(r"\$(\d+)", r":p\1", sql))
+
+
+def _params(*args) -> dict:
+    return {f"p{i}": arg for i, arg in enumerate(args, start=1)}
+
+
+def shortlist_event(jd_id, resume_id, score: float) -> str:
+    return json.dumps({
+        "type": "shortlist", "jd_id": str(jd_id), "resume_id": str(resume_id),
+        "similarity_score": round(score, 5), "ts": time.time(),
+    })
+
+
+def _alerts(resume_id, admitted) -> list[tuple[str, str]]:
+    return [
+        (f"jd:{jd_id}:shortlist", shortlist_event(jd_id, resume_id, float(score)))
+        for jd_id, score in admitted
+        if float(score) >= settings.watch_alert_min_score
+    ]
+
+
+def update_shortlists_sync(session, resume_id) -> int:
+    """Celery path: score a newly processed resume against its owner's watched JDs. Returns JDs updated."""
+    k = max(settings.watch_top_k, 1)
+    try:
+        admitted = session.execute(_as_text(_SCORE_SQL), _params(str(resume_id), k, k - 1)).all()
+        if admitted:
+            session.execute(_as_text(_TRIM_SQL), _params([str(jd_id) for jd_id, _ in admitted], k))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        logger.warning("Shortlist update failed for resume %s: %s", resume_id, e)
+        return 0
+    alerts = _alerts(resume_id, admitted)
+    if alerts:
+        from app.core.redis_client import get_sync_client
+
+        try:
+            pipe = get_sync_client().pipeline(transaction=False)
+            for channel, message in alerts:
+                pipe.publish(channel, message)
+            pipe.execute()
+        except Exception as e:
+            logger.debug("Shortlist alert publish failed: %s", e)
+    return len(admitted)
+
+
+async def update_shortlists_async(pool, redis, resume_id) -> int:
+    """Stream worker path (asyncpg pool, async Redis)."""
+    k = max(settings.watch_top_k, 1)
+    try:
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                admitted = await conn.fetch(_SCORE_SQL, str(resume_id), k, k - 1)
+                if admitted:
+                    await conn.execute(_TRIM_SQL, [str(r["jd_id"]) for r in admitted], k)
+    except Exception as e:
+        logger.warning("Shortlist update failed for resume %s: %s", resume_id, e)
+        return 0
+    for channel, message in _alerts(resume_id, [(r["jd_id"], r["similarity_score"]) for r in admitted]):
+        try:
+            await redis.publish(channel, message)
+        except Exception as e:
+            logger.debug("Shortlist alert publish failed: %s", e)
+    return len(admitted)
+
+
+async def backfill_shortlist(session: AsyncSession, jd_id: UUID, user_id: UUID, embedding) -> int:
+    """Seed a newly watched JD's shortlist with the owner's current top-K resumes (ANN scan)."""
+    result = await session.execute(
+        text("""
+            INSERT INTO jd_shortlist_entries (jd_id, resume_id, similarity_score)
+            SELECT :jd_id, c.id, 1 - c.distance
+            FROM (
+                SELECT r.id, r.embedding <=> :embedding AS distance
+                FROM resumes r
+                JOIN upload_batches b ON b.id = r.batch_id
+                WHERE b.user_id = :user_id AND r.status = 'processed' AND r.embedding IS NOT NULL
+                ORDER BY distance
+                LIMIT :k
+            ) c
+            ON CONFLICT (jd_id, resume_id) DO UPDATE SET similarity_score = EXCLUDED.similarity_score
+        """).bindparams(bindparam("embedding", type_=Vector())),
+        {"jd_id": jd_id, "user_id": user_id, "embedding": embedding, "k": max(settings.watch_top_k, 1)},
+    )
+    return result.rowcount
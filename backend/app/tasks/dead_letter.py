@@ -0,0 +1,99 @@
+"""
+Dead-letter queue for resume tasks that exhausted their retries. Entries live in a Redis list
+(settings.dead_letter_key) so they can be inspected and replayed once the cause is fixed.
+
+    python -m app.tasks.dead_letter list
+    python -m app.tasks.dead_letter replay --limit 50
+"""
+import argparse
+import json
+import logging
+import time
+
+from app.config import get_settings
+from app.core.redis_client import get_sync_client
+from celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def dead_letter_entry(resume_id: str, file_path: str, error: str, retries: int) -> str:
+    return json.dumps({
+        "resume_id": resume_id,
+        "file_path": file_path,
+        "error": error[:2000],
+        "retries": retries,
+        "failed_at": time.time(),
+    })
+
+
+def push_dead_letter(resume_id: str, file_path: str, error: str, retries: int) -> None:
+    """Record a task that gave up after `retries` attempts. Never raises (DLQ must not mask the original error)."""
+    try:
+        get_sync_client().rpush(settings.dead_letter_key, dead_letter_entry(resume_id, file_path, error, retries))
+    except Exception as e:
+        logger.error("Could not push resume %s to dead-letter queue: %s", resume_id, e)
+
+
+def list_dead_letters(limit: int = 100) -> list[dict]:
+    """Return up to `limit` dead-lettered entries, oldest first, without removing them."""
+    raw = get_sync_client().lrange(settings.dead_letter_key, 0, max(limit, 1) - 1)
+    return [json.loads(item) for item in raw]
+
+
+def replay_dead_letters(limit: int = 100) -> int:
+    """Move up to `limit` entries back to pending and re-enqueue them. Returns number replayed."""
+    from sqlalchemy import update
+
+    from app.models.upload import Resume, UploadBatch
+    from app.tasks.process_resume import _get_session, enqueue_resume
+
+    client = get_sync_client()
+    replayed = 0
+    session = _get_session()
+    try:
+        for _ in range(limit):
+            raw = client.lpop(settings.dead_letter_key)
+            if raw is None:
+                break
+            entry = json.loads(raw)
+            resume = session.get(Resume, entry["resume_id"])
+            if resume is None or resume.status == "processed":
+                continue
+            session.execute(
+                update(Resume)
+                .where(Resume.id == resume.id)
+                .values(status="pending", error_message=None)
+            )
+            session.execute(
+                update(UploadBatch).where(UploadBatch.id == resume.batch_id).values(status="processing")
+            )
+            session.commit()
+            enqueue_resume(entry["resume_id"], entry["file_path"])
+            replayed += 1
+    finally:
+        session.close()
+    logger.info("Replayed %d dead-lettered resumes", replayed)
+    return replayed
+
+
+@celery_app.task(name="app.tasks.replay_dead_letters")
+def replay_dead_letters_task(limit: int = 100) -> int:
+    return replay_dead_letters(limit)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or replay the resume dead-letter queue")
+    parser.add_argument("command", choices=["list", "replay"])
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    if args.command == "list":
+        for entry in list_dead_letters(args.limit):
+            print(json.dumps(entry))
+    else:
+        print(f"Replayed {replay_dead_letters(args.limit)} resumes")
+
+
+if __name__ == "__main__":
+    main()
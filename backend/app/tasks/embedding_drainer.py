@@ -0,0 +1,97 @@
+"""
+Periodic task: embed resumes parked in awaiting_embedding (provider outage) in large batches.
+Scheduled by Celery beat (see celery_app.beat_schedule); skips the run while the circuit is open.
+Rows are claimed with FOR UPDATE SKIP LOCKED so several workers can drain concurrently.
+"""
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from app.config import get_settings
+from app.core.batch_events import publish_resume_event
+from app.core.circuit_breaker import get_embedding_circuit
+from app.core.embedding_errors import is_retryable_embedding_error
+from app.models.upload import Resume
+from app.services.embedding import get_embedding_service
+from app.services.ranking.watch import update_shortlists_sync
+from app.tasks.process_resume import ResumeRepository_sync, _get_session, _maybe_complete_batch
+from celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def _embed_claimed(rows: list[Resume]) -> dict:
+    """Embed claimed rows; returns {resume_id: vector or Exception}. Retryable errors propagate."""
+    service = get_embedding_service()
+    try:
+        vectors = service.embed_texts([r.extracted_text for r in rows])
+        return {r.id: v for r, v in zip(rows, vectors)}
+    except Exception as e:
+        if is_retryable_embedding_error(e) or len(rows) == 1:
+            raise
+        # A bad input fails the whole request: isolate it
+        results: dict = {}
+        for r in rows:
+            try:
+                results[r.id] = service.embed_texts([r.extracted_text])[0]
+            except Exception as item_error:
+                if is_retryable_embedding_error(item_error):
+                    raise
+                results[r.id] = item_error
+        return results
+
+
+def drain_awaiting_embeddings(max_batches: int | None = None) -> int:
+    """Embed up to max_batches x embedding_drain_batch_size parked resumes. Returns number processed."""
+    if get_embedding_circuit().is_open():
+        logger.info("Embedding circuit open; drain skipped")
+        return 0
+    processed = 0
+    session = _get_session()
+    try:
+        for _ in range(max_batches or settings.embedding_drain_max_batches):
+            rows = list(
+                session.execute(
+                    select(Resume)
+                    .options(undefer(Resume.extracted_text))
+                    .where(Resume.status == "awaiting_embedding", Resume.extracted_text.is_not(None))
+                    .order_by(Resume.created_at)
+                    .limit(settings.embedding_drain_batch_size)
+                    .with_for_update(skip_locked=True)
+                ).scalars().all()
+            )
+            if not rows:
+                break
+            try:
+                results = _embed_claimed(rows)
+            except Exception as e:
+                session.rollback()
+                logger.warning("Embedding drain stopped (provider still failing): %s", e)
+                break
+            for r in rows:
+                result = results[r.id]
+                if isinstance(result, Exception):
+                    ResumeRepository_sync.update_failed(session, r.id, str(result))
+                else:
+                    ResumeRepository_sync.update_processed(session, r.id, r.extracted_text, result)
+                    processed += 1
+            session.commit()
+            for r in rows:
+                publish_resume_event(r.batch_id, r.id, r.status, "awaiting_embedding")
+            for r in rows:
+                if not isinstance(results[r.id], Exception):
+                    update_shortlists_sync(session, r.id)
+            for batch_id in {r.batch_id for r in rows}:
+                _maybe_complete_batch(session, batch_id)
+    finally:
+        session.close()
+    if processed:
+        logger.info("Drained %d resumes awaiting embedding", processed)
+    return processed
+
+
+@celery_app.task(name="app.tasks.drain_awaiting_embeddings")
+def drain_awaiting_embeddings_task(max_batches: int | None = None) -> int:
+    return drain_awaiting_embeddings(max_batches)
@@ -1,19 +1,31 @@
 """
 Celery task: extract text from CV file, normalize, embed, store. Updates batch status when all done.
+Two phases: the extracted text is committed first (status extracted), then embedded (processed). When the
+embedding provider is down the resume parks in awaiting_embedding and app.tasks.embedding_drainer embeds it
+later, so extraction keeps running and no text is lost.
 Uses sync SQLAlchemy for Celery worker.
 """
 import logging
+import random
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.models.upload import Resume, UploadBatch
+from app.models.upload import RESUME_IN_PROGRESS_STATUSES, Resume, UploadBatch
 from app.services.extraction import ExtractionService
-from app.services.embedding import EmbeddingService
+from app.services.embedding import get_embedding_aggregator, get_embedding_service
+from app.core.batch_events import publish_batch_event, publish_resume_event
+from app.core.circuit_breaker import get_embedding_circuit
+from app.core.embedding_errors import is_retryable_embedding_error, retry_after_seconds
+from app.core.ingest_queue import INGEST_BULK_QUEUE, record_task_finished, record_task_started
+from app.core.resume_lock import ResumeLease
 from app.core.text_normalizer import normalize_text
+from app.services.ranking.watch import update_shortlists_sync
+from app.tasks.dead_letter import push_dead_letter
+from app.tasks.worker_resources import get_session
 
 # Celery app instance (used as decorator target)
 from celery_app import celery_app
@@ -21,26 +33,63 @@ from celery_app import celery_app
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Sync engine for Celery worker (pool tuned for multiple workers)
-_sync_url = settings.database_url_sync or settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
-_engine = create_engine(
-    _sync_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    pool_timeout=30,
-    pool_recycle=3600,
-)
-_Session = sessionmaker(_engine, expire_on_commit=False, autocommit=False, autoflush=False)
-
 
 def _get_session() -> Session:
-    return _Session()
+    # Engine is created per worker process after fork (see app.tasks.worker_resources)
+    return get_session()
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Transient failures are rescheduled; everything else (bad file, auth, bad request) fails fast."""
+    # TimeoutError: gave up waiting on an aggregated embedding batch
+    return is_retryable_embedding_error(exc) or isinstance(exc, (OperationalError, TimeoutError))
+
 
+def _retry_countdown(retries: int, exc: BaseException | None = None) -> float:
+    """Exponential backoff with jitter (half to full window); a provider Retry-After hint wins if longer."""
+    window = min(
+        settings.task_retry_backoff_max_seconds,
+        settings.task_retry_backoff_base_seconds * (2 ** retries),
+    )
+    countdown = random.uniform(window / 2, window)
+    hint = retry_after_seconds(exc) if exc is not None else None
+    if hint is not None:
+        countdown = max(countdown, min(hint, settings.task_retry_backoff_max_seconds))
+    return countdown
+
+
+@celery_app.task(bind=True, name="app.tasks.process_resume", max_retries=settings.task_max_retries)
+def process_resume_task(
+    self,
+    resume_id: str,
+    file_path: str,
+    tenant_id: str | None = None,
+    enqueued_at: float | None = None,
+) -> None:
+    """
+    Process a single resume: extract text, embed, update DB. Idempotent: skips if already processed;
+    a resume whose text was already extracted is not extracted again.
+    Transient failures reschedule the task (self.retry with countdown) instead of sleeping in the worker.
+    When retries run out (or the circuit is open) after the text was saved, the resume parks in
+    awaiting_embedding for the drainer; otherwise it is marked failed and recorded in the dead-letter queue.
+    Non-retryable failures mark the resume failed immediately.
+    Only the holder of the resume's lease does the work; a duplicate delivery returns at once.
+    tenant_id/enqueued_at (set by the upload endpoint) feed per-tenant queue depth and wait-time metrics.
+    """
+    lease = ResumeLease(resume_id)
+    if not lease.acquire():
+        logger.info("Resume %s is being processed by another attempt, skipping duplicate delivery", resume_id)
+        return
+    try:
+        _process_resume(self, resume_id, file_path, tenant_id, enqueued_at)
+        record_task_finished()  # not reached when the task was rescheduled (Retry raised)
+    finally:
+        lease.release()
 
-@celery_app.task(bind=True, name="app.tasks.process_resume")
-def process_resume_task(self, resume_id: str, file_path: str) -> None:
-    """Process a single resume: extract text, embed, update DB. On failure mark resume failed. Idempotent: skips if already processed."""
+
+def _process_resume(task, resume_id: str, file_path: str, tenant_id: str | None, enqueued_at: float | None) -> None:
+    if task.request.retries == 0:
+        record_task_started(tenant_id, enqueued_at)
     rid = UUID(resume_id)
     session = _get_session()
     try:
@@ -51,38 +100,114 @@ def process_resume_task(self, resume_id: str, file_path: str) -> None:
         if resume.status == "processed":
             logger.info("Resume %s already processed, skipping (idempotent)", resume_id)
             return
+        previous = resume.status
         try:
-            raw_text = ExtractionService.extract_from_path(file_path)
-            normalized = normalize_text(raw_text)
-            if not normalized:
-                ResumeRepository_sync.update_failed(session, rid, "Empty or unreadable text")
+            if resume.status in ("extracted", "awaiting_embedding") and resume.extracted_text:
+                normalized = resume.extracted_text  # phase 1 done by an earlier attempt
+            else:
+                raw_text = ExtractionService.extract_from_path(file_path)
+                normalized = normalize_text(raw_text)
+                if not normalized:
+                    ResumeRepository_sync.update_failed(session, rid, "Empty or unreadable text")
+                    session.commit()
+                    _publish_status(resume, previous)
+                    return
+                # Phase 1: persist the text so it survives embedding outages
+                ResumeRepository_sync.update_extracted(session, rid, normalized[:50000])
+                session.commit()
+                previous = _publish_status(resume, previous)
+            if get_embedding_circuit().is_open():
+                # Provider down: park without burning retries (or the worker slot); the drainer embeds later
+                ResumeRepository_sync.update_awaiting_embedding(session, rid, "Embedding deferred: circuit open")
                 session.commit()
-                _maybe_complete_batch(session, resume.batch_id)
+                _publish_status(resume, previous)
                 return
-            embedding_svc = EmbeddingService()
-            embedding = embedding_svc.embed_text(normalized)
+            if settings.embedding_aggregator_enabled:
+                # Shares one provider request with other tasks running concurrently in this process
+                embedding = get_embedding_aggregator().embed(normalized)
+            else:
+                embedding = get_embedding_service().embed_text(normalized)
             ResumeRepository_sync.update_processed(session, rid, normalized[:50000], embedding)
             session.commit()
+            _publish_status(resume, previous)
+            update_shortlists_sync(session, rid)
         except Exception as e:
+            session.rollback()
+            error_message = str(e)
+            transient = _is_transient(e)
+            # Inline (called directly) runs cannot be rescheduled; treat as final
+            if transient and not task.request.called_directly and task.request.retries < task.max_retries:
+                countdown = _retry_countdown(task.request.retries, e)
+                logger.warning(
+                    "Transient failure for resume %s (attempt %s/%s): %s; retrying in %.1fs",
+                    resume_id, task.request.retries + 1, task.max_retries + 1, e, countdown,
+                )
+                raise task.retry(exc=e, countdown=countdown)
+            session.refresh(resume)
+            previous = resume.status
+            if is_retryable_embedding_error(e) and resume.status in ("extracted", "awaiting_embedding"):
+                logger.warning("Embedding unavailable for resume %s: %s; parked for the drainer", resume_id, e)
+                ResumeRepository_sync.update_awaiting_embedding(session, rid, f"Embedding deferred: {e}")
+                session.commit()
+                _publish_status(resume, previous)
+                return
+            if transient and not task.request.called_directly:
+                push_dead_letter(resume_id, file_path, error_message, task.request.retries)
+                error_message = f"Retries exhausted: {e}"
             logger.exception("Process failed for resume %s: %s", resume_id, e)
-            ResumeRepository_sync.update_failed(session, rid, str(e))
+            ResumeRepository_sync.update_failed(session, rid, error_message)
             session.commit()
+            _publish_status(resume, previous)
         finally:
             _maybe_complete_batch(session, resume.batch_id)
     finally:
         session.close()
 
 
+def _publish_status(resume: Resume, previous: str | None) -> str:
+    """Publish the committed status change to the batch progress channel; returns the new status."""
+    if resume.status != previous:
+        publish_resume_event(resume.batch_id, resume.id, resume.status, previous)
+    return resume.status
+
+
+def enqueue_resume(
+    resume_id: str,
+    file_path: str,
+    priority: int = 0,
+    queue: str = INGEST_BULK_QUEUE,
+    tenant_id: str | None = None,
+    enqueued_at: float | None = None,
+) -> None:
+    """Enqueue a resume outside the upload path (dead-letter replay, sweeper) on the active backend."""
+    if settings.ingest_backend == "streams":
+        from app.tasks.stream_worker import publish_resume_job_sync
+
+        publish_resume_job_sync(resume_id, file_path, tenant_id, enqueued_at)
+    else:
+        process_resume_task.apply_async(
+            args=[resume_id, file_path],
+            kwargs={"tenant_id": tenant_id, "enqueued_at": enqueued_at} if tenant_id else {},
+            queue=queue,
+            priority=priority,
+        )
+
+
 def _maybe_complete_batch(session: Session, batch_id: UUID) -> None:
     """If all resumes in batch are processed or failed, set batch status to completed or failed."""
     from sqlalchemy import func
-    pending = session.execute(select(func.count()).select_from(Resume).where(Resume.batch_id == batch_id, Resume.status == "pending")).scalar() or 0
+    pending = session.execute(select(func.count()).select_from(Resume).where(Resume.batch_id == batch_id, Resume.status.in_(RESUME_IN_PROGRESS_STATUSES))).scalar() or 0
     if pending == 0:
         batch = session.execute(select(UploadBatch).where(UploadBatch.id == batch_id)).scalars().first()
         if batch:
             failed = session.execute(select(func.count()).select_from(Resume).where(Resume.batch_id == batch_id, Resume.status == "failed")).scalar() or 0
+            previous = batch.status
             batch.status = "failed" if failed else "completed"
             session.flush()
+            session.commit()
+            if batch.status != previous:
+                publish_batch_event(batch_id, batch.status)
+            return
     session.commit()
 
 
@@ -96,6 +221,21 @@ class ResumeRepository_sync:
             resume.status = "processed"
             resume.error_message = None
 
+    @staticmethod
+    def update_extracted(session: Session, resume_id: UUID, extracted_text: str) -> None:
+        resume = session.execute(select(Resume).where(Resume.id == resume_id)).scalars().first()
+        if resume:
+            resume.extracted_text = extracted_text
+            resume.status = "extracted"
+            resume.error_message = None
+
+    @staticmethod
+    def update_awaiting_embedding(session: Session, resume_id: UUID, reason: str) -> None:
+        resume = session.execute(select(Resume).where(Resume.id == resume_id)).scalars().first()
+        if resume:
+            resume.status = "awaiting_embedding"
+            resume.error_message = reason
+
     @staticmethod
     def update_failed(session: Session, resume_id: UUID, error_message: str) -> None:
         resume = session.execute(select(Resume).where(Resume.id == resume_id)).scalars().first()
@@ -0,0 +1,326 @@
+"""
+Optional asyncio ingestion worker consuming resume jobs from a Redis Stream consumer group.
+
+    INGEST_BACKEND=streams  (upload endpoint publishes to the stream instead of Celery)
+    python -m app.tasks.stream_worker --consumer worker-1
+
+One process keeps up to `stream_worker_max_in_flight` resumes in progress: extraction runs in a
+process pool, embedding on the async OpenAI client, writes on an asyncpg pool. Backpressure: the
+worker only reads as many entries as it has free slots. Entries are acked after the resume reaches a
+final state; transient failures stay pending and are reclaimed (XAUTOCLAIM) once idle for
+`stream_worker_reclaim_idle_ms`, which is also how entries of a crashed consumer are picked up.
+After `task_max_retries` deliveries the resume is marked failed and dead-lettered.
+
+A per-resume Redis lease (app.core.resume_lock) makes a reclaimed entry that another consumer is still
+processing exit without doing the work. Idempotency and the two-phase flow match process_resume_task: processed resumes are skipped, text is
+persisted (status extracted) before embedding, a retryable embedding failure after the text is saved
+parks the resume in awaiting_embedding for the drainer, and the batch is completed only when no
+resume is still in progress.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from uuid import UUID
+
+from app.config import get_settings
+from app.core.batch_events import batch_event, publish_async, resume_event
+from app.core.circuit_breaker import get_embedding_circuit
+from app.core.embedding_errors import is_retryable_embedding_error
+from app.core.ingest_queue import record_task_finished, record_task_started
+from app.core.resume_lock import AsyncResumeLease
+from app.core.text_normalizer import normalize_text
+from app.services.embedding import EmbeddingService
+from app.services.extraction import ExtractionService
+from app.services.ranking.watch import update_shortlists_async
+from app.tasks.dead_letter import dead_letter_entry
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_MARK_PROCESSED_SQL = """
+    UPDATE resumes SET extracted_text = $2, embedding = $3, status = 'processed', error_message = NULL, updated_at = now()
+    WHERE id = $1 AND status <> 'processed'
+"""
+_MARK_EXTRACTED_SQL = """
+    UPDATE resumes SET extracted_text = $2, status = 'extracted', error_message = NULL, updated_at = now()
+    WHERE id = $1 AND status <> 'processed'
+"""
+_MARK_AWAITING_EMBEDDING_SQL = """
+    UPDATE resumes SET status = 'awaiting_embedding', error_message = $2, updated_at = now()
+    WHERE id = $1 AND status <> 'processed'
+"""
+_MARK_FAILED_SQL = """
+    UPDATE resumes SET status = 'failed', error_message = $2, updated_at = now()
+    WHERE id = $1 AND status <> 'processed'
+"""
+_COMPLETE_BATCH_SQL = """
+    UPDATE upload_batches b
+    SET status = CASE WHEN EXISTS (SELECT 1 FROM resumes WHERE batch_id = b.id AND status = 'failed')
+                      THEN 'failed' ELSE 'completed' END
+    WHERE b.id = $1
+      AND NOT EXISTS (
+          SELECT 1 FROM resumes
+          WHERE batch_id = b.id AND status IN ('pending', 'extracted', 'awaiting_embedding')
+      )
+    RETURNING b.status
+"""
+
+
+def _job_fields(resume_id: str, file_path: str, tenant_id: str | None, enqueued_at: float | None) -> dict:
+    fields = {"resume_id": resume_id, "file_path": file_path}
+    if tenant_id:
+        fields["tenant_id"] = tenant_id
+        fields["enqueued_at"] = str(enqueued_at or time.time())
+    return fields
+
+
+async def publish_resume_jobs(jobs: list[tuple[str, str]], tenant_id: str | None = None, enqueued_at: float | None = None) -> None:
+    """Producer (API): add (resume_id, file_path) jobs to the ingest stream in one round trip."""
+    from redis.asyncio import Redis
+
+    client = Redis.from_url(settings.redis_url, decode_responses=True)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for resume_id, file_path in jobs:
+            pipe.xadd(settings.ingest_stream_key, _job_fields(resume_id, file_path, tenant_id, enqueued_at))
+        await pipe.execute()
+    finally:
+        await client.aclose()
+
+
+def publish_resume_job_sync(
+    resume_id: str, file_path: str, tenant_id: str | None = None, enqueued_at: float | None = None
+) -> None:
+    """Producer for sync callers (dead-letter replay, sweeper)."""
+    from app.core.redis_client import get_sync_client
+
+    get_sync_client().xadd(settings.ingest_stream_key, _job_fields(resume_id, file_path, tenant_id, enqueued_at))
+
+
+class _TransientError(Exception):
+    """Leave the entry pending so it is redelivered after the reclaim idle time."""
+
+
+class StreamIngestWorker:
+    def __init__(self, consumer: str, max_in_flight: int | None = None) -> None:
+        self.consumer = consumer
+        self.max_in_flight = max_in_flight or settings.stream_worker_max_in_flight
+        self._stopping = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._active_ids: set[str] = set()
+        self._embedding = EmbeddingService()
+        self.redis = None
+        self.pool = None
+        self.executor: ProcessPoolExecutor | None = None
+
+    async def start(self) -> None:
+        import asyncpg
+        from pgvector.asyncpg import register_vector
+        from redis.asyncio import Redis
+        from redis.exceptions import ResponseError
+
+        self.redis = Redis.from_url(settings.redis_url, decode_responses=True)
+        try:
+            await self.redis.xgroup_create(settings.ingest_stream_key, settings.ingest_stream_group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self.pool = await asyncpg.create_pool(
+            dsn, min_size=1, max_size=settings.stream_worker_db_pool_size, init=register_vector,
+        )
+        self.executor = ProcessPoolExecutor(max_workers=settings.stream_worker_extract_processes or os.cpu_count())
+
+    async def close(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.executor:
+            self.executor.shutdown(wait=True)
+        if self.pool:
+            await self.pool.close()
+        if self.redis:
+            await self.redis.aclose()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        await self.start()
+        reclaimer = asyncio.create_task(self._reclaim_loop())
+        logger.info("Stream worker %s consuming %s (max in flight %d)", self.consumer, settings.ingest_stream_key, self.max_in_flight)
+        try:
+            while not self._stopping.is_set():
+                free = self._free_slots()
+                if free <= 0:
+                    # Backpressure: stop reading until an in-flight resume finishes
+                    await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                response = await self.redis.xreadgroup(
+                    settings.ingest_stream_group, self.consumer,
+                    {settings.ingest_stream_key: ">"}, count=min(free, 50), block=2000,
+                )
+                for _, messages in response or []:
+                    for entry_id, fields in messages:
+                        self._spawn(entry_id, fields, deliveries=1)
+        finally:
+            reclaimer.cancel()
+            await self.close()
+
+    def _free_slots(self) -> int:
+        return self.max_in_flight - len(self._tasks)
+
+    def _spawn(self, entry_id: str, fields: dict, deliveries: int) -> None:
+        if entry_id in self._active_ids:
+            return  # still being processed here (slower than the reclaim idle time)
+        self._active_ids.add(entry_id)
+        task = asyncio.create_task(self._handle(entry_id, fields, deliveries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reclaim_loop(self) -> None:
+        """Claim entries idle longer than the reclaim time (crashed consumers, transient failures)."""
+        interval = max(settings.stream_worker_reclaim_idle_ms / 2000, 1.0)
+        while not self._stopping.is_set():
+            await asyncio.sleep(interval)
+            try:
+                start = "0-0"
+                while self._free_slots() > 0:
+                    start, claimed, _ = await self.redis.xautoclaim(
+                        settings.ingest_stream_key, settings.ingest_stream_group, self.consumer,
+                        min_idle_time=settings.stream_worker_reclaim_idle_ms, start_id=start,
+                        count=min(self._free_slots(), 50),
+                    )
+                    for entry_id, fields in claimed:
+                        if fields is None:
+                            continue  # entry trimmed from the stream
+                        pending = await self.redis.xpending_range(
+                            settings.ingest_stream_key, settings.ingest_stream_group, entry_id, entry_id, 1,
+                        )
+                        deliveries = pending[0]["times_delivered"] if pending else 1
+                        self._spawn(entry_id, fields, deliveries)
+                    if start == "0-0":
+                        break
+            except Exception as e:
+                logger.warning("Stream reclaim failed: %s", e)
+
+    async def _handle(self, entry_id: str, fields: dict, deliveries: int) -> None:
+        resume_id, file_path = fields["resume_id"], fields["file_path"]
+        lease = AsyncResumeLease(resume_id, self.redis)
+        if not await lease.acquire():
+            # Another consumer is still on it (claimed after idle time); its XACK covers this entry
+            logger.info("Resume %s is being processed by another consumer, skipping duplicate", resume_id)
+            self._active_ids.discard(entry_id)
+            return
+        try:
+            if deliveries == 1:
+                enqueued_at = float(fields["enqueued_at"]) if "enqueued_at" in fields else None
+                await asyncio.to_thread(record_task_started, fields.get("tenant_id"), enqueued_at)
+            await self.process(resume_id, file_path, final_attempt=deliveries > settings.task_max_retries)
+            await asyncio.to_thread(record_task_finished)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.xack(settings.ingest_stream_key, settings.ingest_stream_group, entry_id)
+            pipe.xdel(settings.ingest_stream_key, entry_id)
+            await pipe.execute()
+        except _TransientError as e:
+            logger.warning("Transient failure for resume %s (delivery %d): %s; will be reclaimed", resume_id, deliveries, e)
+        except Exception:
+            logger.exception("Stream job %s for resume %s crashed; will be reclaimed", entry_id, resume_id)
+        finally:
+            await lease.release()
+            self._active_ids.discard(entry_id)
+
+    async def process(self, resume_id: str, file_path: str, final_attempt: bool = False) -> None:
+        rid = UUID(resume_id)
+        row = await self.pool.fetchrow("SELECT status, batch_id, extracted_text FROM resumes WHERE id = $1", rid)
+        if row is None:
+            logger.warning("Resume not found: %s", resume_id)
+            return
+        if row["status"] == "processed":
+            logger.info("Resume %s already processed, skipping (idempotent)", resume_id)
+            return
+        batch_id, current = row["batch_id"], row["status"]
+        text_saved = current in ("extracted", "awaiting_embedding") and bool(row["extracted_text"])
+        try:
+            if text_saved:
+                normalized = row["extracted_text"]
+            else:
+                loop = asyncio.get_running_loop()
+                raw_text = await loop.run_in_executor(self.executor, ExtractionService.extract_from_path, file_path)
+                normalized = normalize_text(raw_text)[:50000]
+                if not normalized:
+                    await self._transition(_MARK_FAILED_SQL, batch_id, rid, "failed", current, "Empty or unreadable text")
+                    await self._complete_batch(batch_id)
+                    return
+                current = await self._transition(_MARK_EXTRACTED_SQL, batch_id, rid, "extracted", current, normalized)
+                text_saved = True
+            if get_embedding_circuit().is_open():
+                await self._transition(
+                    _MARK_AWAITING_EMBEDDING_SQL, batch_id, rid, "awaiting_embedding", current, "Embedding provider unavailable"
+                )
+                return
+            embedding = await self._embedding.embed_text_async(normalized, attempts=1)
+            await self._transition(_MARK_PROCESSED_SQL, batch_id, rid, "processed", current, normalized, embedding)
+            await update_shortlists_async(self.pool, self.redis, rid)
+        except Exception as e:
+            transient = _is_transient(e)
+            if transient and not final_attempt:
+                raise _TransientError(str(e)) from e
+            if text_saved and is_retryable_embedding_error(e):
+                logger.warning("Resume %s parked awaiting embedding: %s", resume_id, e)
+                await self._transition(_MARK_AWAITING_EMBEDDING_SQL, batch_id, rid, "awaiting_embedding", current, str(e)[:2000])
+                return
+            error_message = f"Retries exhausted: {e}" if transient else str(e)
+            logger.exception("Process failed for resume %s: %s", resume_id, e)
+            if transient:
+                await self.redis.rpush(
+                    settings.dead_letter_key,
+                    dead_letter_entry(resume_id, file_path, str(e), settings.task_max_retries),
+                )
+            await self._transition(_MARK_FAILED_SQL, batch_id, rid, "failed", current, error_message)
+        await self._complete_batch(batch_id)
+
+    async def _transition(self, sql: str, batch_id, rid: UUID, status: str, previous: str, *args) -> str:
+        """Apply a status update and publish it to the batch progress channel."""
+        await self.pool.execute(sql, rid, *args)
+        if status != previous:
+            await publish_async(self.redis, batch_id, resume_event(rid, status, previous))
+        return status
+
+    async def _complete_batch(self, batch_id) -> None:
+        status = await self.pool.fetchval(_COMPLETE_BATCH_SQL, batch_id)
+        if status:
+            await publish_async(self.redis, batch_id, batch_event(status))
+
+
+def _is_transient(exc: BaseException) -> bool:
+    import asyncpg
+
+    return is_retryable_embedding_error(exc) or isinstance(
+        exc, (asyncpg.PostgresConnectionError, asyncpg.TooManyConnectionsError, ConnectionError, asyncio.TimeoutError)
+    )
+
+
+async def _main(consumer: str, max_in_flight: int | None) -> None:
+    worker = StreamIngestWorker(consumer, max_in_flight)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Asyncio resume ingestion worker (Redis Streams)")
+    parser.add_argument("--consumer", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.consumer, args.max_in_flight))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Periodic task: find resumes stuck in progress (lost worker, lost message) and re-enqueue them.
+
+A resume is stuck when it sits in pending/extracted with no status change for `sweeper_stuck_after_seconds`.
+While its tenant still has tasks in the queue it may just be waiting its turn, so it is only re-enqueued
+once that backlog drains or after `sweeper_hard_deadline_seconds`. A Redis SET NX key per resume (TTL =
+stuck-after window) ensures one re-enqueue per window even with several beat/sweeper runs, and
+`updated_at` is bumped so the next sweep waits a full window again. Parked awaiting_embedding rows belong
+to the embedding drainer. Batches left in processing with nothing in progress are completed.
+
+Batches deferred by admission control (status deferred) are released here, oldest first, as soon as
+check_admission_sync admits them.
+
+Backlog age is written to the Redis hash `ingest:backlog` and returned by GET /uploads/queue-stats.
+"""
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from app.config import get_settings
+from app.core.admission import check_admission_sync
+from app.core.batch_events import publish_batch_event
+from app.core.ingest_queue import BACKLOG_KEY, DEPTH_KEY, plan_ingest_sync
+from app.core.redis_client import get_sync_client
+from app.models.upload import RESUME_IN_PROGRESS_STATUSES, Resume, UploadBatch
+from app.tasks.process_resume import _get_session, _maybe_complete_batch, enqueue_resume
+from celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+SWEEP_STATUSES = ("pending", "extracted")
+REQUEUE_LOCK_PREFIX = "sweeper:requeued:"
+RELEASE_BATCH_LIMIT = 50
+
+
+def _claim_requeue(client, resume_id: str) -> bool:
+    """True if this sweeper may re-enqueue the resume (no other re-enqueue within the window)."""
+    return bool(client.set(f"{REQUEUE_LOCK_PREFIX}{resume_id}", "1", nx=True, ex=settings.sweeper_stuck_after_seconds))
+
+
+def is_stuck(age_seconds: float, tenant_queued: int) -> bool:
+    if age_seconds < settings.sweeper_stuck_after_seconds:
+        return False
+    return tenant_queued <= 0 or age_seconds >= settings.sweeper_hard_deadline_seconds
+
+
+def release_deferred_batches(session) -> int:
+    """Enqueue deferred batches (oldest first) that admission control now admits. Returns batches released."""
+    released = 0
+    batches = session.execute(
+        select(UploadBatch)
+        .where(UploadBatch.status == "deferred")
+        .order_by(UploadBatch.created_at)
+        .limit(RELEASE_BATCH_LIMIT)
+    ).scalars().all()
+    for batch in batches:
+        resumes = session.execute(
+            select(Resume.id, Resume.file_path).where(Resume.batch_id == batch.id, Resume.status == "pending")
+        ).all()
+        tenant_id = str(batch.user_id)
+        if resumes and not check_admission_sync(tenant_id, len(resumes)).admitted:
+            continue
+        claimed = session.execute(
+            update(UploadBatch)
+            .where(UploadBatch.id == batch.id, UploadBatch.status == "deferred")
+            .values(status="processing")
+        ).rowcount
+        session.commit()
+        if not claimed:
+            continue  # released by a concurrent sweep
+        publish_batch_event(batch.id, "processing")
+        plan = plan_ingest_sync(tenant_id, len(resumes))
+        for row, priority in zip(resumes, plan.priorities):
+            enqueue_resume(str(row.id), row.file_path, priority, plan.queue, tenant_id, plan.enqueued_at)
+        if not resumes:
+            _maybe_complete_batch(session, batch.id)
+        released += 1
+        logger.info("Released deferred batch %s (%d resumes)", batch.id, len(resumes))
+    session.commit()
+    return released
+
+
+def sweep_stuck_resumes() -> dict:
+    """One sweep: re-enqueue stuck resumes, complete orphaned batches, record backlog age. Returns a summary."""
+    client = get_sync_client()
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.sweeper_stuck_after_seconds)
+    requeued = 0
+    session = _get_session()
+    try:
+        released = release_deferred_batches(session)
+        tenant_depths = {k: int(v) for k, v in (client.hgetall(DEPTH_KEY) or {}).items()}
+        rows = session.execute(
+            select(Resume.id, Resume.file_path, Resume.batch_id, Resume.updated_at, UploadBatch.user_id)
+            .join(UploadBatch, UploadBatch.id == Resume.batch_id)
+            .where(
+                Resume.status.in_(SWEEP_STATUSES),
+                Resume.updated_at < cutoff,
+                UploadBatch.status != "deferred",
+            )
+            .order_by(Resume.updated_at)
+            .limit(settings.sweeper_max_requeue)
+        ).all()
+        for row in rows:
+            age = (now - row.updated_at).total_seconds()
+            if not row.file_path or not is_stuck(age, tenant_depths.get(str(row.user_id), 0)):
+                continue
+            if not _claim_requeue(client, str(row.id)):
+                continue
+            session.execute(update(Resume).where(Resume.id == row.id).values(updated_at=func.now()))
+            session.commit()
+            enqueue_resume(str(row.id), row.file_path)
+            requeued += 1
+            logger.warning("Re-enqueued resume %s stuck for %.0fs", row.id, age)
+
+        # Batches whose completion was lost (worker died between resume update and batch update)
+        orphaned = session.execute(
+            select(UploadBatch.id).where(
+                UploadBatch.status.in_(("pending", "processing")),
+                UploadBatch.created_at < cutoff,
+                ~select(Resume.id)
+                .where(Resume.batch_id == UploadBatch.id, Resume.status.in_(RESUME_IN_PROGRESS_STATUSES))
+                .exists(),
+            )
+        ).scalars().all()
+        for batch_id in orphaned:
+            _maybe_complete_batch(session, batch_id)
+
+        counts = dict(
+            session.execute(
+                select(Resume.status, func.count())
+                .where(Resume.status.in_(RESUME_IN_PROGRESS_STATUSES))
+                .group_by(Resume.status)
+            ).all()
+        )
+        oldest = session.execute(
+            select(func.min(Resume.created_at)).where(Resume.status.in_(RESUME_IN_PROGRESS_STATUSES))
+        ).scalar()
+    finally:
+        session.close()
+
+    summary = {
+        "requeued": requeued,
+        "batches_released": released,
+        "batches_completed": len(orphaned),
+        "oldest_in_progress_seconds": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        **{f"{status}_count": counts.get(status, 0) for status in RESUME_IN_PROGRESS_STATUSES},
+    }
+    try:
+        pipe = client.pipeline()
+        pipe.hset(BACKLOG_KEY, mapping={**summary, "swept_at": time.time()})
+        pipe.hincrby(BACKLOG_KEY, "requeued_total", requeued)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Backlog metrics update failed: %s", e)
+    logger.info("Sweep: %s", summary)
+    return summary
+
+
+@celery_app.task(name="app.tasks.sweep_stuck_resumes")
+def sweep_stuck_resumes_task() -> dict:
+    return sweep_stuck_resumes()
@@ -0,0 +1,115 @@
+"""
+Per-process resources for Celery workers: sync DB engine, embedding HTTP client, extraction modules.
+
+Nothing that holds sockets is created at import time. With the prefork pool the parent only warms
+extraction imports (shared copy-on-write); each child builds its own engine and client in
+`worker_process_init` and disposes of them in `worker_process_shutdown`. Thread/gevent/solo pools do
+not fork, so the same setup runs once in `worker_init`. Outside a worker (inline processing from the
+API) everything is created lazily on first use.
+
+DB pool size per process = tasks that can run at once in that process: 1 for prefork children,
+the worker concurrency for thread/green pools (override with WORKER_DB_POOL_SIZE).
+"""
+import logging
+import os
+
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import get_settings
+from app.services.embedding import close_embedding_service, get_embedding_service, reset_embedding_aggregator
+from app.services.extraction import ExtractionService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+_NON_FORKING_POOLS = ("thread", "gevent", "eventlet", "solo")
+
+_tasks_per_process = 1
+_engine: Engine | None = None
+_session_factory: sessionmaker | None = None
+_engine_pid: int | None = None
+
+
+def db_pool_size() -> int:
+    if settings.worker_db_pool_size:
+        return settings.worker_db_pool_size
+    return max(_tasks_per_process, 1)
+
+
+def _create_engine() -> Engine:
+    sync_url = settings.database_url_sync or settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    return create_engine(
+        sync_url,
+        pool_pre_ping=True,
+        pool_size=db_pool_size(),
+        max_overflow=settings.worker_db_max_overflow,
+        pool_timeout=30,
+        pool_recycle=3600,
+    )
+
+
+def get_engine() -> Engine:
+    """Engine owned by this process; an engine inherited across fork is dropped without touching its sockets."""
+    global _engine, _session_factory, _engine_pid
+    if _engine is None or _engine_pid != os.getpid():
+        if _engine is not None:
+            _engine.dispose(close=False)
+        _engine = _create_engine()
+        _session_factory = sessionmaker(_engine, expire_on_commit=False, autocommit=False, autoflush=False)
+        _engine_pid = os.getpid()
+    return _engine
+
+
+def get_session() -> Session:
+    get_engine()
+    return _session_factory()
+
+
+def init_process_resources() -> None:
+    """Create this process's engine and embedding client up front (first task pays no connect/TLS cost)."""
+    reset_embedding_aggregator()
+    get_engine()
+    try:
+        get_embedding_service().client  # builds the HTTP client; raises without OPENAI_API_KEY
+    except ValueError as e:
+        logger.warning("Embedding client not initialised: %s", e)
+    logger.info("Worker process %s ready (db pool_size=%s)", os.getpid(), db_pool_size())
+
+
+def shutdown_process_resources() -> None:
+    global _engine, _session_factory, _engine_pid
+    reset_embedding_aggregator()
+    close_embedding_service()
+    if _engine is not None and _engine_pid == os.getpid():
+        _engine.dispose()
+    _engine = _session_factory = _engine_pid = None
+
+
+@worker_init.connect
+def _on_worker_init(sender=None, **kwargs) -> None:
+    global _tasks_per_process
+    ExtractionService.warm_up()
+    pool = str(getattr(sender, "pool_cls", "") or "").lower()
+    if any(name in pool for name in _NON_FORKING_POOLS):
+        _tasks_per_process = getattr(sender, "concurrency", None) or 1
+        init_process_resources()
+    else:
+        _tasks_per_process = 1
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs) -> None:
+    init_process_resources()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs) -> None:
+    shutdown_process_resources()
+
+
+@worker_shutdown.connect
+def _on_worker_shutdown(**kwargs) -> None:
+    shutdown_process_resources()
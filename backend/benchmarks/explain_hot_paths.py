@@ -0,0 +1,152 @@
+"""
+EXPLAIN plans for the hot listing, dashboard, ranking and run-detail queries on a seeded database.
+
+    cd backend
+    # point DATABASE_URL(_SYNC) at a scratch database that has been migrated (alembic upgrade head)
+    python benchmarks/explain_hot_paths.py --seed --users 50 --batches 40 --resumes 100 --runs 20
+    python benchmarks/explain_hot_paths.py                      # plans only (reuses seeded data)
+    python benchmarks/explain_hot_paths.py --without-indexes    # same plans with the index pack disabled
+
+--seed inserts synthetic users, batches, resumes (random unit-free vectors), JDs, runs and results
+entirely in SQL (generate_series), then ANALYZEs. --without-indexes runs every EXPLAIN inside a
+transaction that drops the indexes from migration d4a7c2e9f150 and rolls back, for a before/after
+comparison on identical data. Never run --seed or --without-indexes against production.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+
+settings = get_settings()
+
+# *_created_at_id (keyset pagination, migration d9b5e1c3a8f6) replace the *_created_at indexes on upgraded databases
+INDEX_PACK = [
+    "ix_resumes_batch_id_status",
+    "ix_resumes_batch_id_ranked",
+    "ix_upload_batches_user_id_created_at",
+    "ix_upload_batches_user_id_created_at_id",
+    "ix_job_descriptions_user_id_created_at",
+    "ix_job_descriptions_user_id_created_at_id",
+    "ix_screening_runs_jd_id_created_at",
+    "ix_screening_runs_jd_id_created_at_id",
+    "ix_screening_results_run_id_rank_position",
+    "ix_screening_results_resume_id",
+]
+
+SEED_SQL = [
+    """INSERT INTO users (id, email, hashed_password, created_at)
+       SELECT gen_random_uuid(), 'bench' || g || '-' || md5(random()::text) || '@example.com', 'x', now()
+       FROM generate_series(1, :users) g""",
+    """INSERT INTO upload_batches (id, user_id, batch_name, status, created_at)
+       SELECT gen_random_uuid(), u.id, 'bench', 'completed', now() - random() * interval '90 days'
+       FROM users u CROSS JOIN generate_series(1, :batches) g WHERE u.email LIKE 'bench%'""",
+    """INSERT INTO resumes (id, batch_id, filename, status, embedding, created_at, updated_at)
+       SELECT gen_random_uuid(), b.id, 'cv.pdf',
+              CASE WHEN random() < 0.95 THEN 'processed' ELSE 'failed' END,
+              (SELECT array_agg(random() - 0.5)::vector FROM generate_series(1, 1536) d WHERE g > 0),
+              b.created_at, b.created_at
+       FROM upload_batches b CROSS JOIN generate_series(1, :resumes) g WHERE b.batch_name = 'bench'""",
+    "UPDATE resumes SET embedding = NULL WHERE status = 'failed' AND filename = 'cv.pdf'",
+    """INSERT INTO job_descriptions (id, user_id, title, raw_text, created_at)
+       SELECT gen_random_uuid(), u.id, 'bench jd', 'text', now() - random() * interval '90 days'
+       FROM users u CROSS JOIN generate_series(1, 5) g WHERE u.email LIKE 'bench%'""",
+    """INSERT INTO screening_runs (id, jd_id, created_at)
+       SELECT gen_random_uuid(), j.id, now() - random() * interval '60 days'
+       FROM job_descriptions j CROSS JOIN generate_series(1, :runs) g WHERE j.title = 'bench jd'""",
+    """INSERT INTO screening_results (id, run_id, resume_id, similarity_score, rank_position)
+       SELECT gen_random_uuid(), s.id, r.id, random(), row_number() OVER (PARTITION BY s.id)
+       FROM screening_runs s
+       CROSS JOIN LATERAL (SELECT id FROM resumes TABLESAMPLE SYSTEM (1) LIMIT 50) r""",
+]
+
+# (label, SQL); :user_id, :batch_id, :jd_id, :run_id, :embedding are filled from the seeded data
+HOT_QUERIES = [
+    ("batches list (user, newest first)",
+     "SELECT id, status, created_at FROM upload_batches WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 20"),
+    ("batch detail (resumes of one batch)",
+     "SELECT id, filename, status FROM resumes WHERE batch_id = :batch_id"),
+    ("batch completion check",
+     "SELECT count(*) FROM resumes WHERE batch_id = :batch_id AND status IN ('pending', 'extracted', 'awaiting_embedding')"),
+    ("dashboard resumes by status",
+     """SELECT r.status, count(*) FROM resumes r JOIN upload_batches b ON b.id = r.batch_id
+        WHERE b.user_id = :user_id GROUP BY r.status"""),
+    ("dashboard uploads last 30 days",
+     """SELECT date(created_at), count(*) FROM upload_batches
+        WHERE user_id = :user_id AND created_at >= now() - interval '30 days' GROUP BY 1 ORDER BY 1"""),
+    ("batches list, keyset page (after a cursor)",
+     """SELECT id, status, created_at FROM upload_batches WHERE user_id = :user_id
+        AND (created_at, id) < (now() - interval '30 days', '00000000-0000-0000-0000-000000000000')
+        ORDER BY created_at DESC, id DESC LIMIT 20"""),
+    ("JD list (user, newest first)",
+     "SELECT id, title FROM job_descriptions WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 20"),
+    ("runs of a JD (newest first)",
+     "SELECT id, created_at FROM screening_runs WHERE jd_id = :jd_id ORDER BY created_at DESC LIMIT 20"),
+    ("run detail page",
+     """SELECT sr.rank_position, sr.similarity_score, r.filename FROM screening_results sr
+        JOIN resumes r ON r.id = sr.resume_id WHERE sr.run_id = :run_id ORDER BY sr.rank_position LIMIT 20"""),
+    ("ranking within one batch",
+     """SELECT id FROM resumes WHERE batch_id = :batch_id AND status = 'processed' AND embedding IS NOT NULL
+        ORDER BY embedding <=> CAST(:embedding AS vector) LIMIT 50"""),
+]
+
+
+def seed(engine, args) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+        for sql in SEED_SQL:
+            conn.execute(text(sql), {"users": args.users, "batches": args.batches, "resumes": args.resumes, "runs": args.runs})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def _sample_params(conn) -> dict:
+    row = conn.execute(text("""
+        SELECT b.user_id, b.id, (SELECT embedding::text FROM resumes WHERE embedding IS NOT NULL LIMIT 1)
+        FROM upload_batches b WHERE b.batch_name = 'bench' ORDER BY random() LIMIT 1
+    """)).first()
+    jd = conn.execute(text("SELECT jd_id, id FROM screening_runs ORDER BY random() LIMIT 1")).first()
+    if row is None or jd is None:
+        raise SystemExit("No seeded data found; run with --seed first")
+    return {"user_id": row[0], "batch_id": row[1], "embedding": row[2], "jd_id": jd[0], "run_id": jd[1]}
+
+
+def explain(engine, without_indexes: bool) -> None:
+    with engine.connect() as conn:
+        params = _sample_params(conn)
+        for label, sql in HOT_QUERIES:
+            trans = conn.begin()
+            try:
+                if without_indexes:
+                    for name in INDEX_PACK:
+                        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) {sql}"), params).scalars().all()
+            finally:
+                trans.rollback()
+            print(f"\n=== {label} ===")
+            print("\n".join(plan))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot query paths on a seeded database")
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--batches", type=int, default=40, help="per user")
+    parser.add_argument("--resumes", type=int, default=100, help="per batch")
+    parser.add_argument("--runs", type=int, default=20, help="per JD")
+    parser.add_argument("--without-indexes", action="store_true")
+    args = parser.parse_args()
+    engine = create_engine(settings.database_url_sync)
+    if args.seed:
+        seed(engine, args)
+    explain(engine, args.without_indexes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Recall@k of the ANN index on resumes.embedding against exact search, for a range of ef_search values.
+
+    cd backend
+    python benchmarks/hnsw_recall.py --queries 50 --k 50 --ef 40 64 100 200 400
+    python benchmarks/hnsw_recall.py --batch-id <uuid>          # filtered (iterative scan) case
+    python benchmarks/hnsw_recall.py --query-source jds          # real JD embeddings as queries
+
+Queries default to embeddings of random processed resumes (excluding the query resume itself from both
+result lists); `--query-source jds` uses stored JD embeddings instead. Exact results come from the same
+query with index scans disabled. Each query runs in its own transaction with the same set_config calls
+the ranking service uses, so the numbers match production behaviour for your data.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+
+settings = get_settings()
+
+_QUERY = """
+    SELECT r.id FROM resumes r
+    WHERE r.status = 'processed' AND r.embedding IS NOT NULL AND r.id <> CAST(:exclude AS uuid) {batch_filter}
+    ORDER BY r.embedding <=> CAST(:embedding AS vector)
+    LIMIT :k
+"""
+
+
+def _sample_queries(conn, source: str, n: int) -> list[tuple[str, str]]:
+    if source == "jds":
+        sql = "SELECT id, embedding::text FROM job_descriptions WHERE embedding IS NOT NULL ORDER BY random() LIMIT :n"
+    else:
+        sql = "SELECT id, embedding::text FROM resumes WHERE status = 'processed' AND embedding IS NOT NULL ORDER BY random() LIMIT :n"
+    return [(str(r[0]), r[1]) for r in conn.execute(text(sql), {"n": n})]
+
+
+def _run(engine, sql, params: dict, gucs: dict[str, str]) -> tuple[list, float]:
+    with engine.begin() as conn:
+        for name, value in gucs.items():
+            conn.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+        start = time.perf_counter()
+        ids = [row[0] for row in conn.execute(sql, params)]
+        return ids, (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure ANN recall@k against exact search")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--ef", type=int, nargs="+", default=[40, 64, 100, 200, 400])
+    parser.add_argument("--batch-id", default=None)
+    parser.add_argument("--query-source", choices=["resumes", "jds"], default="resumes")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.database_url_sync)
+    sql = text(_QUERY.format(batch_filter="AND r.batch_id = CAST(:batch_id AS uuid)" if args.batch_id else ""))
+    with engine.connect() as conn:
+        queries = _sample_queries(conn, args.query_source, args.queries)
+    if not queries:
+        print("No embeddings found")
+        return
+
+    exact: dict[str, tuple[set, float]] = {}
+    for qid, emb in queries:
+        params = {"embedding": emb, "k": args.k, "exclude": qid, "batch_id": args.batch_id}
+        ids, ms = _run(engine, sql, params, {"enable_indexscan": "off", "enable_bitmapscan": "off"})
+        exact[qid] = (set(ids), ms)
+    exact_ms = [ms for _, ms in exact.values()]
+    print(f"queries={len(queries)} k={args.k} filter={'batch' if args.batch_id else 'none'}")
+    print(f"exact      p50={statistics.median(exact_ms):8.2f}ms")
+
+    scan = settings.hnsw_iterative_scan if args.batch_id and settings.hnsw_iterative_scan not in ("", "off") else None
+    for ef in args.ef:
+        recalls, latencies = [], []
+        gucs = {"hnsw.ef_search": str(max(ef, 1))}
+        if scan:
+            gucs["hnsw.iterative_scan"] = scan
+        for qid, emb in queries:
+            params = {"embedding": emb, "k": args.k, "exclude": qid, "batch_id": args.batch_id}
+            ids, ms = _run(engine, sql, params, gucs)
+            truth = exact[qid][0]
+            recalls.append(len(truth & set(ids)) / len(truth) if truth else 1.0)
+            latencies.append(ms)
+        latencies.sort()
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        print(
+            f"ef_search={ef:<4} recall@{args.k}={statistics.mean(recalls):.4f} "
+            f"(min {min(recalls):.3f})  p50={statistics.median(latencies):8.2f}ms  p95={p95:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
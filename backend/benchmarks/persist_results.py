@@ -0,0 +1,107 @@
+"""
+Time to persist a screening run's results: one ORM object per row (the old add_results) vs the bulk
+executemany INSERT with database-generated ids (ScreeningRepository.add_results).
+
+    cd backend
+    # point DATABASE_URL at a scratch database that has been migrated (alembic upgrade head)
+    python benchmarks/persist_results.py --rows 50 500 5000 --repeat 5
+
+Everything runs inside one transaction that is rolled back: a throwaway user, batch, JD and --rows
+resumes are inserted first, then each run's results are written with both paths and the time to
+flush them is reported. Nothing is left behind, but do not point it at production.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.models.screening import ScreeningResult  # noqa: E402
+from app.repositories.screening_repository import ScreeningRepository  # noqa: E402
+
+settings = get_settings()
+
+
+async def _seed(session: AsyncSession, rows: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    user_id = (await session.execute(text(
+        "INSERT INTO users (id, email, hashed_password) "
+        "VALUES (gen_random_uuid(), 'bench-' || md5(random()::text) || '@example.com', 'x') RETURNING id"
+    ))).scalar_one()
+    batch_id = (await session.execute(text(
+        "INSERT INTO upload_batches (id, user_id, batch_name, status) "
+        "VALUES (gen_random_uuid(), :user_id, 'bench', 'completed') RETURNING id"
+    ), {"user_id": user_id})).scalar_one()
+    resume_ids = (await session.execute(text(
+        "INSERT INTO resumes (id, batch_id, filename, status) "
+        "SELECT gen_random_uuid(), :batch_id, 'cv.pdf', 'processed' FROM generate_series(1, :rows) RETURNING id"
+    ), {"batch_id": batch_id, "rows": rows})).scalars().all()
+    jd_id = (await session.execute(text(
+        "INSERT INTO job_descriptions (id, user_id, title, raw_text) "
+        "VALUES (gen_random_uuid(), :user_id, 'bench jd', 'text') RETURNING id"
+    ), {"user_id": user_id})).scalar_one()
+    return jd_id, list(resume_ids)
+
+
+async def _orm_objects(session: AsyncSession, run_id: uuid.UUID, results: list) -> None:
+    for resume_id, score, rank_pos in results:
+        session.add(ScreeningResult(
+            id=uuid.uuid4(), run_id=run_id, resume_id=resume_id, similarity_score=score, rank_position=rank_pos,
+        ))
+    await session.flush()
+
+
+async def _bulk(session: AsyncSession, run_id: uuid.UUID, results: list) -> None:
+    await ScreeningRepository.add_results(session, run_id, results)
+
+
+async def _time_ms(session: AsyncSession, jd_id: uuid.UUID, persist, results: list, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        run = await ScreeningRepository.create_run(session, jd_id)
+        start = time.perf_counter()
+        await persist(session, run.id, results)
+        samples.append((time.perf_counter() - start) * 1000)
+        session.expunge_all()
+    return samples
+
+
+async def main_async(args) -> None:
+    engine = create_async_engine(settings.database_url)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                session = AsyncSession(bind=conn, expire_on_commit=False)
+                jd_id, resume_ids = await _seed(session, max(args.rows))
+                for rows in args.rows:
+                    results = [(rid, 1 - i / rows, i + 1) for i, rid in enumerate(resume_ids[:rows])]
+                    for label, persist in (("orm objects", _orm_objects), ("bulk insert", _bulk)):
+                        samples = await _time_ms(session, jd_id, persist, results, args.repeat)
+                        print(f"{rows:>6} rows  {label:<12} median={statistics.median(samples):8.1f} ms  "
+                              f"min={min(samples):8.1f} ms")
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time persisting screening results: ORM objects vs bulk INSERT")
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
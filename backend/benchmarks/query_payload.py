@@ -0,0 +1,120 @@
+"""
+Column data fetched per request by the batch detail, run detail and JD ownership-check queries: whole ORM
+entities (text and embedding undeferred, as before they were deferred) vs the projected / deferred queries the
+repositories now issue.
+
+    cd backend
+    # point DATABASE_URL at a database with processed resumes and screening runs
+    # (e.g. seeded with python benchmarks/explain_hot_paths.py --seed)
+    python benchmarks/query_payload.py --repeat 20
+
+Bytes are the encoded size of the values returned (UTF-8 text, 4 bytes per vector dimension plus header,
+16 per UUID, 8 per timestamp or number), i.e. what crosses the wire minus protocol framing. The busiest
+batch, the run with most results and a JD with an embedding are used.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+from sqlalchemy.orm import undefer  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import async_session_maker, engine  # noqa: E402
+from app.models.job_description import JobDescription  # noqa: E402
+from app.models.screening import ScreeningResult  # noqa: E402
+from app.models.upload import Resume  # noqa: E402
+
+
+def _size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, uuid.UUID):
+        return 16
+    if isinstance(value, (datetime, int, float, Decimal, bool)):
+        return 8
+    if isinstance(value, Base):
+        return sum(_size(v) for k, v in vars(value).items() if not k.startswith("_sa_"))
+    try:
+        return 4 + 4 * len(np.asarray(value))
+    except TypeError:
+        return len(str(value))
+
+
+def _scenarios(batch_id, run_id, jd_id) -> list[tuple[str, object, object]]:
+    return [
+        ("batch detail (resume list)",
+         select(Resume).options(undefer(Resume.extracted_text), undefer(Resume.embedding)).where(Resume.batch_id == batch_id),
+         select(Resume.id, Resume.filename, Resume.status).where(Resume.batch_id == batch_id)),
+        ("run detail (first page)",
+         select(ScreeningResult, Resume).options(undefer(Resume.extracted_text), undefer(Resume.embedding))
+         .join(Resume, Resume.id == ScreeningResult.resume_id)
+         .where(ScreeningResult.run_id == run_id).order_by(ScreeningResult.rank_position).limit(20),
+         select(ScreeningResult.resume_id, Resume.filename, ScreeningResult.similarity_score, ScreeningResult.rank_position)
+         .join(Resume, Resume.id == ScreeningResult.resume_id)
+         .where(ScreeningResult.run_id == run_id).order_by(ScreeningResult.rank_position).limit(20)),
+        ("JD ownership check",
+         select(JobDescription).options(undefer(JobDescription.raw_text), undefer(JobDescription.embedding)).where(JobDescription.id == jd_id),
+         select(JobDescription).where(JobDescription.id == jd_id)),
+    ]
+
+
+async def _measure(session: AsyncSession, stmt, repeat: int) -> tuple[int, float]:
+    payload, samples = 0, []
+    for _ in range(repeat):
+        session.expunge_all()
+        start = time.perf_counter()
+        rows = (await session.execute(stmt)).all()
+        samples.append((time.perf_counter() - start) * 1000)
+        payload = sum(_size(value) for row in rows for value in row)
+    return payload, statistics.median(samples)
+
+
+async def main_async(args) -> None:
+    try:
+        async with async_session_maker() as session:  # app engine: binary vector codec as in production
+            batch_id = (await session.execute(
+                select(Resume.batch_id).where(Resume.embedding.isnot(None))
+                .group_by(Resume.batch_id).order_by(func.count().desc()).limit(1)
+            )).scalar()
+            run_id = (await session.execute(
+                select(ScreeningResult.run_id).group_by(ScreeningResult.run_id).order_by(func.count().desc()).limit(1)
+            )).scalar()
+            jd_id = (await session.execute(
+                select(JobDescription.id).where(JobDescription.embedding.isnot(None)).limit(1)
+            )).scalar()
+            if batch_id is None or run_id is None or jd_id is None:
+                raise SystemExit("Need processed resumes, a screening run and a JD with an embedding")
+            for label, before, after in _scenarios(batch_id, run_id, jd_id):
+                before_bytes, before_ms = await _measure(session, before, args.repeat)
+                after_bytes, after_ms = await _measure(session, after, args.repeat)
+                print(f"=== {label} ===")
+                print(f"  full entities  {before_bytes:>12,} bytes  median {before_ms:7.2f} ms")
+                print(f"  projected      {after_bytes:>12,} bytes  median {after_ms:7.2f} ms")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytes fetched by full-entity vs projected queries")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
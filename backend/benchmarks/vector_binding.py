@@ -0,0 +1,101 @@
+"""
+Per-query overhead of binding a 1536-d query vector as '[x,y,...]' text vs pgvector's binary format.
+
+    cd backend
+    python benchmarks/vector_binding.py                    # client-side encode cost only (no database)
+    python benchmarks/vector_binding.py --db --queries 500 # plus round trips against DATABASE_URL
+
+Encode: text is what pgvector's SQLAlchemy type used to send (str() of every float, joined), binary is
+the 4-byte header plus big-endian float32 payload the asyncpg codec sends (app.db.types.Vector).
+--db times `SELECT $1 <=> $1` on one asyncpg connection, first with the vector sent as text and cast
+server-side (the old CAST(:embedding AS vector) path), then with the binary codec registered; the
+difference is serialization, transfer and server-side parsing, since the operator itself is identical.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).resolve().parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from pgvector import Vector as PgVector  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+
+settings = get_settings()
+
+
+def _text(embedding: list[float]) -> str:
+    return "[" + ",".join(str(x) for x in embedding) + "]"
+
+
+def _binary(embedding: list[float]) -> bytes:
+    return PgVector(embedding).to_binary()
+
+
+def _time_us(fn, arg, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float], unit: str, size: int | None = None) -> None:
+    samples = sorted(samples)
+    p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+    extra = f"  payload={size} bytes" if size is not None else ""
+    print(f"{label:<14} p50={statistics.median(samples):9.1f}{unit}  p95={p95:9.1f}{unit}{extra}")
+
+
+async def _round_trips(embedding: list[float], n: int) -> None:
+    import asyncpg
+    from pgvector.asyncpg import register_vector
+
+    dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    conn = await asyncpg.connect(dsn)
+    try:
+        as_text = _text(embedding)
+        timings = []
+        for _ in range(n):
+            start = time.perf_counter()
+            await conn.fetchval("SELECT CAST($1 AS vector) <=> CAST($1 AS vector)", as_text)
+            timings.append((time.perf_counter() - start) * 1e6)
+        _report("db text", timings, "us")
+
+        await register_vector(conn)
+        as_vector = PgVector(embedding)
+        timings = []
+        for _ in range(n):
+            start = time.perf_counter()
+            await conn.fetchval("SELECT $1::vector <=> $1::vector", as_vector)
+            timings.append((time.perf_counter() - start) * 1e6)
+        _report("db binary", timings, "us")
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Text vs binary pgvector parameter binding")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--db", action="store_true", help="also time round trips against DATABASE_URL")
+    args = parser.parse_args()
+
+    embedding = np.random.default_rng(0).standard_normal(args.dim).astype(np.float32).tolist()
+    print(f"dim={args.dim} queries={args.queries}")
+    _report("encode text", _time_us(_text, embedding, args.queries), "us", len(_text(embedding).encode()))
+    _report("encode binary", _time_us(_binary, embedding, args.queries), "us", len(_binary(embedding)))
+    if args.db:
+        asyncio.run(_round_trips(embedding, args.queries))
+
+
+if __name__ == "__main__":
+    main()
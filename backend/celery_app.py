@@ -2,15 +2,27 @@
 Celery app for background processing. Broker: Redis.
 """
 from celery import Celery
+from kombu import Queue
 
 from app.config import get_settings
+from app.core.ingest_queue import (
+    INGEST_BULK_QUEUE,
+    INGEST_PRIORITY_QUEUE,
+    PRIORITY_STEPS,
+    QUEUE_PRIORITY_SEP,
+)
 
 settings = get_settings()
 celery_app = Celery(
     "cv_screening",
     broker=settings.celery_broker_url,
     backend=settings.redis_url,
-    include=["app.tasks.process_resume"],
+    include=[
+        "app.tasks.process_resume",
+        "app.tasks.dead_letter",
+        "app.tasks.embedding_drainer",
+        "app.tasks.sweeper",
+    ],
 )
 celery_app.conf.update(
     task_serializer="json",
@@ -25,4 +37,20 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
     result_expires=3600,
+    # Lanes: workers consume all queues (-Q ingest.priority,ingest.bulk,celery); see app.core.ingest_queue
+    task_queues=(Queue(INGEST_PRIORITY_QUEUE), Queue(INGEST_BULK_QUEUE), Queue("celery")),
+    task_default_queue="celery",
+    task_routes={"app.tasks.process_resume": {"queue": INGEST_BULK_QUEUE}},
+    broker_transport_options={"priority_steps": PRIORITY_STEPS, "sep": QUEUE_PRIORITY_SEP},
+    # Periodic maintenance (run `celery -A celery_app beat`)
+    beat_schedule={
+        "drain-awaiting-embeddings": {
+            "task": "app.tasks.drain_awaiting_embeddings",
+            "schedule": settings.embedding_drain_interval_seconds,
+        },
+        "sweep-stuck-resumes": {
+            "task": "app.tasks.sweep_stuck_resumes",
+            "schedule": settings.sweeper_interval_seconds,
+        },
+    },
 )
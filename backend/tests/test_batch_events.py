@@ -0,0 +1,47 @@
+"""Unit tests for batch progress events (SSE stream over a stand-in pub/sub)."""
+import json
+
+from app.core.batch_events import BatchProgress, batch_event, resume_event, stream_batch_events
+
+
+class _PubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.closed = False
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        return {"data": self.messages.pop(0)} if self.messages else None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class _Client:
+    async def aclose(self):
+        pass
+
+
+def test_progress_counts_follow_transitions():
+    progress = BatchProgress({"pending": 3}, "processing")
+    progress.apply(json.loads(resume_event("r1", "extracted", "pending")))
+    progress.apply(json.loads(resume_event("r1", "processed", "extracted")))
+    progress.apply(json.loads(resume_event("r2", "failed", "pending")))
+    state = progress.as_dict()
+    assert state["counts"] == {"pending": 1, "extracted": 0, "processed": 1, "failed": 1}
+    assert state["done"] == 2 and state["total"] == 3
+    assert progress.done_since_start == 2
+
+
+async def test_stream_ends_when_batch_finishes():
+    pubsub = _PubSub([resume_event("r1", "processed", "pending"), batch_event("completed")])
+
+    async def connected():
+        return False
+
+    progress = BatchProgress({"pending": 1}, "processing")
+    chunks = [c async for c in stream_batch_events(_Client(), pubsub, progress, connected)]
+    assert chunks[0].startswith("event: snapshot")
+    assert chunks[1].startswith("event: resume")
+    assert chunks[-1].startswith("event: batch")
+    assert '"batch_status": "completed"' in chunks[-1]
+    assert pubsub.closed
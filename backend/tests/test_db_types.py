@@ -0,0 +1,34 @@
+"""Unit tests for shared column types and index definitions (app.db.types)."""
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.db import types
+from app.models.job_description import JobDescription
+from app.models.upload import Resume
+
+
+@pytest.mark.parametrize("model", [Resume, JobDescription])
+def test_model_embedding_index_is_built_from_settings(model):
+    table = model.__tablename__
+    index = next(i for i in model.__table__.indexes if i.name.startswith(f"ix_{table}_embedding_"))
+    expected = types.embedding_index(table)
+    assert index.name == expected.name
+    assert index.dialect_options["postgresql"]["with"] == expected.dialect_options["postgresql"]["with"]
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert f"ON {table} USING {types.settings.vector_index_type} (embedding vector_cosine_ops)" in ddl
+
+
+def test_embedding_index_follows_index_type_and_parameters(monkeypatch):
+    monkeypatch.setattr(types.settings, "hnsw_m", 24)
+    monkeypatch.setattr(types.settings, "hnsw_ef_construction", 128)
+    index = types.embedding_index("resumes")
+    assert index.name == "ix_resumes_embedding_hnsw"
+    assert index.dialect_options["postgresql"]["with"] == {"m": 24, "ef_construction": 128}
+
+    monkeypatch.setattr(types.settings, "vector_index_type", "ivfflat")
+    monkeypatch.setattr(types.settings, "ivfflat_lists", 300)
+    index = types.embedding_index("resumes")
+    assert index.name == "ix_resumes_embedding_ivfflat"
+    assert index.dialect_options["postgresql"]["using"] == "ivfflat"
+    assert index.dialect_options["postgresql"]["with"] == {"lists": 300}
@@ -0,0 +1,54 @@
+"""Unit tests for the worker-side embedding aggregator (fake provider, no network)."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import openai
+import pytest
+
+from app.services.embedding.aggregator import EmbeddingAggregator
+
+
+class FakeProvider:
+    def __init__(self, fail_on: str | None = None, error: Exception | None = None):
+        self.calls: list[list[str]] = []
+        self.fail_on = fail_on
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.error is not None and (self.fail_on is None or self.fail_on in texts):
+            raise self.error
+        return [[float(len(t))] for t in texts]
+
+
+def test_concurrent_texts_share_requests():
+    provider = FakeProvider()
+    agg = EmbeddingAggregator(provider, max_batch=8, max_wait_ms=50)
+    texts = [f"cv {'x' * i}" for i in range(16)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(agg.embed, texts))
+    assert results == [[float(len(t))] for t in texts]
+    assert len(provider.calls) < len(texts)
+    assert all(len(call) <= 8 for call in provider.calls)
+
+
+def test_transient_error_reaches_every_waiter():
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    provider = FakeProvider(error=openai.APITimeoutError(request=request))
+    agg = EmbeddingAggregator(provider, max_batch=4, max_wait_ms=20)
+    futures = [agg.submit(f"text {i}") for i in range(4)]
+    for future in futures:
+        with pytest.raises(openai.APITimeoutError):
+            future.result(timeout=5)
+
+
+def test_bad_input_does_not_fail_neighbours():
+    provider = FakeProvider(fail_on="bad", error=ValueError("invalid input"))
+    agg = EmbeddingAggregator(provider, max_batch=4, max_wait_ms=50)
+    good, bad = agg.submit("good"), agg.submit("bad")
+    assert good.result(timeout=5) == [4.0]
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
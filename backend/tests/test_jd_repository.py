@@ -0,0 +1,19 @@
+"""Unit tests for job description queries (app.repositories.jd_repository)."""
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.jd_repository import JobDescriptionRepository
+
+
+async def test_get_by_id_loads_heavy_columns_only_on_request():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    await JobDescriptionRepository.get_by_id(session, uuid4())
+    await JobDescriptionRepository.get_by_id(session, uuid4(), with_embedding=True)
+    plain, with_embedding = (
+        str(c.args[0].compile(dialect=postgresql.dialect())) for c in session.execute.await_args_list
+    )
+    assert "raw_text" not in plain and "embedding" not in plain
+    assert "job_descriptions.embedding" in with_embedding and "raw_text" not in with_embedding
@@ -0,0 +1,46 @@
+"""Unit tests for keyset pagination cursors and cached totals."""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.deps import keyset_after
+from app.core import pagination
+from app.core.pagination import decode_cursor, encode_cursor, page_count
+from app.schemas.common import PaginationParams
+
+
+def test_cursor_round_trips_sort_keys():
+    created_at, row_id = datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc), uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id), datetime, type(row_id)) == (created_at, row_id)
+    assert decode_cursor(encode_cursor(42), int) == (42,)
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor(1, 2), encode_cursor("x"), encode_cursor(True)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, int)
+    with pytest.raises(HTTPException) as exc:
+        keyset_after(PaginationParams(cursor=cursor), int)
+    assert exc.value.status_code == 400
+
+
+def test_page_mode_has_no_keyset():
+    assert keyset_after(PaginationParams(page=3), int) is None
+    assert page_count(None, 20) is None and page_count(0, 20) == 0 and page_count(41, 20) == 3
+
+
+async def test_cursor_totals_are_cached_page_totals_exact(monkeypatch):
+    monkeypatch.setattr(pagination.settings, "pagination_total_cache_seconds", 30)
+    result = MagicMock()
+    result.scalar.return_value = 7
+    session = AsyncMock()
+    session.execute.return_value = result
+    key = ("test", uuid4())
+    assert await pagination.total_count(session, "q", key) == 7
+    assert await pagination.total_count(session, "q", key) == 7
+    assert session.execute.await_count == 1
+    await pagination.total_count(session, "q")
+    assert session.execute.await_count == 2
@@ -0,0 +1,146 @@
+"""Unit tests for rank memoization (app.services.ranking.memo); locking runs against an in-memory Redis stand-in."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.api.deps import get_current_user
+from app.core.redis_client import close_async_client, get_async_client
+from app.db.session import get_async_session
+from app.main import app
+from app.repositories.jd_repository import JobDescriptionRepository
+from app.repositories.screening_repository import ScreeningRepository
+from app.services.ranking import memo
+from app.services.ranking.memo import memo_key
+
+
+class _FakeRedis:
+    """The handful of commands memo uses, over one shared dict."""
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeRedis):
+        self.client, self.ops = client, []
+
+    def set(self, *args, **kwargs):
+        self.ops.append(self.client.set(*args, **kwargs))
+
+    def delete(self, key):
+        self.ops.append(self.client.delete(key))
+
+    async def execute(self):
+        for op in self.ops:
+            await op
+
+
+def test_memo_key_tracks_embedding_revision_and_params():
+    jd_id = uuid4()
+    base = memo_key(jd_id, [0.1, 0.2], "b:10:t1", {"limit": 50, "min_score": None})
+    assert base == memo_key(jd_id, [0.1, 0.2], "b:10:t1", {"min_score": None, "limit": 50})
+    assert base != memo_key(jd_id, [0.1, 0.3], "b:10:t1", {"limit": 50, "min_score": None})
+    assert base != memo_key(jd_id, [0.1, 0.2], "b:11:t2", {"limit": 50, "min_score": None})
+    assert base != memo_key(jd_id, [0.1, 0.2], "b:10:t1", {"limit": 20, "min_score": None})
+
+
+async def test_memo_fails_open_without_redis(monkeypatch):
+    monkeypatch.setattr(memo.settings, "redis_url", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(memo.settings, "rank_memo_ttl_seconds", 60)
+    get_async_client.cache_clear()
+    try:
+        assert await memo.lookup("rank:memo:x") == (None, False)
+        await memo.store("rank:memo:x", "00000000-0000-0000-0000-000000000000")
+    finally:
+        await close_async_client()
+
+
+async def test_memo_shares_one_client(monkeypatch):
+    get_async_client.cache_clear()
+    try:
+        assert memo._client() is memo._client()
+    finally:
+        await close_async_client()
+
+
+@pytest.fixture
+def redis_data(monkeypatch):
+    data: dict = {}
+    monkeypatch.setattr(memo, "_client", lambda: _FakeRedis(data))
+    monkeypatch.setattr(memo.settings, "rank_memo_ttl_seconds", 60)
+    monkeypatch.setattr(memo.settings, "rank_memo_lock_seconds", 0)
+    return data
+
+
+async def test_first_lookup_takes_lock_and_store_releases_it(redis_data):
+    assert await memo.lookup("k") == (None, True)
+    await memo.store("k", "00000000-0000-0000-0000-000000000001", owns_lock=True)
+    assert "k:lock" not in redis_data
+    value, owns_lock = await memo.lookup("k")
+    assert value["run_id"] == "00000000-0000-0000-0000-000000000001" and not owns_lock
+
+
+async def test_refresh_never_releases_a_concurrent_requests_lock(redis_data):
+    assert await memo.lookup("k") == (None, True)  # another request is ranking
+    assert await memo.lookup("k", refresh=True) == (None, False)
+    await memo.store("k", "00000000-0000-0000-0000-000000000002", owns_lock=False)
+    assert "k:lock" in redis_data
+
+
+async def test_waiting_lookup_leaves_the_lock_to_its_owner(redis_data):
+    assert await memo.lookup("k") == (None, True)
+    assert await memo.lookup("k") == (None, False)  # lock held; waited, gave up
+    assert "k:lock" in redis_data
+    await memo.release("k")
+    assert "k:lock" not in redis_data
+
+
+async def test_disabled_memo_skips_redis(monkeypatch):
+    monkeypatch.setattr(memo.settings, "rank_memo_ttl_seconds", 0)
+    monkeypatch.setattr(memo, "_client", lambda: pytest.fail("Redis used while memo disabled"))
+    assert not memo.enabled()
+    assert await memo.lookup("k") == (None, False)
+
+
+async def test_unscoped_rank_is_one_statement_with_memo_on(client, monkeypatch):
+    monkeypatch.setattr(memo.settings, "rank_memo_ttl_seconds", 60)
+    monkeypatch.setattr(memo, "candidate_revision", AsyncMock(side_effect=AssertionError("revision read")))
+    monkeypatch.setattr(memo, "_client", lambda: pytest.fail("Redis used for an unscoped rank"))
+    user_id = uuid4()
+    jd = SimpleNamespace(id=uuid4(), user_id=user_id, embedding=[0.1] * 4)
+    monkeypatch.setattr(JobDescriptionRepository, "get_by_id", AsyncMock(return_value=jd))
+    monkeypatch.setattr(ScreeningRepository, "create_run", AsyncMock(return_value=SimpleNamespace(id=uuid4())))
+    monkeypatch.setattr(ScreeningRepository, "add_results", AsyncMock())
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(fetchall=MagicMock(return_value=[]))
+    app.dependency_overrides[get_async_session] = lambda: session
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id)
+    try:
+        r = await client.post("/api/v1/screening/rank", json={"jd_id": str(jd.id), "limit": 10})
+    finally:
+        app.dependency_overrides.clear()
+    assert r.status_code == 200 and r.json()["memoized"] is False
+    assert session.execute.await_count == 1  # the ranking statement only
@@ -1,8 +1,18 @@
 """Unit tests for ranking service (empty embedding returns empty list)."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import numpy as np
 import pytest
-from unittest.mock import AsyncMock
+from pgvector import Vector as PgVector
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import asyncpg
 
-from app.services.ranking.service import RankingService
+from app.services.ranking import matrix
+from app.services.ranking.matrix import normalise_rows, top_k
+from app.services.ranking.service import EMBEDDING_PARAM, RankingService
 
 pytestmark = pytest.mark.asyncio
 
@@ -12,3 +22,174 @@ async def test_rank_resumes_empty_embedding_returns_empty():
     result = await RankingService.rank_resumes(session, [])
     assert result == []
     session.execute.assert_not_called()
+
+
+async def test_default_search_settings_add_no_statement():
+    session = AsyncMock()
+    await RankingService.apply_search_settings(session, limit=10)
+    session.execute.assert_not_called()
+
+
+async def test_search_settings_raise_ef_to_limit():
+    session = AsyncMock()
+    await RankingService.apply_search_settings(session, limit=300, ef_search=40)
+    assert session.execute.call_args.args[1] == {"ef": "300"}
+
+
+async def test_rank_resumes_issues_exactly_one_query():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(fetchall=MagicMock(return_value=[]))
+    await RankingService.rank_resumes(session, [0.1] * 4, limit=10)
+    assert session.execute.await_count == 1
+
+
+async def test_embedding_bound_as_single_binary_parameter():
+    sql, params = RankingService._rank_query([0.5, -0.25], None, 10, min_score=0.2)
+    compiled = text(sql).bindparams(EMBEDDING_PARAM).compile(dialect=asyncpg.dialect())
+    assert compiled.positiontup.count("embedding") == 1
+    assert "CAST" not in compiled.string
+    bound = EMBEDDING_PARAM.type.bind_processor(asyncpg.dialect())(params["embedding"])
+    assert isinstance(bound, PgVector)
+    assert bound == PgVector([0.5, -0.25])
+
+
+async def test_matrix_top_k_matches_full_sort():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((500, 32)).astype(np.float32)
+    query = rng.standard_normal(32).astype(np.float32)
+    expected = (normalise_rows(vectors) @ (query / np.linalg.norm(query))).argsort()[::-1][:20]
+    hits = top_k(normalise_rows(vectors), query, limit=20)
+    assert [row for row, _ in hits] == list(expected)
+    assert all(a[1] >= b[1] for a, b in zip(hits, hits[1:]))
+    assert all(score >= 0.3 for _, score in top_k(normalise_rows(vectors), query, limit=500, min_score=0.3))
+
+
+async def test_matrix_engine_defers_large_batches_to_pgvector(monkeypatch):
+    monkeypatch.setattr(matrix.settings, "rank_matrix_max_candidates", 100)
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(one=MagicMock(return_value=(101, None)))
+    assert await matrix.MatrixRankingEngine.rank(session, [0.1] * 4, uuid4(), limit=10) is None
+
+
+async def test_matrix_engine_reuses_callers_batch_revision(monkeypatch):
+    monkeypatch.setattr(matrix.settings, "rank_matrix_max_candidates", 100)
+    session = AsyncMock()
+    assert await matrix.MatrixRankingEngine.rank(session, [0.1] * 4, uuid4(), limit=10, batch_revision=(101, "r")) is None
+    assert await matrix.MatrixRankingEngine.rank(session, [0.1] * 4, uuid4(), limit=10, batch_revision=(0, "r")) == []
+    session.execute.assert_not_called()
+
+
+async def test_matrix_cache_roundtrip(monkeypatch, tmp_path):
+    monkeypatch.setattr(matrix.settings, "rank_matrix_cache_dir", str(tmp_path))
+    batch_id = uuid4()
+    rows = [SimpleNamespace(id=uuid4(), filename=f"{i}.pdf", embedding=[float(i), 1.0]) for i in range(3)]
+    matrix._write(batch_id, "r1", rows)
+    entry = matrix._write(batch_id, "r2", rows)
+    assert len(list(tmp_path.iterdir())) == 2  # r1 files replaced
+    assert entry.ids == [r.id for r in rows] and entry.filenames == ["0.pdf", "1.pdf", "2.pdf"]
+    assert matrix.top_k(entry.matrix, [1.0, 0.0], limit=1)[0][0] == 2
+
+
+async def test_matrix_write_leaves_other_processes_temp_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(matrix.settings, "rank_matrix_cache_dir", str(tmp_path))
+    batch_id = uuid4()
+    rows = [SimpleNamespace(id=uuid4(), filename="a", embedding=np.array([1.0, 0.0]))]
+    foreign = tmp_path / f"{matrix._paths(batch_id, 'r1')[0].name}.99999.tmp"
+    foreign.write_bytes(b"partial")
+    matrix._write(batch_id, "r1", rows)
+    matrix._write(batch_id, "r2", rows)
+    assert foreign.exists()
+    assert {p.suffix for p in tmp_path.iterdir() if p != foreign} == {".npy", ".json"}
+
+
+async def test_rank_many_scores_every_jd_in_one_pass(monkeypatch, tmp_path):
+    monkeypatch.setattr(matrix.settings, "rank_matrix_cache_dir", str(tmp_path))
+    rows = [SimpleNamespace(id=uuid4(), filename=f"{i}.pdf", embedding=v) for i, v in enumerate([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])]
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(one=MagicMock(return_value=(3, None)), all=MagicMock(return_value=rows))
+    jd_x, jd_y = uuid4(), uuid4()
+    batch_id = uuid4()
+    ranked, best = await matrix.MatrixRankingEngine.rank_many(
+        session, {jd_x: [1.0, 0.0], jd_y: [0.0, 2.0]}, batch_id, limit=2, best_fit=True,
+    )
+    assert [r[0] for r in ranked[jd_x]] == [rows[0].id, rows[2].id]
+    assert [r[0] for r in ranked[jd_y]] == [rows[1].id, rows[2].id]
+    assert ranked[jd_x][0][3:] == (1, batch_id)
+    assert {(r, j) for r, j, _ in best} == {(rows[0].id, jd_x), (rows[1].id, jd_y), (rows[2].id, jd_x)}
+
+
+async def test_match_job_descriptions_binds_resume_vector_once():
+    jd_id = uuid4()
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[(jd_id, "Backend engineer", 0.8)]))
+    matches = await RankingService.match_job_descriptions(session, uuid4(), [0.1] * 4, limit=5)
+    assert matches == [(jd_id, "Backend engineer", 0.8, 1)]
+    assert session.execute.await_count == 1
+    assert await RankingService.match_job_descriptions(session, uuid4(), None) == []
+
+
+async def test_hybrid_query_uses_keywords_or_jd_terms():
+    sql, params = RankingService._hybrid_query(uuid4(), [0.1] * 4, None, limit=10, min_score=None, keywords="aws OR gcp")
+    assert "websearch_to_tsquery" in sql and params["keywords"] == "aws OR gcp"
+    assert params["depth"] >= 10
+    sql, params = RankingService._hybrid_query(uuid4(), [0.1] * 4, uuid4(), limit=500, min_score=0.5, keywords=None)
+    assert "unnest(j.search_tsv)" in sql and "jd_id" in params
+    assert params["depth"] == 500 and params["max_distance"] == 0.5
+    # first in both lists scores exactly 1
+    assert params["max_score"] * (params["rrf_k"] + 1) == params["vector_weight"] + params["lexical_weight"]
+
+
+async def test_filtered_rank_reports_pruning_per_stage():
+    counts = dict(eligible=100, after_must_include=12, after_must_exclude=9, after_min_score=4)
+    rid, bid = uuid4(), uuid4()
+    rows = [SimpleNamespace(**counts, id=rid, filename="a.pdf", similarity=0.9, batch_id=bid)]
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+    ranked, stats = await RankingService.rank_resumes_filtered(
+        session, [0.1] * 4, ["kubernetes"], ["intern"], limit=10, min_score=0.5,
+    )
+    assert ranked == [(rid, "a.pdf", 0.9, 1, bid)]
+    assert stats == {**counts, "returned": 1}
+    sql = session.execute.call_args.args[0].text
+    assert "phraseto_tsquery('english', :must_include_0)" in sql and "NOT (search_tsv @@" in sql
+
+    assert "CAST(NULL AS bigint) AS eligible" in sql  # unscoped: no count over the whole table
+
+    await RankingService.rank_resumes_filtered(session, [0.1] * 4, ["kubernetes"], [], batch_id=uuid4())
+    assert "AND r.batch_id = :batch_id) AS eligible" in session.execute.call_args.args[0].text
+
+    # no match: one stats row with NULL candidate columns
+    empty = [SimpleNamespace(**counts, id=None, filename=None, similarity=None, batch_id=None)]
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=empty))
+    ranked, stats = await RankingService.rank_resumes_filtered(session, [0.1] * 4, ["rust"], [])
+    assert ranked == [] and stats["returned"] == 0
+
+
+async def test_merge_ranked_inserts_new_resumes_and_renumbers():
+    a, b, c, n1, n2 = (uuid4() for _ in range(5))
+    bid = uuid4()
+    base = [(a, "a", 0.9, 1, bid), (b, "b", 0.7, 2, bid), (c, "c", 0.5, 3, bid)]
+    new = [(n1, "n1", 0.6, bid), (n2, "n2", 0.95, bid)]
+    ranked, added = RankingService.merge_ranked(base, new, limit=4)
+    assert [r[0] for r in ranked] == [n2, a, b, n1]
+    assert [r[3] for r in ranked] == [1, 2, 3, 4]
+    assert added == 2
+    ranked, added = RankingService.merge_ranked(base, [(n1, "n1", 0.1, bid)], limit=3)
+    assert [r[0] for r in ranked] == [a, b, c] and added == 0
+
+
+async def test_score_new_since_reapplies_base_run_filters():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+    await RankingService.score_new_since(
+        session, [0.1] * 4, datetime.now(timezone.utc), uuid4(),
+        min_score=0.6, must_include=["kubernetes"], must_exclude=["intern"],
+    )
+    sql, params = session.execute.call_args.args[0].text, session.execute.call_args.args[1]
+    assert "r.search_tsv @@ (phraseto_tsquery('english', :must_include_0))" in sql
+    assert "NOT (r.search_tsv @@ (phraseto_tsquery('english', :must_exclude_0)))" in sql
+    assert params["must_include_0"] == "kubernetes" and params["must_exclude_0"] == "intern"
+    assert params["max_distance"] == pytest.approx(0.4)
+
+    await RankingService.score_new_since(session, [0.1] * 4, datetime.now(timezone.utc), uuid4())
+    assert "search_tsv" not in session.execute.call_args.args[0].text
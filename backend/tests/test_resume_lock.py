@@ -0,0 +1,89 @@
+"""Unit tests for the per-resume lease (in-memory stand-in for the few Redis commands it uses)."""
+from app.core import resume_lock
+from app.core.resume_lock import AsyncResumeLease, ResumeLease
+
+
+class _Redis:
+    def __init__(self):
+        self.data: dict = {}
+        self.hashes: dict = {}
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, token, *args):
+        if self.data.get(key) != token:
+            return 0
+        if script == resume_lock._RELEASE_SCRIPT:
+            del self.data[key]
+        return 1
+
+    def hincrby(self, key, field, amount=1):
+        h = self.hashes.setdefault(key, {})
+        h[field] = h.get(field, 0) + amount
+        return h[field]
+
+
+def test_duplicate_delivery_is_rejected_and_counted():
+    client = _Redis()
+    first = ResumeLease("r1", client=client, ttl_seconds=30)
+    second = ResumeLease("r1", client=client, ttl_seconds=30)
+    assert first.acquire()
+    assert not second.acquire()
+    assert client.hashes[resume_lock.METRICS_KEY] == {"acquired": 1, "duplicate": 1}
+    first.release()
+    assert ResumeLease("r1", client=client, ttl_seconds=30).acquire()
+
+
+def test_release_only_by_token_holder():
+    client = _Redis()
+    lease = ResumeLease("r2", client=client, ttl_seconds=30)
+    assert lease.acquire()
+    client.data[lease.key] = "someone-else"  # lease expired and was taken over
+    lease.release()
+    assert client.data[lease.key] == "someone-else"
+
+
+def test_fails_open_without_redis():
+    class _Down:
+        def set(self, *a, **kw):
+            raise ConnectionError("redis down")
+
+        def hincrby(self, *a, **kw):
+            raise ConnectionError("redis down")
+
+    lease = ResumeLease("r3", client=_Down(), ttl_seconds=30)
+    assert lease.acquire()
+    lease.release()
+
+
+async def test_async_lease_held_when_metrics_write_fails():
+    class _MetricsDown:
+        def __init__(self):
+            self.data: dict = {}
+
+        async def set(self, key, value, nx=False, px=None):
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+        async def hincrby(self, *a, **kw):
+            raise ConnectionError("hash write failed")
+
+        async def eval(self, script, numkeys, key, token, *args):
+            if self.data.get(key) == token and script == resume_lock._RELEASE_SCRIPT:
+                del self.data[key]
+                return 1
+            return 0
+
+    client = _MetricsDown()
+    lease = AsyncResumeLease("r4", client, ttl_seconds=30)
+    assert await lease.acquire()
+    assert lease.held and lease._task is not None
+    assert not await AsyncResumeLease("r4", client, ttl_seconds=30).acquire()
+    await lease.release()
+    assert lease.key not in client.data
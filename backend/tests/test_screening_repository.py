@@ -0,0 +1,14 @@
+"""Unit tests for screening persistence (app.repositories.screening_repository)."""
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from app.repositories.screening_repository import ScreeningRepository
+
+
+async def test_add_results_is_one_executemany_without_ids():
+    session = AsyncMock()
+    run_id = uuid4()
+    await ScreeningRepository.add_results(session, run_id, [(uuid4(), 0.9, 1), (uuid4(), 0.8, 2)])
+    session.execute.assert_awaited_once()
+    rows = session.execute.await_args.args[1]
+    assert len(rows) == 2 and all("id" not in row and row["run_id"] == run_id for row in rows)
@@ -0,0 +1,22 @@
+"""Unit tests for screening request validation (app.schemas.screening)."""
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import screening
+from app.schemas.screening import IncrementalRankRequest, RankRequest
+
+
+def test_rank_request_cleans_terms():
+    body = RankRequest(jd_id=uuid4(), must_include=[" AWS ", "", "AWS", "terraform"])
+    assert body.must_include == ["AWS", "terraform"]
+
+
+def test_rank_limit_is_bounded_by_settings(monkeypatch):
+    monkeypatch.setattr(screening.settings, "rank_max_limit", 100)
+    assert RankRequest(jd_id=uuid4(), limit=100).limit == 100
+    for limit in (0, 101):
+        with pytest.raises(ValidationError):
+            RankRequest(jd_id=uuid4(), limit=limit)
+    assert IncrementalRankRequest().limit is None
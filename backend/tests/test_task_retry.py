@@ -0,0 +1,73 @@
+"""Unit tests for task retry classification and countdown (no broker/DB needed)."""
+import httpx
+import openai
+
+from app.config import get_settings
+from app.core.embedding_errors import EmbeddingUnavailableError, is_retryable_embedding_error
+from app.tasks.process_resume import _is_transient, _retry_countdown
+
+_REQUEST = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+
+
+def _status_error(cls, status_code: int, headers: dict | None = None):
+    response = httpx.Response(status_code, request=_REQUEST, headers=headers or {})
+    return cls("error", response=response, body=None)
+
+
+def test_transient_errors_are_retryable():
+    assert is_retryable_embedding_error(_status_error(openai.RateLimitError, 429))
+    assert is_retryable_embedding_error(_status_error(openai.InternalServerError, 503))
+    assert is_retryable_embedding_error(openai.APITimeoutError(request=_REQUEST))
+    assert is_retryable_embedding_error(EmbeddingUnavailableError("circuit open"))
+
+
+def test_permanent_errors_fail_fast():
+    assert not is_retryable_embedding_error(_status_error(openai.AuthenticationError, 401))
+    assert not is_retryable_embedding_error(_status_error(openai.BadRequestError, 400))
+    assert not _is_transient(ValueError("OPENAI_API_KEY is not set"))
+
+
+def test_retry_countdown_grows_and_is_capped():
+    settings = get_settings()
+    for retries in range(10):
+        window = min(
+            settings.task_retry_backoff_max_seconds,
+            settings.task_retry_backoff_base_seconds * (2 ** retries),
+        )
+        countdown = _retry_countdown(retries)
+        assert window / 2 <= countdown <= window
+
+
+def test_retry_countdown_honours_retry_after():
+    exc = _status_error(openai.RateLimitError, 429, headers={"retry-after": "120"})
+    assert _retry_countdown(0, exc) >= 120
+
+
+def test_drainer_isolates_bad_input_in_batch(monkeypatch):
+    from types import SimpleNamespace
+    from uuid import uuid4
+
+    from app.tasks import embedding_drainer
+
+    class FakeService:
+        def embed_texts(self, texts):
+            if "bad" in texts:
+                raise _status_error(openai.BadRequestError, 400)
+            return [[1.0] for _ in texts]
+
+    monkeypatch.setattr(embedding_drainer, "get_embedding_service", lambda: FakeService())
+    rows = [SimpleNamespace(id=uuid4(), extracted_text=t) for t in ("ok", "bad", "fine")]
+    results = embedding_drainer._embed_claimed(rows)
+    assert results[rows[0].id] == [1.0]
+    assert isinstance(results[rows[1].id], openai.BadRequestError)
+    assert results[rows[2].id] == [1.0]
+
+
+def test_sweeper_waits_for_tenant_backlog_until_hard_deadline():
+    from app.tasks.sweeper import is_stuck
+
+    settings = get_settings()
+    assert not is_stuck(settings.sweeper_stuck_after_seconds - 1, tenant_queued=0)
+    assert is_stuck(settings.sweeper_stuck_after_seconds, tenant_queued=0)
+    assert not is_stuck(settings.sweeper_stuck_after_seconds, tenant_queued=40)
+    assert is_stuck(settings.sweeper_hard_deadline_seconds, tenant_queued=40)
@@ -0,0 +1,130 @@
+"""
+Unit tests for watch-mode shortlists (app.services.ranking.watch). The admission / trim tests run the real
+statements against PostgreSQL with pgvector (DATABASE_URL) on temporary tables inside a rolled-back
+transaction, and are skipped when no database is reachable.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import asyncpg
+import pytest
+
+from app.config import get_settings
+from app.services.ranking import watch
+from app.services.ranking.watch import _SCORE_SQL, _as_text, _params, update_shortlists_async, update_shortlists_sync
+
+# Shadow the real tables (pg_temp is searched first) with just the columns the statements touch
+_SCHEMA = """
+    CREATE TEMP TABLE upload_batches (id uuid PRIMARY KEY, user_id uuid NOT NULL);
+    CREATE TEMP TABLE resumes (id uuid PRIMARY KEY, batch_id uuid NOT NULL, status text NOT NULL, embedding vector(2));
+    CREATE TEMP TABLE job_descriptions (
+        id uuid PRIMARY KEY, user_id uuid NOT NULL, watch_active boolean NOT NULL, embedding vector(2)
+    );
+    CREATE TEMP TABLE jd_shortlist_entries (
+        jd_id uuid NOT NULL, resume_id uuid NOT NULL, similarity_score numeric(6, 5) NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT clock_timestamp(), PRIMARY KEY (jd_id, resume_id)
+    );
+"""
+
+
+@pytest.fixture
+async def pg():
+    dsn = get_settings().database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    try:
+        conn = await asyncpg.connect(dsn, timeout=2)
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+    tx = conn.transaction()
+    await tx.start()
+    try:
+        try:
+            await conn.execute(_SCHEMA)
+        except asyncpg.UndefinedObjectError:
+            pytest.skip("pgvector extension not installed")
+        yield conn
+    finally:
+        await tx.rollback()
+        await conn.close()
+
+
+def _pool(conn):
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+    return SimpleNamespace(acquire=acquire)
+
+
+async def _add_resume(conn, batch_id, embedding, status="processed"):
+    resume_id = uuid4()
+    await conn.execute(
+        "INSERT INTO resumes VALUES ($1, $2, $3, $4::text::vector)", resume_id, batch_id, status, str(embedding),
+    )
+    return resume_id
+
+
+def test_watch_statements_convert_for_sqlalchemy_sessions():
+    stmt = _as_text(_SCORE_SQL)
+    assert "$1" not in stmt.text and ":p1" in stmt.text and ":p3" in stmt.text
+    assert _params("r", 100, 99) == {"p1": "r", "p2": 100, "p3": 99}
+
+
+def test_watch_alerts_only_for_strong_candidates(monkeypatch):
+    monkeypatch.setattr(watch.settings, "watch_alert_min_score", 0.8)
+    alerts = watch._alerts("r1", [("j1", 0.85), ("j2", 0.5)])
+    assert [channel for channel, _ in alerts] == ["jd:j1:shortlist"]
+
+
+def test_watch_update_never_fails_ingestion():
+    session = MagicMock()
+    session.execute.side_effect = RuntimeError("db down")
+    assert update_shortlists_sync(session, "r1") == 0
+    session.rollback.assert_called_once()
+
+
+async def test_shortlist_admits_until_full_then_only_candidates_beating_the_kth(pg, monkeypatch):
+    monkeypatch.setattr(watch.settings, "watch_top_k", 2)
+    monkeypatch.setattr(watch.settings, "watch_alert_min_score", 0.9)
+    user_id, batch_id, jd_id, idle_jd_id = uuid4(), uuid4(), uuid4(), uuid4()
+    await pg.execute("INSERT INTO upload_batches VALUES ($1, $2)", batch_id, user_id)
+    await pg.execute(
+        "INSERT INTO job_descriptions VALUES ($1, $3, true, '[1,0]'), ($2, $3, false, '[1,0]')",
+        jd_id, idle_jd_id, user_id,
+    )
+    pool, redis = _pool(pg), AsyncMock()
+
+    async def ingest(embedding, status="processed"):
+        resume_id = await _add_resume(pg, batch_id, embedding, status)
+        return resume_id, await update_shortlists_async(pool, redis, resume_id)
+
+    _, admitted = await ingest([0.6, 0.8])  # score 0.6, shortlist below K
+    assert admitted == 1
+    r2, admitted = await ingest([0.8, 0.6])  # 0.8, fills the shortlist
+    assert admitted == 1
+    _, admitted = await ingest([0.5, 0.866])  # 0.5 does not beat the K-th entry (0.6)
+    assert admitted == 0
+    _, admitted = await ingest([0.99, 0.1], status="extracted")  # not processed yet
+    assert admitted == 0
+    r4, admitted = await ingest([0.96, 0.28])  # 0.96 enters; the trim drops r1
+    assert admitted == 1
+
+    rows = await pg.fetch(
+        "SELECT resume_id, similarity_score FROM jd_shortlist_entries WHERE jd_id = $1 ORDER BY similarity_score DESC",
+        jd_id,
+    )
+    assert [r["resume_id"] for r in rows] == [r4, r2]
+    assert [float(r["similarity_score"]) for r in rows] == pytest.approx([0.96, 0.8], abs=1e-4)
+    assert await pg.fetchval("SELECT count(*) FROM jd_shortlist_entries WHERE jd_id = $1", idle_jd_id) == 0
+    assert [c.args[0] for c in redis.publish.await_args_list] == [f"jd:{jd_id}:shortlist"]  # only r4 >= 0.9
+
+
+async def test_trim_keeps_the_top_k_of_every_admitted_jd(pg):
+    jd_a, jd_b = uuid4(), uuid4()
+    entries = [(jd_a, uuid4(), s) for s in (0.9, 0.7, 0.5, 0.3)] + [(jd_b, uuid4(), s) for s in (0.4, 0.2)]
+    await pg.executemany("INSERT INTO jd_shortlist_entries (jd_id, resume_id, similarity_score) VALUES ($1, $2, $3)", entries)
+    await pg.execute(watch._TRIM_SQL, [str(jd_a), str(jd_b)], 2)
+    rows = await pg.fetch("SELECT jd_id, similarity_score FROM jd_shortlist_entries ORDER BY jd_id, similarity_score DESC")
+    kept = {(r["jd_id"], float(r["similarity_score"])) for r in rows}
+    assert kept == {(jd_a, 0.9), (jd_a, 0.7), (jd_b, 0.4), (jd_b, 0.2)}
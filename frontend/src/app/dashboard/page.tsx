@@ -29,6 +29,9 @@ import {
 function StatusBadge({ status }: { status: string }) {
   const styles: Record<string, string> = {
     pending: "bg-amber-100 text-amber-800",
+    deferred: "bg-slate-100 text-slate-700",
+    extracted: "bg-blue-100 text-blue-800",
+    awaiting_embedding: "bg-amber-100 text-amber-800",
     processing: "bg-blue-100 text-blue-800",
     completed: "bg-emerald-100 text-emerald-800",
     failed: "bg-red-100 text-red-800",